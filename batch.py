@@ -0,0 +1,186 @@
+# Başsız toplu vurgulama: python batch.py PATH... [--format html|ansi|jsonl] [--output-dir DIR]
+import argparse
+import html
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterator, List, Optional
+from cache import AnalysisCache, analyze_code
+from colors import ColorScheme
+from lexer import LEXER_BACKENDS
+from tokens import TOKEN_TYPES, TokenBuffer, TokenStatistics
+
+FORMATS = ('html', 'ansi', 'jsonl')  # Desteklenen çıktı biçimleri
+EXTENSIONS = {'html': '.html', 'ansi': '.ansi', 'jsonl': '.jsonl'}  # Çıktı dosyası uzantıları
+
+class FileReport:
+    """Summary of one highlighted file, sent back from the worker process"""
+    def __init__(self, path: str, statistics: TokenStatistics, errors: List[str],
+                 output: Optional[str] = None, failure: Optional[str] = None):
+        self.path = path                # Girdi dosyası
+        self.statistics = statistics    # Lexer istatistikleri (ana süreçte birleştirilir)
+        self.errors = errors            # Parser hataları
+        self.output = output            # Çıktı dizini verilmediyse üretilen çıktı metni
+        self.failure = failure          # Dosya işlenemediyse hata mesajı (okuma, analiz, çıktı)
+
+def render_html(path: str, buffer: TokenBuffer) -> str:
+    """Render a token buffer as a standalone HTML <pre> block"""
+    parts = [f'<pre class="highlight" data-path="{html.escape(path)}">']
+    source = buffer.source
+    previous = 0
+    for type_code, start, end in zip(buffer.types, buffer.starts, buffer.ends):
+        token_type = TOKEN_TYPES[type_code]
+        parts.append(html.escape(source[previous:start]))  # Token'lar arasındaki boşluklar
+        text = html.escape(source[start:end])
+        if token_type in ColorScheme.COLORS:
+            style = f"color:{ColorScheme.get_color(token_type)}"
+            font_style = ColorScheme.get_style(token_type)
+            if font_style == "bold":
+                style += ";font-weight:bold"
+            elif font_style == "italic":
+                style += ";font-style:italic"
+            parts.append(f'<span style="{style}">{text}</span>')
+        else:
+            parts.append(text)
+        previous = end
+    parts.append(html.escape(source[previous:]))
+    parts.append('</pre>\n')
+    return ''.join(parts)
+
+def render_ansi(path: str, buffer: TokenBuffer) -> str:
+    """Render a token buffer with 24-bit ANSI color escapes"""
+    parts = []
+    source = buffer.source
+    previous = 0
+    for type_code, start, end in zip(buffer.types, buffer.starts, buffer.ends):
+        token_type = TOKEN_TYPES[type_code]
+        parts.append(source[previous:start])
+        if token_type in ColorScheme.COLORS:
+            color = ColorScheme.get_color(token_type)
+            red, green, blue = int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+            font_style = {"bold": "1;", "italic": "3;"}.get(ColorScheme.get_style(token_type), "")
+            parts.append(f"\x1b[{font_style}38;2;{red};{green};{blue}m{source[start:end]}\x1b[0m")
+        else:
+            parts.append(source[start:end])
+        previous = end
+    parts.append(source[previous:])
+    return ''.join(parts)
+
+def render_jsonl(path: str, buffer: TokenBuffer, statistics: dict, errors: List[str]) -> str:
+    """Render one JSON line with token spans, statistics and parser errors"""
+    record = {
+        'path': path,
+        'tokens': [[TOKEN_TYPES[type_code].value, start, end, line, column]
+                   for type_code, start, end, line, column
+                   in zip(buffer.types, buffer.starts, buffer.ends, buffer.lines, buffer.columns)],
+        'statistics': {
+            'total_tokens': statistics['total_tokens'],
+            'total_lines': statistics['total_lines'],
+            'token_counts': {token_type.value: count for token_type, count in statistics['token_counts'].items()},
+            'error_count': statistics['error_count'],
+            'warning_count': statistics['warning_count'],
+        },
+        'errors': errors,
+    }
+    return json.dumps(record, ensure_ascii=False) + '\n'
+
+_caches = {}  # İşçi süreç başına önbellek nesneleri (dizin -> AnalysisCache)
+
+def process_file(path: str, root: str = '', output_format: str = 'html', output_dir: Optional[str] = None,
+                 backend: str = 'regex', cache_dir: Optional[str] = None) -> FileReport:
+    """Lex, parse and render one file (runs in a worker process); a failure is reported, never raised"""
+    try:
+        return _highlight_file(path, root, output_format, output_dir, backend, cache_dir)
+    except Exception as e:
+        # Tek bir bozuk dosya (okunamayan, çözülemeyen, yazılamayan) tüm toplu çalışmayı durdurmamalı
+        return FileReport(path, TokenStatistics(), [], failure=str(e))
+
+def _highlight_file(path: str, root: str, output_format: str, output_dir: Optional[str],
+                    backend: str, cache_dir: Optional[str]) -> FileReport:
+    """Read, analyze, render and optionally write one file"""
+    with open(path, encoding='utf-8', errors='replace') as source:
+        code = source.read()
+    if cache_dir:
+        if cache_dir not in _caches:
+            _caches[cache_dir] = AnalysisCache(cache_dir)
+        analysis = _caches[cache_dir].analyze(code, backend)
+    else:
+        analysis = analyze_code(code, backend)
+    buffer, statistics, errors = analysis.buffer, analysis.statistics, analysis.errors
+    if output_format == 'html':
+        output = render_html(path, buffer)
+    elif output_format == 'ansi':
+        output = render_ansi(path, buffer)
+    else:
+        output = render_jsonl(path, buffer, statistics, errors)
+    if output_dir is not None:
+        # Çıktıyı işçi süreçte yaz, ana sürece sadece özet dönsün
+        target = os.path.join(output_dir, os.path.relpath(path, root) + EXTENSIONS[output_format])
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'w', encoding='utf-8') as destination:
+            destination.write(output)
+        output = None
+    return FileReport(path, TokenStatistics.from_dict(statistics), errors, output)
+
+def collect_files(paths: List[str]) -> Iterator[tuple]:
+    """Yield (file, root) pairs for the given files and directory trees, in sorted order"""
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, subdirectories, files in os.walk(path):
+                subdirectories.sort()
+                for name in sorted(files):
+                    if name.endswith('.py'):
+                        yield os.path.join(directory, name), path
+        else:
+            yield path, os.path.dirname(path)
+
+def run_batch(paths: List[str], output_format: str = 'html', output_dir: Optional[str] = None,
+              backend: str = 'regex', jobs: Optional[int] = None, fail_on_errors: bool = False,
+              cache_dir: Optional[str] = None, stream=sys.stdout, report=sys.stderr) -> int:
+    """Highlight all files with a process pool, streaming results in input order; return the exit code"""
+    files = list(collect_files(paths))
+    jobs = jobs or os.cpu_count() or 1
+    chunk_size = max(1, len(files) // (jobs * 8))  # İşçi başına birkaç parti: iletişim maliyeti düşük kalır
+    worker = partial(_process_entry, output_format=output_format, output_dir=output_dir,
+                     backend=backend, cache_dir=cache_dir)
+    totals = TokenStatistics()  # Dosya istatistiklerinin toplamı
+    total_errors = failed = 0
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for result in executor.map(worker, files, chunksize=chunk_size):  # Sonuçlar girdi sırasıyla gelir
+            if result.failure is not None:
+                failed += 1
+                print(f"{result.path}: failed: {result.failure}", file=report)
+                continue
+            if result.output is not None:
+                stream.write(result.output)
+            for error in result.errors:
+                print(f"{result.path}: {error}", file=report)
+            totals.merge(result.statistics)
+            total_errors += len(result.errors)
+    print(f"{len(files)} files, {totals.total_lines} lines, {totals.total_tokens} tokens, "
+          f"{total_errors} parse errors, {totals.error_count} lexical errors, {totals.warning_count} warnings, "
+          f"{failed} failed", file=report)
+    return 1 if failed or (fail_on_errors and total_errors) else 0
+
+def _process_entry(entry: tuple, **options) -> FileReport:
+    """Unpack a (file, root) pair for process_file"""
+    path, root = entry
+    return process_file(path, root, **options)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argument_parser = argparse.ArgumentParser(description="Headless batch syntax highlighting and checks")
+    argument_parser.add_argument('paths', nargs='+', help="Python files or directories to process")
+    argument_parser.add_argument('--format', choices=FORMATS, default='html', help="output format")
+    argument_parser.add_argument('--output-dir', help="write one output file per input instead of stdout")
+    argument_parser.add_argument('--backend', choices=sorted(LEXER_BACKENDS), default='regex', help="lexer backend")
+    argument_parser.add_argument('--jobs', type=int, default=None, help="worker processes (default: CPU count)")
+    argument_parser.add_argument('--fail-on-errors', action='store_true', help="exit with status 1 if any parse errors are found")
+    argument_parser.add_argument('--cache-dir', help="persistent token cache directory (unchanged files are not re-analyzed)")
+    arguments = argument_parser.parse_args(argv)
+    return run_batch(arguments.paths, arguments.format, arguments.output_dir, arguments.backend,
+                     arguments.jobs, arguments.fail_on_errors, arguments.cache_dir)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+# Tekrarlanabilir performans ölçümleri: python benchmark.py [--sizes 1KB,1MB,100MB] [--baseline eski.json]
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+from lexer import LEXER_BACKENDS, LEXER_VERSION, create_lexer
+from parser import SimpleParser
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Alt süreçlerde modüllerin bulunduğu dizin
+SIZES = {'1KB': 1 << 10, '1MB': 1 << 20, '100MB': 100 << 20}  # Kullanılabilir korpus boyutları
+HIGHER_IS_BETTER = ('tokens_per_sec',)  # Diğer tüm metriklerde düşük değer daha iyidir
+
+def synthetic_corpus(size: int, seed: int = 1234) -> str:
+    """Generate deterministic Python-like code of roughly the given size"""
+    generator = random.Random(seed)
+    names = ['value', 'result', 'index', 'items', 'total', 'node', 'parent', 'data', 'count', 'key']
+    templates = [
+        'def {a}_{n}({b}, {c}=None):\n',
+        '    {a} = {b} + {n} * ({c} - 1.5)\n',
+        '    if {a} >= {n} and not {b}:\n        return [{b}, {c}]\n',
+        '    for {a} in range({n}):\n        {b}[{a}] //= 2  # {c} güncelle\n',
+        '    {a} = "string {n} with \\"escapes\\"" + \'{b}\'\n',
+        'class {A}{n}:\n    pass\n\n',
+        '{a}.{b}({c}, {{"{a}": {n}}})\n',
+    ]
+    parts = []
+    length = 0
+    while length < size:
+        a, b, c = generator.sample(names, 3)
+        line = generator.choice(templates).format(a=a, b=b, c=c, A=a.title(), n=generator.randint(0, 999))
+        parts.append(line)
+        length += len(line)
+    return ''.join(parts)[:size]
+
+def real_corpus(size: int, directory: str) -> str:
+    """Concatenate real Python sources from a directory (repeated) up to the given size"""
+    sources = []
+    for root, subdirectories, files in os.walk(directory):
+        subdirectories.sort()
+        for name in sorted(files):
+            if name.endswith('.py'):
+                with open(os.path.join(root, name), encoding='utf-8', errors='replace') as source:
+                    sources.append(source.read())
+    text = '\n'.join(sources) or synthetic_corpus(size)
+    return (text * (size // len(text) + 1))[:size]
+
+def best_time(function: Callable, repeat: int) -> float:
+    """Best wall time of several runs with the garbage collector paused"""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+def peak_memory(function: Callable) -> int:
+    """Peak traced allocation (bytes) while running the function"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+class RecordingTextWidget:
+    """Stand-in for the Tk text widget when no display is available; counts calls"""
+    def __init__(self):
+        self.calls = 0
+        self.scheduled = []  # after() ile zamanlanan geri çağrılar (run_scheduled çalıştırır)
+    
+    def _call(self, *args, **kwargs):
+        self.calls += 1
+    
+    config = delete = insert = tag_add = tag_remove = tag_configure = _call
+    
+    def after(self, delay: int, callback) -> str:
+        self.scheduled.append(callback)
+        return f"after#{len(self.scheduled)}"
+    
+    def run_scheduled(self) -> List[float]:
+        """Run scheduled callbacks until none are left, return the duration of each"""
+        durations = []
+        while self.scheduled:
+            callback = self.scheduled.pop(0)
+            start = time.perf_counter()
+            callback()
+            durations.append(time.perf_counter() - start)
+        return durations
+
+def recording_view(code: str, start: int = 0, visible_lines: int = 40):
+    """HighlightedTextView drawing into a RecordingTextWidget, with the viewport at the line starting at start"""
+    from gui import HighlightedTextView
+    view = HighlightedTextView.__new__(HighlightedTextView)
+    view._reset()
+    view.text_widget = RecordingTextWidget()
+    end = start
+    for _ in range(visible_lines + HighlightedTextView.VIEWPORT_MARGIN):
+        end = code.find('\n', end) + 1
+        if end == 0:
+            end = len(code)
+            break
+    view._visible_range = lambda: (start, end)  # Ekran yok: görünen bölge sabit
+    return view
+
+def import_cost(modules: str, repeat: int) -> float:
+    """Extra wall time a fresh interpreter needs to import the modules (startup of a bare interpreter subtracted)"""
+    def run(statement: str) -> float:
+        return best_time(lambda: subprocess.run([sys.executable, '-c', statement], cwd=BASE_DIR, check=True), repeat)
+    return max(0.0, run(f"import {modules}") - run("pass"))
+
+def first_paint(code: str, repeat: int, visible_lines: int = 40) -> Dict[str, float]:
+    """Time until the visible region of a freshly opened document is highlighted (see SyntaxHighlighter._first_paint)"""
+    try:
+        import gui
+    except ImportError:
+        return {}  # tkinter yok: görünüm ölçülemez
+    end = 0
+    for _ in range(visible_lines):
+        end = code.find('\n', end) + 1
+        if end == 0:
+            end = len(code)
+            break
+    visible_tokens = create_lexer(code[:end], 'regex').tokenize()
+    
+    def paint():
+        recording_view(code, 0, visible_lines).update_highlighted_text(visible_tokens, code)
+    results = {'first_paint_sec': best_time(paint, repeat)}
+    # Tam analiz sonucu geldiğinde belgenin geri kalanı arka planda partilerle boyanır: en uzun parti bir kareyi aşmamalı
+    view = recording_view(code, 0, visible_lines)
+    view.update_highlighted_text(visible_tokens, code)
+    view.text_widget.run_scheduled()
+    view.update_highlighted_text(create_lexer(code, 'regex').tokenize(), code)
+    durations = view.text_widget.run_scheduled()
+    results['background_batch_max_sec'] = max(durations, default=0.0)
+    return results
+
+def keystroke_latency(code: str, repeat: int) -> Dict[str, float]:
+    """Simulated keystroke-to-render time: one-character edit, incremental lex and parse, view patch"""
+    try:
+        import gui
+    except ImportError:
+        return {}  # tkinter yok: görünüm ölçülemez
+    middle = code.rfind('\n', 0, len(code) // 2) + 1  # Belgenin ortasındaki bir satır başı
+    view = recording_view(code, middle)  # Düzenlenen satır ekranda
+    lexer = create_lexer(code, 'regex')
+    parser = SimpleParser(lexer.tokenize())
+    parser.parse()
+    view.update_highlighted_text(parser.tokens, code)
+    view.text_widget.run_scheduled()
+    samples = []
+    tk_calls = 0
+    for step in range(repeat):
+        text = 'x' if step % 2 == 0 else ''
+        view.text_widget.calls = 0
+        start = time.perf_counter()
+        # Sırayla bir karakter ekle / geri sil
+        edit = (middle, 0, text) if text else (middle, 1, '')
+        tokens = lexer.retokenize(*edit)
+        parser.reparse(tokens, edit, lexer.relexed_end)
+        view.update_highlighted_text(tokens, lexer.code)
+        samples.append(time.perf_counter() - start)
+        tk_calls = max(tk_calls, view.text_widget.calls)
+    samples.sort()
+    return {'keystroke_median_sec': samples[len(samples) // 2], 'keystroke_max_sec': samples[-1],
+            'keystroke_tk_calls': tk_calls}
+
+def run_benchmarks(sizes: List[str], corpus_dir: Optional[str], repeat: int) -> Dict[str, float]:
+    """Run every benchmark and return a flat {name: value} mapping"""
+    results = {}
+    corpora = {'synthetic': lambda size: synthetic_corpus(size)}
+    if corpus_dir:
+        corpora['real'] = lambda size: real_corpus(size, corpus_dir)
+    for corpus_name, build in corpora.items():
+        for size_name in sizes:
+            code = build(SIZES[size_name])
+            prefix = f"{corpus_name}/{size_name}"
+            runs = repeat if SIZES[size_name] <= SIZES['1MB'] else 1  # Büyük korpusta tek tur
+            token_count = len(create_lexer(code, 'regex').tokenize())
+            results[f"{prefix}/token_count"] = token_count
+            for backend in LEXER_BACKENDS:
+                elapsed = best_time(lambda: create_lexer(code, backend).tokenize(), runs)
+                results[f"{prefix}/tokenize/{backend}/tokens_per_sec"] = token_count / elapsed
+                # Toplu işlerin kullandığı yol (cache.analyze_code): Token nesnesi yerine TokenBuffer
+                elapsed = best_time(lambda: create_lexer(code, backend).tokenize_buffer(), runs)
+                results[f"{prefix}/tokenize_buffer/{backend}/tokens_per_sec"] = token_count / elapsed
+            if SIZES[size_name] >= SIZES['1MB']:
+                # Tek dosyanın satır sınırlarında bölünüp işçi süreçlerde taranması (çekirdek sayısıyla ölçeklenir)
+                elapsed = best_time(lambda: create_lexer(code, 'regex').tokenize_buffer_parallel(), runs)
+                results[f"{prefix}/tokenize_buffer_parallel/regex/tokens_per_sec"] = token_count / elapsed
+            tokens = create_lexer(code, 'regex').tokenize()
+            results[f"{prefix}/parse_sec"] = best_time(lambda: SimpleParser(tokens).parse(), runs)
+            del tokens
+            results[f"{prefix}/memory/list_bytes_per_token"] = \
+                peak_memory(lambda: create_lexer(code, 'regex').tokenize()) / max(token_count, 1)
+            results[f"{prefix}/memory/buffer_bytes_per_token"] = \
+                peak_memory(lambda: create_lexer(code, 'regex').tokenize_buffer()) / max(token_count, 1)
+            for name, value in first_paint(code, runs).items():
+                results[f"{prefix}/view/{name}"] = value
+            if SIZES[size_name] <= SIZES['1MB']:
+                for name, value in keystroke_latency(code, max(runs, 5)).items():
+                    results[f"{prefix}/view/{name}"] = value
+            print(f"{prefix}: {token_count} tokens done", file=sys.stderr)
+    # Açılış maliyeti: çekirdek modüller tkinter olmadan, arayüz tkinter ile birlikte
+    results["startup/import/core_sec"] = import_cost("lexer, parser, worker", repeat)
+    try:
+        import tkinter
+        results["startup/import/gui_sec"] = import_cost("gui", repeat)
+    except ImportError:
+        pass
+    return results
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """List metrics that regressed by more than threshold (a fraction) against the baseline"""
+    regressions = []
+    for name, value in sorted(results.items()):
+        old = baseline.get(name)
+        if not old or name.endswith('token_count'):
+            continue
+        change = (value - old) / old
+        worse = -change if name.endswith(HIGHER_IS_BETTER) else change
+        marker = "REGRESSION" if worse > threshold else ""
+        print(f"{name:<60} {old:>14.6g} -> {value:>14.6g} ({change:+.1%}) {marker}")
+        if worse > threshold:
+            regressions.append(name)
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argument_parser = argparse.ArgumentParser(description="Lexer, parser and rendering benchmarks")
+    argument_parser.add_argument('--sizes', default='1KB,1MB', help="comma separated corpus sizes: 1KB,1MB,100MB")
+    argument_parser.add_argument('--corpus-dir', help="directory of real Python sources for the 'real' corpus")
+    argument_parser.add_argument('--repeat', type=int, default=5, help="runs per measurement (best time is kept)")
+    argument_parser.add_argument('--output', default='benchmark_results.json', help="where to save the results")
+    argument_parser.add_argument('--baseline', help="earlier results file to compare against")
+    argument_parser.add_argument('--threshold', type=float, default=0.10, help="allowed slowdown before failing")
+    arguments = argument_parser.parse_args(argv)
+    sizes = [size.strip() for size in arguments.sizes.split(',')]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        argument_parser.error(f"unknown size(s): {', '.join(unknown)}")
+    
+    results = run_benchmarks(sizes, arguments.corpus_dir, arguments.repeat)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'lexer_version': LEXER_VERSION,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+    with open(arguments.output, 'w', encoding='utf-8') as destination:
+        json.dump(report, destination, indent=2, sort_keys=True)
+    print(f"Results written to {arguments.output}")
+    
+    if arguments.baseline:
+        with open(arguments.baseline, encoding='utf-8') as source:
+            baseline = json.load(source)['results']
+        regressions = compare(results, baseline, arguments.threshold)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than {arguments.threshold:.0%}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+# İçerik adresli analiz önbelleği: bellek ve disk katmanları, boyuta göre LRU tahliye
+import hashlib
+import json
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections import OrderedDict
+from typing import List, Optional
+from lexer import LEXER_VERSION, create_lexer
+from parser import SimpleParser
+from tokens import TokenBuffer, TokenType
+
+CACHE_FORMAT = 1  # Kodlama biçimi değişirse artırılmalı
+MAGIC = b'SHTC'   # Önbellek kayıtlarının başlangıç işareti
+HEADER = struct.Struct('<4sIII')  # işaret, token sayısı, meta veri uzunluğu, 'I' eleman boyutu
+
+class CachedAnalysis:
+    """Tokens, statistics and parser errors restored from the cache"""
+    def __init__(self, buffer: TokenBuffer, statistics: dict, errors: List[str]):
+        self.buffer = buffer          # Token'lar (TokenBuffer)
+        self.statistics = statistics  # Lexer istatistikleri
+        self.errors = errors          # Parser hataları
+
+def analyze_code(code: str, backend: str = 'regex') -> CachedAnalysis:
+    """Lex (into a TokenBuffer) and parse the code without consulting any cache"""
+    lexer = create_lexer(code, backend)
+    buffer = lexer.tokenize_buffer()
+    parser = SimpleParser(buffer)
+    parser.parse()
+    return CachedAnalysis(buffer, lexer.get_statistics(), parser.errors)
+
+def encode_analysis(buffer: TokenBuffer, statistics: dict, errors: List[str]) -> bytes:
+    """Encode an analysis as header + JSON metadata + raw little-endian array columns"""
+    meta = json.dumps({
+        'statistics': dict(statistics, token_counts={token_type.value: count
+                                                     for token_type, count in statistics['token_counts'].items()}),
+        'errors': errors,
+    }).encode('utf-8')
+    parts = [HEADER.pack(MAGIC, len(buffer), len(meta), buffer.lines.itemsize), meta]
+    for column in (buffer.types, buffer.starts, buffer.ends, buffer.lines, buffer.columns):
+        if sys.byteorder == 'big':
+            column = array(column.typecode, column)
+            column.byteswap()
+        parts.append(column.tobytes())
+    return b''.join(parts)
+
+def decode_analysis(data: bytes, code: str) -> Optional[CachedAnalysis]:
+    """Decode a cache record for the given source, None if the record is unusable (a cache miss)"""
+    if len(data) < HEADER.size:
+        return None
+    magic, count, meta_length, line_itemsize = HEADER.unpack_from(data)
+    buffer = TokenBuffer(code)
+    columns = (buffer.types, buffer.starts, buffer.ends, buffer.lines, buffer.columns)
+    if magic != MAGIC or line_itemsize != buffer.lines.itemsize:
+        return None  # Farklı platformda yazılmış kayıt: yeniden analiz edilir
+    if len(data) != HEADER.size + meta_length + count * sum(column.itemsize for column in columns):
+        return None  # Kesilmiş veya bozuk kayıt: bölüm uzunlukları başlıkla uyuşmuyor
+    offset = HEADER.size + meta_length
+    try:
+        meta = json.loads(data[HEADER.size:offset].decode('utf-8'))
+        statistics = meta['statistics']
+        statistics['token_counts'] = {TokenType(name): count for name, count in statistics['token_counts'].items()}
+        errors = meta['errors']
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None  # Bozuk meta veri (geçersiz UTF-8/JSON, eksik alan, bilinmeyen token türü)
+    for column in columns:
+        size = count * column.itemsize
+        column.frombytes(data[offset:offset + size])
+        if sys.byteorder == 'big':
+            column.byteswap()
+        offset += size
+    return CachedAnalysis(buffer, statistics, errors)
+
+class AnalysisCache:
+    """Two-tier (memory, disk) cache of analyses keyed by content hash and lexer version"""
+    
+    def __init__(self, directory: Optional[str] = None, memory_limit: int = 64 << 20, disk_limit: int = 512 << 20):
+        self.directory = directory        # Disk katmanı dizini (None ise sadece bellek)
+        self.memory_limit = memory_limit  # Bellek katmanı bayt sınırı
+        self.disk_limit = disk_limit      # Disk katmanı bayt sınırı
+        self.memory = OrderedDict()       # anahtar -> kodlanmış kayıt (en eski kullanılan başta)
+        self.memory_size = 0
+        self.disk = OrderedDict()         # anahtar -> dosya boyutu (en eski kullanılan başta)
+        self.disk_size = 0
+        self.hits = 0
+        self.misses = 0
+        if directory is not None:
+            self._load_disk_index()
+    
+    @staticmethod
+    def key(code: str) -> str:
+        """Content hash of the code combined with the lexer and cache format versions"""
+        digest = hashlib.sha256(f"{LEXER_VERSION}:{CACHE_FORMAT}:".encode('ascii'))
+        digest.update(code.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+    
+    def get(self, code: str) -> Optional[CachedAnalysis]:
+        """Return the cached analysis of the code, or None"""
+        key = self.key(code)
+        data = self.memory.get(key)
+        if data is not None:
+            self.memory.move_to_end(key)
+        elif self.directory is not None:
+            # Dizin diğer süreçlerle paylaşılabilir: indekste olmayan kayıtlar da denenir
+            try:
+                with open(self._path(key), 'rb') as record:
+                    data = record.read()
+                os.utime(self._path(key))  # Dosya zamanı LRU sırası olarak kullanılır
+            except OSError:
+                self._forget_disk(key)
+            else:
+                if key in self.disk:
+                    self.disk.move_to_end(key)
+                else:
+                    self.disk[key] = len(data)
+                    self.disk_size += len(data)
+                self._remember(key, data)
+        analysis = decode_analysis(data, code) if data is not None else None
+        if analysis is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return analysis
+    
+    def put(self, code: str, buffer: TokenBuffer, statistics: dict, errors: List[str]):
+        """Store an analysis in both tiers"""
+        key = self.key(code)
+        data = encode_analysis(buffer, statistics, errors)
+        self._remember(key, data)
+        if self.directory is not None:
+            self._write_disk(key, data)
+    
+    def analyze(self, code: str, backend: str = 'regex') -> CachedAnalysis:
+        """Return the cached analysis, lexing and parsing the code on a miss"""
+        analysis = self.get(code)
+        if analysis is None:
+            analysis = analyze_code(code, backend)
+            self.put(code, analysis.buffer, analysis.statistics, analysis.errors)
+        return analysis
+    
+    def _remember(self, key: str, data: bytes):
+        """Add a record to the memory tier and evict least recently used records"""
+        if key in self.memory:
+            self.memory_size -= len(self.memory.pop(key))
+        if len(data) > self.memory_limit:
+            return
+        self.memory[key] = data
+        self.memory_size += len(data)
+        while self.memory_size > self.memory_limit:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_size -= len(evicted)
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + '.bin')
+    
+    def _load_disk_index(self):
+        """Scan the cache directory, ordering records by last access time"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.bin'):
+                    try:
+                        status = os.stat(os.path.join(root, name))
+                    except OSError:
+                        continue
+                    entries.append((status.st_mtime, name[:-4], status.st_size))
+        for _, key, size in sorted(entries):
+            self.disk[key] = size
+            self.disk_size += size
+    
+    def _write_disk(self, key: str, data: bytes):
+        """Write a record atomically and evict least recently used records"""
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(descriptor, 'wb') as record:
+                record.write(data)
+            os.replace(temporary, path)  # Eşzamanlı okuyucular yarım kayıt görmez
+        except OSError:
+            return  # Disk katmanı isteğe bağlıdır; yazılamazsa bellek katmanı yeterli
+        self._forget_disk(key)
+        self.disk[key] = len(data)
+        self.disk_size += len(data)
+        while self.disk_size > self.disk_limit and len(self.disk) > 1:
+            evicted = next(iter(self.disk))
+            try:
+                os.remove(self._path(evicted))
+            except OSError:
+                pass
+            self._forget_disk(evicted)
+    
+    def _forget_disk(self, key: str):
+        """Drop a record from the disk index"""
+        size = self.disk.pop(key, None)
+        if size is not None:
+            self.disk_size -= size
@@ -0,0 +1,35 @@
+# Renk şeması: GUI ve başsız (tkinter gerektirmeyen) çıktılar tarafından paylaşılır
+from tokens import TokenType
+
+class ColorScheme:
+    """Color scheme for syntax highlighting"""
+    
+    COLORS = {
+        TokenType.KEYWORD: "#0066CC",      # Anahtar kelimeler için mavi
+        TokenType.STRING: "#009900",       # Stringler için yeşil
+        TokenType.NUMBER: "#FF6600",       # Sayılar için turuncu
+        TokenType.COMMENT: "#808080",      # Yorumlar için gri
+        TokenType.OPERATOR: "#CC0000",     # Operatörler için kırmızı
+        TokenType.DELIMITER: "#663399",    # Ayraçlar için mor
+        TokenType.IDENTIFIER: "#000000",   # Tanımlayıcılar için siyah
+        TokenType.UNKNOWN: "#FF0000"       # Hatalı/unknown için parlak kırmızı
+    }
+    
+    STYLES = {
+        TokenType.KEYWORD: "bold",         # Anahtar kelimeler kalın
+        TokenType.COMMENT: "italic"        # Yorumlar italik
+    }
+    
+    BRACKET_MATCH = "#CCE5FF"  # Editörde imlecin yanındaki parantez ve eşi için arka plan
+    BRACKET_ERROR = "#FFCCCC"  # Eşi olmayan veya türü uymayan parantezler için arka plan
+    SYMBOL_MATCH = "#E8E8E8"   # İmlecin üstündeki tanımlayıcının diğer geçişleri için arka plan
+    
+    @classmethod
+    def get_color(cls, token_type: TokenType) -> str:
+        """Belirli bir token türü için renk döndürür"""
+        return cls.COLORS.get(token_type, "#000000")
+    
+    @classmethod
+    def get_style(cls, token_type: TokenType) -> str:
+        """Belirli bir token türü için yazı stili döndürür ("bold", "italic" veya "")"""
+        return cls.STYLES.get(token_type, "")
@@ -0,0 +1,299 @@
+# Yerel vurgulama sunucusu: python daemon.py [--socket YOL | --port 8765] [--cache-dir DIR]
+# Protokol: her satırda bir JSON mesajı. İstekler {"id", "method", ...}, yanıtlar {"id", "result"} veya {"id", "error"}
+import argparse
+import asyncio
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set
+from cache import AnalysisCache
+from lexer import LEXER_BACKENDS, SimpleLexicalAnalyzer, create_lexer, find_token_index
+from parser import SimpleParser
+from tokens import TOKEN_TYPES, TokenBuffer, TokenType
+
+MAX_MESSAGE = 64 << 20  # Tek bir JSON satırının en büyük boyutu (bayt)
+MAX_PENDING = 32        # Bağlantı başına işlenmeyi bekleyen istek sınırı (dolunca soketten okuma durur)
+
+class DaemonError(Exception):
+    """Request error reported back to the client as {"id", "error"}"""
+
+def token_spans(tokens, start: int = 0, end: Optional[int] = None) -> List[list]:
+    """[type, start, end, line, column] rows (as in batch.py's JSON lines) of tokens starting in [start, end)"""
+    if isinstance(tokens, TokenBuffer):
+        rows = zip(tokens.types, tokens.starts, tokens.ends, tokens.lines, tokens.columns)
+        return [[TOKEN_TYPES[code].value, token_start, token_end, line, column]
+                for code, token_start, token_end, line, column in rows
+                if token_start >= start and (end is None or token_start < end)]
+    return [[token.type.value, token.position, token.position + len(token.value), token.line, token.column]
+            for token in tokens if token.position >= start and (end is None or token.position < end)]
+
+class Document:
+    """One open document: its text plus the lexer and parser kept warm for incremental edits"""
+    
+    def __init__(self, uri: str, text: str, version: Optional[int] = None):
+        self.uri = uri
+        self.text = text
+        self.version = version  # İstemcinin verdiği sürüm numarası (yanıtlarda geri gönderilir)
+        self.lexer: Optional[SimpleLexicalAnalyzer] = None  # İlk düzenlemeye kadar boş kalabilir (önbellekten açılış)
+        self.parser: Optional[SimpleParser] = None
+        self.tokens = []       # Son tokenlar (liste veya önbellekten gelen TokenBuffer)
+        self.statistics = {}   # Son lexer istatistikleri
+        self.errors = []       # Son parser hataları
+        self.clients = 0       # Belgeyi açık tutan bağlantı sayısı
+        self.lock = asyncio.Lock()  # Aynı belgeye gelen düzenlemeler sırayla uygulanır
+    
+    def analyze(self, backend: str, cache: Optional[AnalysisCache], cache_lock: threading.Lock) -> dict:
+        """Full analysis of the current text (served from the cache when possible)"""
+        if cache is not None:
+            with cache_lock:
+                cached = cache.get(self.text)
+            if cached is not None:
+                self.lexer = self.parser = None
+                self.tokens, self.statistics, self.errors = cached.buffer, cached.statistics, cached.errors
+                return self._result(token_spans(self.tokens))
+        self.lexer = create_lexer(self.text, backend)
+        self.tokens = self.lexer.tokenize()
+        self.parser = SimpleParser(self.tokens)
+        self.parser.parse()
+        self.statistics, self.errors = self.lexer.get_statistics(), self.parser.errors
+        if cache is not None:
+            with cache_lock:
+                cache.put(self.text, TokenBuffer.from_tokens(self.tokens, self.text), self.statistics, self.errors)
+        return self._result(token_spans(self.tokens))
+    
+    def edit(self, offset: int, deleted: int, inserted: str, backend: str) -> dict:
+        """Apply one edit, re-lex and reparse incrementally, return only the re-lexed token range"""
+        if not 0 <= offset <= len(self.text) or not 0 <= deleted <= len(self.text) - offset:
+            raise DaemonError(f"edit out of range: offset {offset}, deleted {deleted}, length {len(self.text)}")
+        text = self.text[:offset] + inserted + self.text[offset + deleted:]
+        line_delta = inserted.count('\n') - self.text.count('\n', offset, offset + deleted)
+        try:
+            if self.lexer is None:
+                # Önbellekten açılmış belge: ilk düzenlemede lexer ve parser baştan kurulur
+                lexer = create_lexer(text, backend)
+                tokens = lexer.tokenize()
+                parser = SimpleParser(tokens)
+                parser.parse()
+                start, end = 0, len(text)
+            else:
+                lexer, parser, edit = self.lexer, self.parser, (offset, deleted, inserted)
+                tokens = lexer.retokenize(*edit)
+                parser.reparse(tokens, edit, lexer.relexed_end)
+                # retokenize() düzenlemeden önceki son NEWLINE token'ından lexer'ın yeniden eşleştiği yere kadar tarar
+                first = find_token_index(tokens, offset)
+                while first > 0 and tokens[first - 1].type != TokenType.NEWLINE:
+                    first -= 1
+                start = tokens[first - 1].position + 1 if first > 0 else 0
+                end = lexer.relexed_end
+        except Exception:
+            # Metin istemcinin bildiği hâlde kalır; yarıda kalan artımlı durum (kaydırılmış tokenlar) baştan kurulur
+            self.analyze(backend, None, None)
+            raise
+        self.text, self.lexer, self.parser, self.tokens = text, lexer, parser, tokens
+        self.statistics, self.errors = lexer.get_statistics(), parser.errors
+        result = self._result(token_spans(self.tokens, start, end))
+        # Bu aralıktan önceki tokenlar aynı; sonrakiler yeni bir satırdan başlar ve (eski pozisyon + delta,
+        # eski satır + line_delta) olarak kaydırılmıştır, sütunları değişmez
+        result.update(start=start, end=end, delta=len(inserted) - deleted, line_delta=line_delta)
+        return result
+    
+    def _result(self, tokens: List[list]) -> dict:
+        return {
+            'uri': self.uri,
+            'version': self.version,
+            'tokens': tokens,
+            'errors': self.errors,
+            'statistics': {
+                'total_tokens': self.statistics['total_tokens'],
+                'total_lines': self.statistics['total_lines'],
+                'error_count': self.statistics['error_count'],
+                'warning_count': self.statistics['warning_count'],
+            },
+        }
+
+class HighlightDaemon:
+    """Asyncio server holding open documents in memory and answering open/edit/tokens/close requests"""
+    
+    def __init__(self, backend: str = 'regex', cache: Optional[AnalysisCache] = None, jobs: int = 2):
+        self.backend = backend          # Tam analizde kullanılan lexer arka ucu
+        self.cache = cache              # Açılışlar için içerik adresli önbellek (bağlantılar arası paylaşılır)
+        self.documents: Dict[str, Document] = {}  # uri -> açık belge
+        self._cache_lock = threading.Lock()  # AnalysisCache thread güvenli değil
+        # Analizler olay döngüsünü bloklamamak için thread havuzunda çalışır; semafor bekleyen iş sayısını sınırlar
+        self._executor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="daemon-analysis")
+        self._slots = asyncio.Semaphore(jobs)
+        self.connections = 0
+    
+    async def serve_unix(self, path: str):
+        """Serve on a Unix domain socket until cancelled"""
+        server = await asyncio.start_unix_server(self._handle_connection, path, limit=MAX_MESSAGE)
+        async with server:
+            await server.serve_forever()
+    
+    async def serve_tcp(self, host: str, port: int):
+        """Serve on a TCP port (localhost by default) until cancelled"""
+        server = await asyncio.start_server(self._handle_connection, host, port, limit=MAX_MESSAGE)
+        async with server:
+            await server.serve_forever()
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Read requests into a bounded queue and answer them in order; close the client's documents at the end"""
+        self.connections += 1
+        requests = asyncio.Queue(MAX_PENDING)  # Dolunca okuyucu bekler: TCP penceresi istemciyi yavaşlatır
+        opened: Set[str] = set()  # Bu bağlantının açtığı belgeler
+        responder = asyncio.ensure_future(self._respond(requests, writer, opened))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    await requests.put({'error': f"message larger than {MAX_MESSAGE} bytes"})
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    await requests.put(line)
+            await requests.put(None)
+            await responder  # Kuyruktaki istekler yanıtlanır
+        except ConnectionError:
+            pass
+        finally:
+            responder.cancel()
+            for uri in opened:
+                self._release(uri)
+            writer.close()
+            self.connections -= 1
+    
+    async def _respond(self, requests: asyncio.Queue, writer: asyncio.StreamWriter, opened: Set[str]):
+        """Handle queued requests one by one, waiting for the client to read each response"""
+        while True:
+            line = await requests.get()
+            if line is None:
+                return
+            if isinstance(line, dict):
+                response = dict(line, id=None)  # Okuma hatası
+            else:
+                response = await self._dispatch(line, opened)
+            try:
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                await writer.drain()  # Yavaş okuyan istemci: yanıtlar bellekte birikmez
+            except ConnectionError:
+                return
+    
+    async def _dispatch(self, line: bytes, opened: Set[str]) -> dict:
+        """Decode one request and run its method"""
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise DaemonError("request must be a JSON object")
+            request_id = request.get('id')
+            method = request.get('method')
+            handler = getattr(self, f"_method_{method}", None) if isinstance(method, str) else None
+            if handler is None:
+                raise DaemonError(f"unknown method {method!r}")
+            return {'id': request_id, 'result': await handler(request, opened)}
+        except json.JSONDecodeError as e:
+            return {'id': None, 'error': f"invalid JSON: {e}"}
+        except (DaemonError, KeyError, TypeError, ValueError) as e:
+            # ValueError: UTF-8 olmayan istek satırı (UnicodeDecodeError) veya geçersiz alan değeri
+            message = f"missing field {e}" if isinstance(e, KeyError) else str(e)
+            return {'id': request_id, 'error': message}
+        except Exception as e:
+            # Analizdeki beklenmeyen bir hata bağlantıyı kapatmaz: istemci yine yanıt alır
+            return {'id': request_id, 'error': f"internal error: {type(e).__name__}: {e}"}
+    
+    async def _run(self, function, *arguments):
+        """Run an analysis on the thread pool, at most `jobs` at a time"""
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, function, *arguments)
+    
+    def _document(self, request: dict) -> Document:
+        document = self.documents.get(request['uri'])
+        if document is None:
+            raise DaemonError(f"document not open: {request['uri']}")
+        return document
+    
+    async def _method_open(self, request: dict, opened: Set[str]) -> dict:
+        """{"method": "open", "uri", "text", ["version"]}: (re)load a document, return all its tokens"""
+        uri, text = request['uri'], request['text']
+        if not isinstance(text, str):
+            raise DaemonError("text must be a string")
+        document = self.documents.get(uri)
+        if document is None:
+            document = self.documents[uri] = Document(uri, text)
+        if uri not in opened:
+            opened.add(uri)
+            document.clients += 1
+        async with document.lock:
+            document.text, document.version = text, request.get('version')
+            return await self._run(document.analyze, self.backend, self.cache, self._cache_lock)
+    
+    async def _method_edit(self, request: dict, opened: Set[str]) -> dict:
+        """{"method": "edit", "uri", "offset", "deleted", "text", ["version"]}: apply one edit, return changed tokens"""
+        document = self._document(request)
+        offset, deleted, inserted = request['offset'], request.get('deleted', 0), request.get('text', '')
+        if not isinstance(offset, int) or not isinstance(deleted, int) or not isinstance(inserted, str):
+            raise DaemonError("offset and deleted must be integers, text a string")
+        async with document.lock:
+            result = await self._run(document.edit, offset, deleted, inserted, self.backend)
+            document.version = result['version'] = request.get('version', document.version)  # Sadece başarılı düzenleme
+            return result
+    
+    async def _method_tokens(self, request: dict, opened: Set[str]) -> dict:
+        """{"method": "tokens", "uri"}: all current tokens and diagnostics of an open document"""
+        document = self._document(request)
+        async with document.lock:
+            return document._result(token_spans(document.tokens))
+    
+    async def _method_close(self, request: dict, opened: Set[str]) -> dict:
+        """{"method": "close", "uri"}: release the document (it stays loaded while other clients have it open)"""
+        uri = request['uri']
+        if uri in opened:
+            opened.discard(uri)
+            self._release(uri)
+        return {'uri': uri, 'open': uri in self.documents}
+    
+    async def _method_status(self, request: dict, opened: Set[str]) -> dict:
+        """{"method": "status"}: open documents, connections and cache counters"""
+        status = {'documents': sorted(self.documents), 'connections': self.connections}
+        if self.cache is not None:
+            status.update(cache_hits=self.cache.hits, cache_misses=self.cache.misses)
+        return status
+    
+    def _release(self, uri: str):
+        """Drop one client's reference to a document, unloading it when nobody has it open"""
+        document = self.documents.get(uri)
+        if document is not None:
+            document.clients -= 1
+            if document.clients <= 0:
+                del self.documents[uri]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argument_parser = argparse.ArgumentParser(description="Local highlighting daemon (JSON lines over a socket)")
+    argument_parser.add_argument('--socket', help="Unix domain socket path (default: TCP on --host/--port)")
+    argument_parser.add_argument('--host', default='127.0.0.1', help="TCP host (default: 127.0.0.1)")
+    argument_parser.add_argument('--port', type=int, default=8765, help="TCP port (default: 8765)")
+    argument_parser.add_argument('--backend', choices=sorted(LEXER_BACKENDS), default='regex', help="lexer backend")
+    argument_parser.add_argument('--jobs', type=int, default=2, help="concurrent analyses (default: 2)")
+    argument_parser.add_argument('--cache-dir', help="persistent token cache directory shared with batch.py")
+    arguments = argument_parser.parse_args(argv)
+    
+    async def run():
+        daemon = HighlightDaemon(arguments.backend, AnalysisCache(arguments.cache_dir), max(1, arguments.jobs))
+        if arguments.socket:
+            await daemon.serve_unix(arguments.socket)
+        else:
+            await daemon.serve_tcp(arguments.host, arguments.port)
+    
+    address = arguments.socket or f"{arguments.host}:{arguments.port}"
+    print(f"Highlight daemon listening on {address}", file=sys.stderr)
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+# Parça tablosu belge modeli: düzenlemeler metni kopyalamadan kaydedilir, anlık görüntüler ucuz ve değişmezdir
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Tuple
+from tokens import LineIndex
+
+MAX_PIECES = 512  # Parça sayısı bunu aşınca tablo tek parçaya sıkıştırılır (tek bir kopya)
+
+def tk_delete_range(lines: LineIndex, start: int, end: int) -> Tuple[int, int]:
+    """Offsets Tk's text 'delete' really removes for index1 at start and index2 at end (text ends with its last newline)
+    
+    Tk keeps the final newline: when index2 is on the empty line after it, index2 moves back one
+    character, and an index1 at the start of a line other than the first moves back too (the newline
+    before the deleted lines is removed instead). An empty range (start >= end) deletes nothing.
+    """
+    if start >= end:
+        return start, start
+    if end >= lines.length:
+        end = lines.length - 1
+        if start > 0 and lines.location(start)[1] == 1:
+            start -= 1
+    return start, max(start, end)
+
+class DocumentSnapshot:
+    """Immutable state of a PieceTable at one version; the text is joined once, on first use"""
+    __slots__ = ('pieces', 'length', 'version', '_text')
+    
+    def __init__(self, pieces: tuple, length: int, version: int):
+        self.pieces = pieces    # (kaynak string, başlangıç, bitiş) parçaları; stringler belgeyle paylaşılır
+        self.length = length    # Metnin uzunluğu
+        self.version = version  # Görüntünün alındığı düzenleme sürümü
+        self._text = None       # Birleştirilmiş metin (ilk istekte oluşturulur)
+    
+    def text(self) -> str:
+        """The snapshot's text as one string (join of the pieces, done once; e.g. on the analysis thread)"""
+        if self._text is None:
+            pieces = self.pieces
+            if len(pieces) == 1 and pieces[0][1] == 0 and pieces[0][2] == len(pieces[0][0]):
+                self._text = pieces[0][0]  # Tek ve tam parça: kopya gerekmez
+            else:
+                self._text = ''.join([source[start:end] for source, start, end in pieces])
+        return self._text
+    
+    def __len__(self):
+        return self.length
+
+class PieceTable:
+    """Text stored as pieces of immutable strings: an edit splits pieces instead of copying the text"""
+    
+    def __init__(self, text: str = ''):
+        self.version = 0  # Her düzenlemede artar
+        self.reset(text)
+    
+    def reset(self, text: str):
+        """Replace the whole content with text (one piece, no copy)"""
+        self.pieces = [(text, 0, len(text))] if text else []  # (kaynak string, başlangıç, bitiş)
+        self._ends = [len(text)] if text else []  # Her parçanın metindeki bitiş pozisyonu
+        self.length = len(text)
+        self.lines = LineIndex(text)  # Satır başlangıçları: Tk 'satır.sütun' indekslerini pozisyona çevirir
+        self.version += 1
+        self._snapshot = None
+    
+    def insert(self, offset: int, text: str):
+        """Insert text at offset"""
+        if not text:
+            return
+        index = self._split(offset)
+        self.pieces.insert(index, (text, 0, len(text)))
+        self.lines.update(offset, 0, text)
+        self._changed(len(text))
+    
+    def delete(self, offset: int, length: int):
+        """Delete length characters starting at offset"""
+        length = min(length, self.length - offset)
+        if length <= 0:
+            return
+        first = self._split(offset)
+        last = self._split(offset + length)
+        del self.pieces[first:last]
+        self.lines.update(offset, length, '')
+        self._changed(-length)
+    
+    def snapshot(self) -> DocumentSnapshot:
+        """Current content as an immutable snapshot (the same object until the next edit)"""
+        if self._snapshot is None:
+            self._snapshot = DocumentSnapshot(tuple(self.pieces), self.length, self.version)
+        return self._snapshot
+    
+    def text(self) -> str:
+        return self.snapshot().text()
+    
+    def _split(self, offset: int) -> int:
+        """Split the piece containing offset so that a piece starts there, return that piece's index"""
+        index = bisect_right(self._ends, offset)  # offset'ten sonra biten ilk parça
+        if index == len(self.pieces):
+            return index  # Metnin sonu
+        piece_start = self._ends[index - 1] if index else 0
+        if offset == piece_start:
+            return index
+        source, start, end = self.pieces[index]
+        middle = start + offset - piece_start
+        self.pieces[index:index + 1] = [(source, start, middle), (source, middle, end)]
+        self._ends.insert(index, offset)
+        return index + 1
+    
+    def _changed(self, delta: int):
+        """Refresh the piece ends after an edit, compacting the table when it has too many pieces"""
+        self.length += delta
+        self.version += 1
+        self._snapshot = None
+        if len(self.pieces) > MAX_PIECES:
+            text = ''.join([source[start:end] for source, start, end in self.pieces])
+            self.pieces = [(text, 0, len(text))]  # Önceki görüntüler eski parçaları tutmaya devam eder
+        self._ends = list(accumulate(end - start for source, start, end in self.pieces))
@@ -1,50 +1,38 @@
+import queue
+import time
 from typing import List, Optional
-from tokens import Token, TokenType
+from tokens import LineIndex, Token, TokenStatistics, TokenType
 import tkinter as tk
-from tkinter import messagebox, simpledialog, scrolledtext, ttk
-from lexer import SimpleLexicalAnalyzer
-from parser import SimpleParser
+from tkinter import filedialog, messagebox, simpledialog, scrolledtext, ttk
+from cache import AnalysisCache
+from colors import ColorScheme
+from document import DocumentSnapshot, PieceTable, tk_delete_range
+from instrumentation import recorder
+from lexer import create_lexer, find_edit, find_token_index
+from worker import AnalysisResult, AnalysisWorker
 
-class ColorScheme:
-    """Color scheme for syntax highlighting"""
-    
-    COLORS = {
-        TokenType.KEYWORD: "#0066CC",      # Anahtar kelimeler için mavi
-        TokenType.STRING: "#009900",       # Stringler için yeşil
-        TokenType.NUMBER: "#FF6600",       # Sayılar için turuncu
-        TokenType.COMMENT: "#808080",      # Yorumlar için gri
-        TokenType.OPERATOR: "#CC0000",     # Operatörler için kırmızı
-        TokenType.DELIMITER: "#663399",    # Ayraçlar için mor
-        TokenType.IDENTIFIER: "#000000",   # Tanımlayıcılar için siyah
-        TokenType.UNKNOWN: "#FF0000"       # Hatalı/unknown için parlak kırmızı
-    }
-    
-    @classmethod
-    def get_color(cls, token_type: TokenType) -> str:
-        """Belirli bir token türü için renk döndürür"""
-        return cls.COLORS.get(token_type, "#000000")
-    
 class StatusManager:
     """Durum çubuğu güncellemelerini yönetir"""
     
     def __init__(self, status_var: tk.StringVar):
         self.status_var = status_var
-        
+    
     def set_status(self, message: str):
         """Durum mesajını ayarla"""
         self.status_var.set(message)
-        
+    
     def set_analyzing(self):
         """Analiz ediliyor mesajı"""
         self.set_status("Analyzing...")
-        
-    def set_complete(self, token_count: int, error_count: int = 0):
-        """Analiz tamamlandı mesajı"""
+    
+    def set_complete(self, token_count: int, error_count: int = 0, timings: str = ""):
+        """Analiz tamamlandı mesajı (isteğe bağlı aşama süreleriyle)"""
         if error_count > 0:
-            self.set_status(f"Analysis complete - {token_count} tokens, {error_count} parse errors")
+            message = f"Analysis complete - {token_count} tokens, {error_count} parse errors"
         else:
-            self.set_status(f"Analysis complete - {token_count} tokens")
-            
+            message = f"Analysis complete - {token_count} tokens"
+        self.set_status(f"{message} | {timings}" if timings else message)
+    
     def set_error(self, error_msg: str):
         """Hata mesajı"""
         self.set_status(f"Error: {error_msg}")
@@ -52,7 +40,13 @@ class StatusManager:
 class HighlightedTextView:
     """Sözdizimi vurgulu metin gösterimini yönetir"""
     
+    TAG_NAMES = {token_type: token_type.value.lower() for token_type in TokenType}  # Token türü -> tag adı
+    VIEWPORT_MARGIN = 50   # Görünen bölgenin üstünde ve altında hemen boyanan satır sayısı
+    FRAME_BUDGET = 0.008   # Arka plan boyamasında bir partinin en uzun süresi (saniye)
+    BATCH_CHARS = 4096     # Bir boyama adımında en fazla bu kadar karakter (satır sonuna tamamlanır)
+    
     def __init__(self, parent_frame):
+        self._reset()
         self.text_widget = scrolledtext.ScrolledText(
             parent_frame,
             wrap=tk.NONE, 
@@ -62,8 +56,19 @@ class HighlightedTextView:
             height=30
         )
         self.text_widget.pack(fill=tk.BOTH, expand=True)
+        self.text_widget.configure(yscrollcommand=self._on_scroll)  # Kaydırınca yeni görünen bölge önce boyanır
         self._setup_tags()
     
+    def _reset(self):
+        """Boş belge durumu"""
+        self.code = ""     # Widget'ta gösterilen metnin kopyası
+        self.lines = LineIndex()  # code'un satır başlangıçları: pozisyon <-> Tk 'satır.sütun' dönüşümü
+        self.spans = []    # Son tokenların (başlangıç, bitiş, tag) aralıkları
+        self.pending = []  # Tag'leri henüz spans ile uyuşmayan (başlangıç, bitiş) aralıkları, sıralı ve ayrık
+        self._paint_from = 0       # Arka plan boyaması bu pozisyondan aşağı doğru devam eder
+        self._paint_job = None     # Zamanlanmış arka plan boyaması (after kimliği)
+        self._visible_job = None   # Kaydırmadan sonra zamanlanmış görünen bölge boyaması
+    
     def _setup_tags(self):
         """Vurgulama için tag'leri ayarla"""
         for token_type in TokenType:
@@ -72,50 +77,319 @@ class HighlightedTextView:
             self.text_widget.tag_configure(tag_name, foreground=color)
             
             # Anahtar kelimeler kalın, yorumlar italik
-            if token_type == TokenType.KEYWORD:
-                self.text_widget.tag_configure(tag_name, font=("Consolas", 12, "bold"))
-            elif token_type == TokenType.COMMENT:
-                self.text_widget.tag_configure(tag_name, font=("Consolas", 12, "italic"))
+            style = ColorScheme.get_style(token_type)
+            if style:
+                self.text_widget.tag_configure(tag_name, font=("Consolas", 12, style))
     
-    def update_highlighted_text(self, tokens: List[Token]):
-        """Vurgulu metni güncelle"""
-        self.text_widget.config(state=tk.NORMAL)
-        self.text_widget.delete("1.0", tk.END)
-        for token in tokens:
-            tag_name = token.type.value.lower()
-            self.text_widget.insert(tk.END, token.value, tag_name)
-        self.text_widget.config(state=tk.DISABLED)
+    @recorder.timed("view.highlight")
+    def update_highlighted_text(self, tokens: List[Token], code: str):
+        """Vurgulu metni günceller: sadece değişen metin ve tag aralıkları Tk'ya gönderilir"""
+        # 1) Metin farkını widget'a uygula (tamamını silip yeniden eklemek yerine)
+        edit = find_edit(self.code, code)
+        if edit is not None and self.pending:
+            # Henüz boyanmamış aralıklar da metinle birlikte kayar
+            shifted = [(self._shift(start, edit), self._shift(end, edit)) for start, end in self.pending]
+            self.pending = [(start, end) for start, end in shifted if start < end]
+        delta = 0
+        dirty_start, dirty_end = len(code), 0  # Yeniden boyanacak aralık (yeni koddaki pozisyonlar)
+        if edit is not None:
+            offset, deleted_length, inserted_text = edit
+            start_index, end_index = self.tk_indices([offset, offset + deleted_length])
+            self.lines.update(offset, deleted_length, inserted_text)
+            self.text_widget.config(state=tk.NORMAL)
+            if deleted_length:
+                self.text_widget.delete(start_index, end_index)
+            if inserted_text:
+                self.text_widget.insert(start_index, inserted_text)
+            self.text_widget.config(state=tk.DISABLED)
+            recorder.count('tk_calls', 2 + bool(deleted_length) + bool(inserted_text))
+            delta = len(inserted_text) - deleted_length
+            dirty_start, dirty_end = offset, offset + len(inserted_text)
+        
+        # 2) Yeni token aralıklarını eskileriyle karşılaştır (baştan ve sondan ortak kısımlar atlanır)
+        spans = [(token.position, token.position + len(token.value), self.TAG_NAMES[token.type])
+                 for token in tokens if token.type != TokenType.NEWLINE]
+        old_spans = self.spans
+        limit = min(len(spans), len(old_spans))
+        prefix = 0  # Düzenlemeden önce biten ortak aralıklar
+        while (prefix < limit and spans[prefix] == old_spans[prefix] and
+               (edit is None or spans[prefix][1] <= dirty_start)):
+            prefix += 1
+        suffix = 0  # Düzenlemeden sonra başlayan, sadece kaymış ortak aralıklar
+        while suffix < limit - prefix:
+            old_start, old_end, old_tag = old_spans[-1 - suffix]
+            if spans[-1 - suffix] != (old_start + delta, old_end + delta, old_tag) or \
+                    (edit is not None and spans[-1 - suffix][0] < dirty_end):
+                break
+            suffix += 1
+        changed = spans[prefix:len(spans) - suffix]
+        old_changed = old_spans[prefix:len(old_spans) - suffix]
+        if changed:
+            dirty_start = min(dirty_start, changed[0][0])
+            dirty_end = max(dirty_end, changed[-1][1])
+        if old_changed and edit is not None:
+            dirty_start = min(dirty_start, self._shift(old_changed[0][0], edit))
+            dirty_end = max(dirty_end, self._shift(old_changed[-1][1], edit))
+        elif old_changed:
+            dirty_start = min(dirty_start, old_changed[0][0])
+            dirty_end = max(dirty_end, old_changed[-1][1])
+        self.code = code
+        self.spans = spans
+        if dirty_start < dirty_end:
+            self._add_pending(dirty_start, dirty_end)
+        
+        # 3) Görünen bölge (ve kenar payı) hemen, belgenin geri kalanı zaman dilimli partilerle boyanır
+        self._paint_visible()
+        self._schedule_paint()
+    
+    def _paint(self, start: int, end: int):
+        """Aralıktaki tag'leri temizler ve kesişen tokenları tag başına tek çağrıyla yeniden boyar"""
+        spans = self.spans
+        low, high = 0, len(spans)
+        while low < high:  # İkili arama: bitişi start'tan sonra olan ilk aralık
+            middle = (low + high) // 2
+            if spans[middle][1] <= start:
+                low = middle + 1
+            else:
+                high = middle
+        first = last = low
+        while last < len(spans) and spans[last][0] < end:
+            last += 1
+        offsets = {start, end}
+        for span_start, span_end, tag in spans[first:last]:
+            offsets.update((span_start, span_end))
+        index_of = dict(zip(offsets, self.tk_indices(offsets)))
+        for tag in self.TAG_NAMES.values():
+            self.text_widget.tag_remove(tag, index_of[start], index_of[end])
+        ranges = {}
+        for span_start, span_end, tag in spans[first:last]:
+            ranges.setdefault(tag, []).extend((index_of[span_start], index_of[span_end]))
+        for tag, indices in ranges.items():
+            self.text_widget.tag_add(tag, *indices)
+        recorder.count('tk_calls', len(self.TAG_NAMES) + len(ranges))
+    
+    def _add_pending(self, start: int, end: int):
+        """Aralığı bekleyen boyamalara ekler (çakışan ve bitişik aralıklar birleştirilir)"""
+        merged = []
+        for pending_start, pending_end in self.pending:
+            if pending_end < start or pending_start > end:
+                merged.append((pending_start, pending_end))
+            else:
+                start, end = min(start, pending_start), max(end, pending_end)
+        merged.append((start, end))
+        merged.sort()
+        self.pending = merged
+    
+    def _take_pending(self, start: int, end: int) -> List[tuple]:
+        """Bekleyen aralıkların [start, end) ile kesişen kısımlarını çıkarıp döndürür"""
+        taken, remaining = [], []
+        for pending_start, pending_end in self.pending:
+            if pending_end <= start or pending_start >= end:
+                remaining.append((pending_start, pending_end))
+                continue
+            taken.append((max(start, pending_start), min(end, pending_end)))
+            if pending_start < start:
+                remaining.append((pending_start, start))
+            if pending_end > end:
+                remaining.append((end, pending_end))
+        self.pending = remaining
+        return taken
+    
+    def _visible_range(self) -> tuple:
+        """Ekranda görünen satırların (kenar payıyla) karakter aralığı"""
+        widget = self.text_widget
+        first = widget.index(f"@0,0 - {self.VIEWPORT_MARGIN} lines linestart")
+        last = widget.index(f"@0,{widget.winfo_height()} + {self.VIEWPORT_MARGIN} lines lineend")
+        return self.offset_of(first), min(len(self.code), self.offset_of(last) + 1)
+    
+    def _paint_visible(self):
+        """Görünen bölgedeki bekleyen aralıkları hemen boyar"""
+        self._visible_job = None
+        if not self.pending:
+            return
+        start, end = self._visible_range()
+        for taken_start, taken_end in self._take_pending(start, end):
+            self._paint(taken_start, taken_end)
+        self._paint_from = end  # Arka plan boyaması görünen bölgenin altından devam eder
+    
+    def _schedule_paint(self):
+        if self.pending and self._paint_job is None:
+            self._paint_job = self.text_widget.after(1, self._paint_pending)
+    
+    def _paint_pending(self):
+        """Bekleyen aralıkları FRAME_BUDGET dolana kadar partiler halinde boyar, kalanı sonraya bırakır"""
+        self._paint_job = None
+        deadline = time.perf_counter() + self.FRAME_BUDGET
+        batch_time = 0.0  # Son partinin süresi: bir sonraki parti süreyi aşacaksa başlatılmaz
+        with recorder.span("view.background_paint"):
+            while self.pending and time.perf_counter() + batch_time < deadline:
+                batch_start = time.perf_counter()
+                # Önce görünen bölgenin altındaki ilk aralık, o yoksa belgenin başındaki
+                following = next(((start, end) for start, end in self.pending if end > self._paint_from), None)
+                if following is not None:
+                    start, end = max(following[0], self._paint_from), following[1]
+                else:
+                    start, end = self.pending[0]
+                if end - start > self.BATCH_CHARS:
+                    line_end = self.code.find('\n', start + self.BATCH_CHARS)
+                    end = min(end, line_end + 1) if line_end >= 0 else end
+                self._take_pending(start, end)
+                self._paint(start, end)
+                self._paint_from = end
+                batch_time = time.perf_counter() - batch_start
+        self._schedule_paint()
+    
+    def _on_scroll(self, first, last):
+        """Kaydırma çubuğunu günceller; yeni görünen bölge boşta kalındığında öncelikle boyanır"""
+        self.text_widget.vbar.set(first, last)
+        if self.pending and self._visible_job is None:
+            self._visible_job = self.text_widget.after_idle(self._paint_visible)
+    
+    @staticmethod
+    def _shift(position: int, edit) -> int:
+        """Eski koddaki bir pozisyonu düzenleme sonrası koddaki karşılığına taşır"""
+        offset, deleted_length, inserted_text = edit
+        if position <= offset:
+            return position
+        return max(offset + len(inserted_text), position + len(inserted_text) - deleted_length)
+    
+    def tk_indices(self, offsets) -> List[str]:
+        """Karakter pozisyonlarını Tk 'satır.sütun' indekslerine çevirir (satır indeksinde ikili arama)"""
+        location = self.lines.location
+        return [f"{line}.{column - 1}" for line, column in map(location, offsets)]
+    
+    def offset_of(self, index: str) -> int:
+        """Tk 'satır.sütun' indeksini gösterilen metindeki karakter pozisyonuna çevirir"""
+        line, column = map(int, index.split('.'))
+        return self.lines.offset(line, column + 1)
 
 class TokenAnalysisView:
-    """Token analiz ağacını yönetir"""
+    """Token analiz tablosunu yönetir: sadece ekranda görünen satırlar oluşturulur"""
+    
+    DEFAULT_ROW_HEIGHT = 20  # Tema satır yüksekliği vermezse kullanılır (piksel)
     
     def __init__(self, parent_frame):
+        self.tokens = []        # Gösterilen token deposu (liste veya TokenBuffer)
+        self.first = 0          # Görünen ilk token'ın indeksi
+        self.visible_rows = 20  # Ekrana sığan satır sayısı
+        self._row_values = []   # Her satırda şu an gösterilen değerler (gereksiz Tk çağrılarını önler)
         self.setup_treeview(parent_frame)
-        
+    
     def setup_treeview(self, parent_frame):
         """Token analiz ağacını oluşturur"""
+        jump_frame = ttk.Frame(parent_frame)
+        jump_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 5))
+        ttk.Label(jump_frame, text="Go to:").pack(side=tk.LEFT)
+        self.jump_var = tk.StringVar()
+        jump_entry = ttk.Entry(jump_frame, textvariable=self.jump_var, width=12)
+        jump_entry.pack(side=tk.LEFT, padx=5)
+        jump_entry.bind("<Return>", lambda event: self._jump(self.jump_to_line))
+        ttk.Button(jump_frame, text="Line", command=lambda: self._jump(self.jump_to_line)).pack(side=tk.LEFT)
+        ttk.Button(jump_frame, text="Offset", command=lambda: self._jump(self.jump_to_offset)).pack(side=tk.LEFT)
+        self.range_var = tk.StringVar(value="No tokens")
+        ttk.Label(jump_frame, textvariable=self.range_var).pack(side=tk.RIGHT)
+        
         columns = ("Position", "Line", "Column", "Type", "Value")
-        self.tree = ttk.Treeview(parent_frame, columns=columns, show="headings", height=20)
+        self.tree = ttk.Treeview(parent_frame, columns=columns, show="headings", height=self.visible_rows)
         for col in columns:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=100)
-        scrollbar = ttk.Scrollbar(parent_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        # Kaydırma çubuğu ağacın kendisini değil, token deposundaki pencereyi kaydırır
+        self.scrollbar = ttk.Scrollbar(parent_frame, orient=tk.VERTICAL, command=self._on_scrollbar)
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-    
-    def update_tokens(self, tokens: List[Token]):
-        """Token analiz ekranını günceller"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        for token in tokens[:500]:  # Performans için 500 ile sınırla
-            self.tree.insert("", tk.END, values=(
-                token.position,
-                token.line,
-                token.column,
-                token.type.value,
-                repr(token.value)
-            ))
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll_to(self.first + (-3 if event.delta > 0 else 3)))
+        self.tree.bind("<Button-4>", lambda event: self.scroll_to(self.first - 3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_to(self.first + 3))
+    
+    @recorder.timed("view.tokens")
+    def update_tokens(self, tokens):
+        """Token deposunu değiştirir ve sadece görünen satırları yeniler"""
+        self.tokens = tokens
+        self.scroll_to(self.first)
+    
+    def scroll_to(self, index: int):
+        """Görünen pencereyi verilen token indeksinden başlatır"""
+        self.first = max(0, min(index, len(self.tokens) - self.visible_rows))
+        self._render()
+    
+    def jump_to_line(self, line: int):
+        """Verilen satırdaki ilk token'a atlar"""
+        low, high = 0, len(self.tokens)
+        while low < high:  # Satır numaraları artan sırada olduğu için ikili arama
+            middle = (low + high) // 2
+            if self.tokens[middle].line < line:
+                low = middle + 1
+            else:
+                high = middle
+        self._show_index(low)
+    
+    def jump_to_offset(self, offset: int):
+        """Verilen karakter pozisyonunu içeren (veya ondan önceki) token'a atlar"""
+        self._show_index(max(0, find_token_index(self.tokens, offset + 1) - 1))
+    
+    def _show_index(self, index: int):
+        """Token'ı pencerenin başına getirip seçili gösterir"""
+        if not self.tokens:
+            return
+        index = min(index, len(self.tokens) - 1)
+        self.scroll_to(index)
+        rows = self.tree.get_children()
+        if 0 <= index - self.first < len(rows):
+            self.tree.selection_set(rows[index - self.first])
+    
+    def _jump(self, jump):
+        """Giriş kutusundaki sayıyla atlama yapar"""
+        try:
+            target = int(self.jump_var.get())
+        except ValueError:
+            self.tree.bell()
+            return
+        jump(target)
+    
+    def _on_scrollbar(self, action, amount, unit=None):
+        """Kaydırma çubuğu komutlarını ('moveto' / 'scroll') pencere indeksine çevirir"""
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.tokens)))
+        elif action == "scroll":
+            step = int(amount) * (self.visible_rows if unit == "pages" else 1)
+            self.scroll_to(self.first + step)
+    
+    def _on_resize(self, event):
+        """Pencere boyutu değişince ekrana sığan satır sayısını yeniden hesaplar"""
+        row_height = ttk.Style().lookup("Treeview", "rowheight") or self.DEFAULT_ROW_HEIGHT
+        rows = max(1, event.height // int(row_height) - 1)  # Başlık satırı hariç
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.scroll_to(self.first)
+    
+    def _render(self):
+        """Sadece görünen token aralığı için ağaç satırlarını günceller"""
+        window = self.tokens[self.first:self.first + self.visible_rows]
+        rows = list(self.tree.get_children())
+        for row_index, token in enumerate(window):
+            values = (token.position, token.line, token.column, token.type.value, repr(token.value))
+            if row_index < len(rows):
+                if self._row_values[row_index] != values:
+                    self.tree.item(rows[row_index], values=values)
+                    self._row_values[row_index] = values
+                    recorder.count('tk_calls')
+            else:
+                rows.append(self.tree.insert("", tk.END, values=values))
+                self._row_values.append(values)
+                recorder.count('tk_calls')
+        if len(rows) > len(window):
+            self.tree.delete(*rows[len(window):])
+            del self._row_values[len(window):]
+            recorder.count('tk_calls')
+        total = len(self.tokens)
+        if total:
+            self.scrollbar.set(self.first / total, (self.first + len(window)) / total)
+            self.range_var.set(f"Tokens {self.first + 1}-{self.first + len(window)} of {total}")
+        else:
+            self.scrollbar.set(0, 1)
+            self.range_var.set("No tokens")
 
 class StatisticsView:
     """İstatistik ekranını yönetir"""
@@ -128,13 +402,50 @@ class StatisticsView:
             state=tk.DISABLED
         )
         self.text_widget.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.statistics: Optional[TokenStatistics] = None  # Ekranda gösterilen istatistikler
+        self.parser_errors: List[str] = []  # Ekranda gösterilen parser hataları
+        self._lines: List[str] = []  # Ekrandaki metnin satırları
     
+    @recorder.timed("view.statistics")
     def update_statistics(self, lexer_stats: dict, parser_errors: List[str]):
-        """İstatistik ekranını günceller"""
-        stats_text = self._generate_statistics_text(lexer_stats, parser_errors)
+        """İstatistik ekranını günceller (gösterilenle arasındaki fark uygulanır)"""
+        if not lexer_stats:
+            self.statistics = None
+        elif self.statistics is not None:
+            self.apply_delta(TokenStatistics.from_dict(lexer_stats) - self.statistics, parser_errors)
+            return
+        else:
+            self.statistics = TokenStatistics.from_dict(lexer_stats)
+        self.parser_errors = parser_errors
+        self._render()
+    
+    def apply_delta(self, delta: TokenStatistics, parser_errors: List[str]):
+        """Gösterilen istatistiklere bir farkı uygular, sadece değişen satırları yeniden yazar"""
+        if not delta and parser_errors == self.parser_errors:
+            return  # Hiçbir şey değişmedi
+        self.statistics.merge(delta)
+        self.parser_errors = parser_errors
+        self._render()
+    
+    def _render(self):
+        """Metni oluşturur ve ekrandakinden farklı olan satır aralığını değiştirir"""
+        lexer_stats = self.statistics.as_dict() if self.statistics is not None else {}
+        lines = self._generate_statistics_text(lexer_stats, self.parser_errors).splitlines(keepends=True)
+        old_lines = self._lines
+        # Ortak önek ve sonek satırları korunur (çok sayıda hata satırı yeniden eklenmez)
+        prefix = 0
+        limit = min(len(lines), len(old_lines))
+        while prefix < limit and lines[prefix] == old_lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and lines[-1 - suffix] == old_lines[-1 - suffix]:
+            suffix += 1
+        self._lines = lines
+        if prefix == len(lines) == len(old_lines):
+            return
         self.text_widget.config(state=tk.NORMAL)
-        self.text_widget.delete("1.0", tk.END)
-        self.text_widget.insert("1.0", stats_text)
+        self.text_widget.delete(f"{prefix + 1}.0", f"{len(old_lines) - suffix + 1}.0")
+        self.text_widget.insert(f"{prefix + 1}.0", "".join(lines[prefix:len(lines) - suffix]))
         self.text_widget.config(state=tk.DISABLED)
     
     def _generate_statistics_text(self, lexer_stats: dict, parser_errors: List[str]) -> str:
@@ -167,31 +478,122 @@ class StatisticsView:
             stats_text += "No warnings detected.\n"
         return stats_text
 
+class EditorDocument:
+    """Editör metninin parça tablosundaki kopyası: widget'ın Tk komutu sarmalanır, düzenleyen çağrılar yansıtılır"""
+    
+    # Widget komutunun yerine geçen Tcl proc'u: hatalar çağırana aynen döner (Tk bağlamaları 'catch' ile sınar),
+    # Python'a sadece düzenlemelerde asıl komuttan önce (indeksler) ve başarılı olursa sonra (yansıtma) gidilir
+    WRAPPER = """proc {widget} {{operation args}} {{
+        if {{$operation ni {{insert delete replace edit}}}} {{
+            tailcall {original} $operation {{*}}$args
+        }}
+        {before} $operation {{*}}$args
+        set result [{original} $operation {{*}}$args]
+        {after}
+        return $result
+    }}"""
+    
+    def __init__(self, widget):
+        self.widget = widget
+        self.table = PieceTable(widget.get("1.0", tk.END))  # Metin Tk'dan sadece burada ve geri al/yinele sonrası okunur
+        self._resync = False  # Yansıtılamayan bir değişiklik oldu: sonraki anlık görüntüden önce metin yeniden okunur
+        self._edit = None     # Asıl komut başarılı olursa tabloya uygulanacak düzenleme
+        self._original = widget._w + "_document"  # Asıl widget komutunun yeni adı
+        widget.tk.call("rename", widget._w, self._original)
+        widget.tk.eval(self.WRAPPER.format(widget=widget._w, original=self._original,
+                                           before=widget.register(self._before_edit),
+                                           after=widget.register(self._after_edit)))
+    
+    def snapshot(self) -> DocumentSnapshot:
+        """Editör metninin değişmez anlık görüntüsü (metin kopyalanmaz, parçalar paylaşılır)"""
+        if self._resync:
+            self._resync = False
+            self.table.reset(self.widget.get("1.0", tk.END))
+        return self.table.snapshot()
+    
+    def _before_edit(self, operation, *args):
+        """Düzenlemeden önce indeksleri pozisyona çevirir (hata fırlatmaz: geçersiz indeksi asıl komut bildirir)"""
+        self._edit = None
+        try:
+            if operation == 'insert' and len(args) >= 2:
+                # Son satır sonundan sonrasına eklenen metin Tk'da ondan önceye girer
+                self._edit = ('insert', min(self._offset(args[0]), self.table.length - 1), ''.join(args[1::2]))
+            elif operation == 'delete' and 1 <= len(args) <= 2:
+                start = self._offset(args[0])
+                end = self._offset(args[1]) if len(args) == 2 else start + 1
+                self._edit = ('delete',) + tk_delete_range(self.table.lines, start, end)  # Tk son satır sonunu silmez
+            elif operation in ('delete', 'replace') or args[:1] in (('undo',), ('redo',)):
+                self._edit = ('resync',)  # Birden çok aralık, replace, geri al/yinele: Tk'nın sonucu okunur
+        except tk.TclError:
+            pass
+    
+    def _after_edit(self):
+        """Asıl komut başarılı olduktan sonra düzenlemeyi tabloya uygular"""
+        edit, self._edit = self._edit, None
+        if edit is None:
+            return
+        if edit[0] == 'insert':
+            self.table.insert(edit[1], edit[2])
+        elif edit[0] == 'delete':
+            self.table.delete(edit[1], edit[2] - edit[1])
+        else:
+            self._resync = True
+    
+    def _offset(self, index: str) -> int:
+        """Tk indeksini belgedeki karakter pozisyonuna çevirir"""
+        line, column = map(int, str(self.widget.tk.call(self._original, "index", index)).split('.'))
+        return self.table.lines.offset(line, column + 1)
+
 class SyntaxHighlighter:
     """Ana sözdizimi vurgulayıcı uygulama sınıfı"""
     
-    def __init__(self, root):
+    STATUS_PHASES = ['analysis', 'lexer.tokenize', 'lexer.retokenize', 'view.highlight']  # Durum çubuğundaki süreler
+    STARTUP_PHASES = ['startup.import', 'startup.window', 'startup.first_paint']  # Açılışta gösterilen süreler
+    POLL_INTERVAL = 30  # Arka plan sonuçlarının kontrol aralığı (ms)
+    MIN_DELAY = 20        # Düzenlemeden analize en kısa bekleme (ms): küçük dosyalar neredeyse anında vurgulanır
+    MAX_DELAY = 1000      # En uzun bekleme (ms)
+    COST_FACTOR = 2       # Bekleme son analizin süresinin bu katı kadar uzar (yazarken analiz thread'i çoğunlukla boşta)
+    CHARS_PER_MS = 10000  # Belge boyutu için ek bekleme: her 10 000 karakter için 1ms
+    MAX_WAIT = 4          # Kesintisiz yazarken ilk düzenlemeden en geç beklemenin bu katı kadar sonra analiz edilir
+    
+    def __init__(self, root, path: Optional[str] = None):
         self.root = root
+        self.path = path  # Açılışta yüklenecek dosya (yoksa örnek kod gösterilir)
         self.root.title("Real-Time Python Syntax Highlighter - BLM0238 Project")
         self.root.geometry("1400x900")
-        self.lexer = None  # Leksik analizci
-        self.parser = None  # Parser
+        self.lexer_backend = 'regex'  # Tam analizde kullanılan lexer arka ucu
+        self.cache = AnalysisCache()  # Tam analiz sonuçları için bellek içi önbellek
+        self.worker = AnalysisWorker(self.lexer_backend, self.cache)  # Leksik ve sözdizimsel analiz arka planda yapılır
+        self.analysis = None  # Son uygulanan AnalysisResult
         self.tokens = []    # Token listesi
         self.ast = None     # (Kullanılmıyor)
-        self.update_pending = False  # Gerçek zamanlı güncelleme için flag
+        self._analysis_job = None   # Zamanlanmış analiz (after kimliği); ardışık düzenlemeler tek analizde birleşir
+        self._burst_start = 0.0     # Zamanlanmış analizi bekleyen ilk düzenlemenin zamanı (perf_counter)
+        self._last_edit = 0.0       # Son düzenlemenin zamanı
+        self._analysis_cost = 0.0   # Son analizin toplam süresi: arka plan + görünümlerin güncellenmesi (saniye)
+        self._submitted = DocumentSnapshot((), 0, 0)  # Analize gönderilen son anlık görüntü
+        self._symbol = None  # İşaretli tanımlayıcı ve ait olduğu analiz: (isim, nesil)
+        self.token_analysis_view: Optional[TokenAnalysisView] = None  # Sekme ilk seçildiğinde oluşturulur
+        self.statistics_view: Optional[StatisticsView] = None        # Sekme ilk seçildiğinde oluşturulur
+        self._tab_builders = {}  # Henüz kurulmamış sekmeler: çerçeve adı -> kurucu
         self.setup_gui()  # Arayüzü kur
         self.setup_event_bindings()  # Olay bağlamalarını kur
-        self.root.after(100, self.update_highlighting)  # Başlangıçta analiz yap
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.worker.start()
+        self.root.after_idle(self._first_paint)  # Pencere açılır açılmaz görünen bölgeyi boya
+        self.root.after(self.POLL_INTERVAL, self._poll_results)  # Sonuçları düzenli olarak topla
     
     def setup_gui(self):
         """Arayüz bileşenlerini kurar"""
         main_frame = ttk.Frame(self.root)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        notebook = ttk.Notebook(main_frame)
-        notebook.pack(fill=tk.BOTH, expand=True)
-        self._setup_editor_tab(notebook)
-        self._setup_analysis_tab(notebook)
-        self._setup_statistics_tab(notebook)
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.pack(fill=tk.BOTH, expand=True)
+        self._setup_editor_tab(self.notebook)
+        # Analiz ve istatistik sekmeleri ilk seçildiklerinde kurulur ve doldurulur
+        self._add_lazy_tab("Token Analysis", self._setup_analysis_tab)
+        self._add_lazy_tab("Statistics", self._setup_statistics_tab)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
         self.status_var = tk.StringVar()
         self.status_manager = StatusManager(self.status_var)
         self.status_manager.set_status("Ready")
@@ -215,28 +617,50 @@ class SyntaxHighlighter:
             height=30
         )
         self.code_text.pack(fill=tk.BOTH, expand=True)
+        self.code_text.tag_configure("symbol_match", background=ColorScheme.SYMBOL_MATCH)  # Parantezlerin altında kalır
+        self.code_text.tag_configure("bracket_match", background=ColorScheme.BRACKET_MATCH)
+        self.code_text.tag_configure("bracket_error", background=ColorScheme.BRACKET_ERROR)
         right_frame = ttk.LabelFrame(paned, text="Syntax Highlighted Output", padding=5)
         paned.add(right_frame, weight=1)
         self.highlighted_view = HighlightedTextView(right_frame)
-        self._load_sample_code()
+        if self.path:
+            self._load_file(self.path)
+        else:
+            self._load_sample_code()
+        self.document = EditorDocument(self.code_text)  # Bundan sonraki düzenlemeler parça tablosuna yansıtılır
     
-    def _setup_analysis_tab(self, notebook):
-        """Token analiz sekmesini kurar"""
-        analysis_frame = ttk.Frame(notebook)
-        notebook.add(analysis_frame, text="Token Analysis")
+    def _add_lazy_tab(self, title: str, builder):
+        """Boş bir sekme ekler; içeriği sekme ilk seçildiğinde kurulur"""
+        frame = ttk.Frame(self.notebook)
+        self.notebook.add(frame, text=title)
+        self._tab_builders[str(frame)] = lambda: builder(frame)
+    
+    def _on_tab_changed(self, event=None):
+        """Seçilen sekme henüz kurulmadıysa kurar"""
+        builder = self._tab_builders.pop(self.notebook.select(), None)
+        if builder is not None:
+            builder()
+    
+    def _setup_analysis_tab(self, analysis_frame):
+        """Token analiz sekmesini kurar ve son analizle doldurur"""
         self.token_analysis_view = TokenAnalysisView(analysis_frame)
+        if self.analysis is not None:
+            self.token_analysis_view.update_tokens(self.tokens)
     
-    def _setup_statistics_tab(self, notebook):
-        """İstatistik sekmesini kurar"""
-        stats_frame = ttk.Frame(notebook)
-        notebook.add(stats_frame, text="Statistics")
+    def _setup_statistics_tab(self, stats_frame):
+        """İstatistik sekmesini kurar ve son analizle doldurur"""
         self.statistics_view = StatisticsView(stats_frame)
+        if self.analysis is not None:
+            self.statistics_view.update_statistics(self.analysis.statistics, self.analysis.errors)
     
     def setup_event_bindings(self):
         """Gerçek zamanlı vurgulama için olay bağlamalarını kurar"""
+        self.code_text.bind("<<Modified>>", self._on_modified)  # Tuş olayı olmayan değişiklikler (orta tık ile yapıştırma)
         self.code_text.bind("<KeyRelease>", self.on_text_change)
         self.code_text.bind("<Button-1>", self.on_text_change)
         self.code_text.bind("<ButtonRelease-1>", self.on_text_change)
+        self.root.bind("<F11>", self.toggle_profiling)
+        self.root.bind("<F12>", self.export_trace)
     
     def _load_sample_code(self):
         """Örnek Python kodu yükler"""
@@ -264,38 +688,203 @@ if __name__ == "__main__":
 '''
         self.code_text.insert("1.0", sample_code)
     
+    def _load_file(self, path: str):
+        """Açılışta verilen dosyayı editöre yükler"""
+        try:
+            with open(path, encoding='utf-8', errors='replace') as source:
+                self.code_text.insert("1.0", source.read())
+            self.root.title(f"{path} - Real-Time Python Syntax Highlighter")
+        except OSError as e:
+            messagebox.showerror("Open Error", f"Cannot open {path}:\n{e}")
+            self._load_sample_code()
+    
+    def _first_paint(self):
+        """İlk boyama: sadece görünen satırlar ana thread'de taranıp boyanır, tam analiz arka planda yapılır"""
+        with recorder.span("startup.first_paint"):
+            code = self.document.snapshot().text()  # Açılışta tek parça: kopya yok
+            last_line = int(self.code_text.index("@0,0").split('.')[0]) + int(self.code_text.cget("height"))
+            end = 0
+            for _ in range(last_line):
+                end = code.find('\n', end) + 1
+                if end == 0:
+                    end = len(code)
+                    break
+            # Görünen bölgenin tokenları; dosyanın geri kalanı tam analiz sonucu gelince boyanır
+            self.highlighted_view.update_highlighted_text(create_lexer(code[:end], self.lexer_backend).tokenize(), code)
+        self.update_highlighting()
+        self.status_manager.set_status(f"Analyzing... ({recorder.summary(self.STARTUP_PHASES)})")
+    
     def on_text_change(self, event=None):
-        """Kullanıcı kodu değiştirdiğinde çağrılır (debounce ile)"""
-        if not self.update_pending:
-            self.update_pending = True
-            self.root.after(300, self.update_highlighting)
+        """Tuş ve tıklamalarda çağrılır: sadece metin değiştiyse analiz planlanır, imleç hareketi analiz başlatmaz"""
+        if self.code_text.edit_modified():
+            self._schedule_analysis()  # Metin son anlık görüntüden beri değişti
+        self._highlight_cursor()  # İmleç hareket etmiş olabilir
+    
+    def _on_modified(self, event=None):
+        """Tk'nın değişiklik bayrağı değişti (bayrak sıfırlanınca da çağrılır)"""
+        if self.code_text.edit_modified():
+            self._schedule_analysis()
+    
+    def _schedule_analysis(self):
+        """Analizi son düzenlemeden bir bekleme süresi sonraya planlar; bekleme sırasındaki düzenlemeler birleşir"""
+        now = time.perf_counter()
+        self._last_edit = now
+        if self._analysis_job is None:
+            self._burst_start = now
+            self._analysis_job = self.root.after(self._debounce_delay(), self._debounce_elapsed)
+    
+    def _debounce_delay(self) -> int:
+        """Bekleme süresi (ms): son analizin süresi ve belge boyutuyla büyür"""
+        delay = (self.MIN_DELAY + self.COST_FACTOR * self._analysis_cost * 1000 +
+                 len(self._submitted) / self.CHARS_PER_MS)
+        return int(min(delay, self.MAX_DELAY))
+    
+    def _debounce_elapsed(self):
+        """Bekleme doldu: yazma sürüyorsa (ve çok uzun sürmediyse) ertelenir, yoksa analiz gönderilir"""
+        self._analysis_job = None
+        delay = self._debounce_delay() / 1000
+        now = time.perf_counter()
+        quiet = now - self._last_edit
+        if quiet < delay and now - self._burst_start < self.MAX_WAIT * delay:
+            # Zamanlayıcı her tuşta iptal edilip yeniden kurulmaz: son düzenlemeden itibaren kalan süre beklenir
+            self._analysis_job = self.root.after(int((delay - quiet) * 1000) + 1, self._debounce_elapsed)
+            return
+        self.update_highlighting()
     
     def update_highlighting(self):
-        """Gerçek zamanlı sözdizimi vurgulamasını günceller"""
-        self.update_pending = False
+        """Kodun anlık görüntüsünü arka plan analizine gönderir (son gönderilenden beri düzenleme yoksa göndermez)"""
+        if self._analysis_job is not None:
+            self.root.after_cancel(self._analysis_job)
+            self._analysis_job = None
+        snapshot = self.document.snapshot()  # Tk'dan metin kopyalanmaz; parçalar analiz thread'inde birleştirilir
+        self.code_text.edit_modified(False)  # Bayrak tekrar kalkana kadar editör bu anlık görüntüyle aynı
+        if snapshot is self._submitted:
+            return  # Belge düzenlenmedi: önceki analiz hâlâ geçerli
+        self._submitted = snapshot
+        self.status_manager.set_analyzing()
+        self.worker.submit(snapshot)
+    
+    def _poll_results(self):
+        """Arka plan analiz sonuçlarını ana thread'de toplar (root.after ile düzenli çağrılır)"""
+        latest = None
+        while True:
+            try:
+                result = self.worker.results.get_nowait()
+            except queue.Empty:
+                break
+            if not self.worker.is_stale(result.generation):
+                latest = result  # Eski nesillerin sonuçları atılır
+        if latest is not None:
+            self._apply_result(latest)
+        self.root.after(self.POLL_INTERVAL, self._poll_results)
+    
+    def _apply_result(self, result: AnalysisResult):
+        """Tamamlanan bir analizin sonucunu arayüze uygular"""
+        if result.failure is not None:
+            self.status_manager.set_error(result.failure)
+            messagebox.showerror("Analysis Error", f"An error occurred during analysis:\n{result.failure}")
+            return
         try:
-            code = self.code_text.get("1.0", tk.END)
-            self.status_manager.set_analyzing()
-            self.root.update_idletasks()
-            self._perform_analysis(code)
+            started = time.perf_counter()
+            self.analysis = result
+            self.tokens = result.tokens
             self._update_all_views()
+            self._analysis_cost = result.duration + time.perf_counter() - started  # Sonraki beklemeyi belirler
         except Exception as e:
             self.status_manager.set_error(str(e))
             messagebox.showerror("Analysis Error", f"An error occurred during analysis:\n{str(e)}")
     
-    def _perform_analysis(self, code: str):
-        """Leksik ve sözdizimsel analiz yapar"""
-        self.lexer = SimpleLexicalAnalyzer(code)
-        self.tokens = self.lexer.tokenize()
-        self.parser = SimpleParser(self.tokens)
-        self.ast = self.parser.parse()
-    
     def _update_all_views(self):
         """Tüm arayüzü analiz sonuçlarıyla günceller"""
-        self.highlighted_view.update_highlighted_text(self.tokens)
-        self.token_analysis_view.update_tokens(self.tokens)
-        lexer_stats = self.lexer.get_statistics()
-        parser_errors = self.parser.errors if self.parser else []
-        self.statistics_view.update_statistics(lexer_stats, parser_errors)
+        self.highlighted_view.update_highlighted_text(self.tokens, self.analysis.code)
+        lexer_stats = self.analysis.statistics
+        parser_errors = self.analysis.errors
+        # Henüz açılmamış sekmeler kurulurken son analizle doldurulur
+        if self.token_analysis_view is not None:
+            self.token_analysis_view.update_tokens(self.tokens)
+        if self.statistics_view is not None:
+            self.statistics_view.update_statistics(lexer_stats, parser_errors)
+        self._highlight_cursor()
         error_count = len(parser_errors)
-        self.status_manager.set_complete(len(self.tokens), error_count)
\ No newline at end of file
+        self.status_manager.set_complete(len(self.tokens), error_count, recorder.summary(self.STATUS_PHASES))
+    
+    def _highlight_cursor(self):
+        """İmlecin bulunduğu parantezi ve tanımlayıcıyı editörde işaretler"""
+        analysis = self.analysis
+        view = self.highlighted_view
+        cursor = None  # Analiz editördeki metne ait değilse işaret konmaz
+        if analysis is not None and not self.worker.is_stale(analysis.generation) and \
+                not self.code_text.edit_modified() and view.code == analysis.code:
+            cursor = view.offset_of(self.code_text.index(tk.INSERT))  # Görünümün satır indeksiyle, Tk count çağrısı yok
+        self._highlight_brackets(cursor)
+        self._highlight_symbol(cursor)
+    
+    def _highlight_brackets(self, cursor: Optional[int]):
+        """İmlecin üstündeki veya solundaki parantezi ve eşini editörde işaretler (ağacın parantez tablosundan)"""
+        self.code_text.tag_remove("bracket_match", "1.0", tk.END)
+        self.code_text.tag_remove("bracket_error", "1.0", tk.END)
+        tree = self.analysis.tree if cursor is not None else None
+        if tree is None:
+            return
+        pair = tree.bracket_pair(cursor) or (cursor > 0 and tree.bracket_pair(cursor - 1))
+        if not pair:
+            return
+        opening, closing, matched = pair
+        tag = "bracket_match" if matched else "bracket_error"
+        for position in (opening, closing):
+            if position is not None:
+                self.code_text.tag_add(tag, *self.highlighted_view.tk_indices((position, position + 1)))
+    
+    def _highlight_symbol(self, cursor: Optional[int]):
+        """İmlecin üstündeki tanımlayıcının tüm geçişlerini editörde işaretler (analizin tanımlayıcı indeksinden)"""
+        analysis = self.analysis
+        name = None
+        if cursor is not None and analysis.identifiers is not None:
+            tokens = self.tokens
+            index = find_token_index(tokens, cursor + 1) - 1  # İmlecin üstündeki veya solundaki token
+            for candidate in (index, index - 1):
+                if 0 <= candidate < len(tokens):
+                    token = tokens[candidate]
+                    if token.type == TokenType.IDENTIFIER and \
+                            token.position <= cursor <= token.position + len(token.value):
+                        name = token.value
+                        break
+        symbol = (name, analysis.generation) if name is not None else None
+        if symbol == self._symbol:
+            return  # Aynı isim bu analizde zaten işaretli
+        self._symbol = symbol
+        self.code_text.tag_remove("symbol_match", "1.0", tk.END)
+        if name is None:
+            return
+        positions = [position for start in analysis.identifiers.find(name) for position in (start, start + len(name))]
+        self.code_text.tag_add("symbol_match", *self.highlighted_view.tk_indices(positions))
+    
+    def toggle_profiling(self, event=None):
+        """F11: cProfile/tracemalloc yakalamasını başlatır veya durdurup raporu gösterir"""
+        if not recorder.capturing:
+            recorder.start_capture()
+            self.status_manager.set_status("Profiling... (press F11 again to stop)")
+            return
+        report = recorder.stop_capture()
+        window = tk.Toplevel(self.root)
+        window.title("Profile Report")
+        report_text = scrolledtext.ScrolledText(window, wrap=tk.NONE, font=("Consolas", 10), width=120, height=40)
+        report_text.pack(fill=tk.BOTH, expand=True)
+        report_text.insert("1.0", report or "No analysis ran while profiling.")
+        report_text.config(state=tk.DISABLED)
+    
+    def export_trace(self, event=None):
+        """F12: Aşama sürelerini Chrome trace (JSON) dosyası olarak kaydeder"""
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("Chrome trace", "*.json")],
+                                            initialfile="trace.json")
+        if path:
+            try:
+                recorder.export_trace(path)
+                self.status_manager.set_status(f"Trace written to {path}")
+            except OSError as e:
+                self.status_manager.set_error(str(e))
+    
+    def on_close(self):
+        """Pencere kapatılırken arka plan analizini durdurur"""
+        self.worker.stop()
+        self.root.destroy()
\ No newline at end of file
@@ -0,0 +1,145 @@
+# Aşama bazlı zamanlama, sayaçlar ve isteğe bağlı cProfile/tracemalloc yakalama
+import functools
+import io
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+# cProfile ve pstats sadece yakalama modunda yüklenir (açılış süresine eklenmez)
+
+class Span:
+    """One finished timing span"""
+    __slots__ = ('name', 'start', 'duration', 'thread', 'allocated')
+    
+    def __init__(self, name: str, start: float, duration: float, thread: int, allocated: int = 0):
+        self.name = name            # Aşama adı ("tokenize", "view.highlight", ...)
+        self.start = start          # Başlangıç zamanı (perf_counter, saniye)
+        self.duration = duration    # Süre (saniye)
+        self.thread = thread        # Çalıştığı thread'in kimliği
+        self.allocated = allocated  # Yakalama modunda aşama boyunca ayrılan net bellek (bayt)
+
+class Instrumentation:
+    """Collects named timing spans and counters, optionally with cProfile and tracemalloc"""
+    
+    def __init__(self, capacity: int = 10000):
+        self.enabled = True                  # Kapalıyken span() ve count() hiçbir şey yapmaz
+        self.spans = deque(maxlen=capacity)  # Son tamamlanan aşamalar (halka tampon)
+        self.counters: Dict[str, int] = {}   # Adlandırılmış sayaçlar (tokens, tk_calls, ...)
+        self.latest: Dict[str, float] = {}   # Her aşamanın son süresi (durum çubuğu için)
+        self.capturing = False               # cProfile/tracemalloc yakalama modu
+        self._profilers: Dict[int, 'cProfile.Profile'] = {}  # Thread başına profiler
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()   # İz dosyasındaki zaman damgalarının başlangıcı
+    
+    @contextmanager
+    def span(self, name: str):
+        """Time a named phase: with recorder.span("tokenize"): ..."""
+        if not self.enabled:
+            yield
+            return
+        tracing = tracemalloc.is_tracing()
+        allocated_before = tracemalloc.get_traced_memory()[0] if tracing else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            allocated = tracemalloc.get_traced_memory()[0] - allocated_before if tracing else 0
+            self.spans.append(Span(name, start, duration, threading.get_ident(), allocated))
+            self.latest[name] = duration
+            if allocated > 0:
+                self.count('allocated_bytes', allocated)
+    
+    def timed(self, name: str):
+        """Decorator form of span(): @recorder.timed("parser.brackets")"""
+        def decorate(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorate
+    
+    def count(self, name: str, amount: int = 1):
+        """Add to a named counter"""
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def summary(self, names: Optional[List[str]] = None) -> str:
+        """Short 'phase 1.2ms' text of the latest timings, for the status bar"""
+        names = names or list(self.latest)
+        return "  ".join(f"{name} {self.latest[name] * 1000:.1f}ms" for name in names if name in self.latest)
+    
+    def reset(self):
+        """Forget all spans and counters"""
+        self.spans.clear()
+        self.latest.clear()
+        with self._lock:
+            self.counters.clear()
+    
+    def start_capture(self):
+        """Enable cProfile (in threads using profiled()) and tracemalloc allocation tracking"""
+        with self._lock:
+            self.capturing = True
+            self._profilers = {}
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    
+    def stop_capture(self, limit: int = 25) -> str:
+        """Stop capturing and return a text report of hot functions and allocation sites"""
+        with self._lock:
+            self.capturing = False
+            profilers, self._profilers = list(self._profilers.values()), {}
+        report = io.StringIO()
+        if profilers:
+            import pstats
+            statistics = pstats.Stats(*profilers, stream=report)
+            statistics.sort_stats('cumulative').print_stats(limit)
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            report.write("\nTop allocation sites:\n")
+            for stat in snapshot.statistics('lineno')[:limit]:
+                report.write(f"{stat}\n")
+        return report.getvalue()
+    
+    @contextmanager
+    def profiled(self):
+        """Run a block under this thread's cProfile profiler while capture mode is on"""
+        if not self.capturing:
+            yield
+            return
+        import cProfile
+        with self._lock:
+            profiler = self._profilers.setdefault(threading.get_ident(), cProfile.Profile())
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+    
+    def export_trace(self, path: str):
+        """Write spans and counters in Chrome trace event format (chrome://tracing, Perfetto)"""
+        process = os.getpid()
+        events = []
+        for span in list(self.spans):
+            event = {
+                'name': span.name, 'cat': 'phase', 'ph': 'X', 'pid': process, 'tid': span.thread,
+                'ts': (span.start - self._origin) * 1e6, 'dur': span.duration * 1e6,
+            }
+            if span.allocated:
+                event['args'] = {'allocated_bytes': span.allocated}
+            events.append(event)
+        with self._lock:
+            counters = dict(self.counters)
+        events.append({'name': 'counters', 'ph': 'C', 'pid': process, 'tid': 0,
+                       'ts': (time.perf_counter() - self._origin) * 1e6, 'args': counters})
+        with open(path, 'w', encoding='utf-8') as destination:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, destination)
+
+recorder = Instrumentation()  # Uygulama genelinde kullanılan ortak kayıtçı
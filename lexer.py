@@ -1,5 +1,14 @@
-from tokens import Token, TokenType  # Token ve TokenType sınıflarını içe aktarır
-from typing import Dict, List, Optional  # Tip ipuçları için
+import os  # Paralel taramada işlemci sayısı için
+import re  # Düzenli ifade tabanlı arka uç için
+from array import array  # Parça sonuçlarının pozisyon sütunları için
+from bisect import bisect_left, bisect_right  # String/yorum başlangıçları ve parça sınırları arasında arama için
+from importlib.util import find_spec  # İsteğe bağlı NumPy arka ucunu içe aktarmadan tespit etmek için
+from instrumentation import recorder  # Aşama zamanlamaları için
+from tokens import TOKEN_TYPES, TYPE_CODES, IdentifierIndex, LineIndex, Token, TokenBuffer, TokenStatistics, TokenType  # Token ve TokenType sınıflarını içe aktarır
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple  # Tip ipuçları için
+
+LEXER_VERSION = 3  # Token veya istatistik çıktısını değiştiren her değişiklikte artırılmalı (önbellek anahtarına girer)
+PARALLEL_CHUNK_SIZE = 1 << 20  # Paralel taramada en küçük parça boyutu (karakter)
 
 # Simple lexical analyzer for demonstration
 class SimpleLexicalAnalyzer:
@@ -25,67 +34,256 @@ class SimpleLexicalAnalyzer:
         self.code = code  # Analiz edilecek kaynak kod
         self.position = 0  # Kodda mevcut karakter pozisyonu
         self.line = 1      # Satır numarası
-        self.column = 1    # Sütun numarası
+        self._line_start = 0  # Bulunulan satırın başlangıç pozisyonu (sütunlar buna göre hesaplanır)
         self.tokens = []   # Bulunan tokenlar listesi
-        self.statistics = {  # Tokenizasyon istatistikleri
-            'total_tokens': 0,
-            'total_lines': 0,
-            'token_counts': {},
-            'error_count': 0,
-            'warning_count': 0
-        }
+        self._token_start = 0   # Taranan token'ın başlangıç pozisyonu
+        self.buffer = None      # Doluysa tokenlar Token nesneleri yerine bu TokenBuffer'a yazılır
+        self.relexed_end = 0    # Son taramada bu pozisyondan sonraki tokenlar eskilerin kaydırılmış kopyasıdır
+        self.statistics = TokenStatistics()  # Tokenlar üretilirken güncellenen istatistikler
+        self._identifiers = None       # İlk istekte kurulan tanımlayıcı indeksi
+        self._identifiers_code = None  # İndeksin karşılık geldiği kod (self.code ile aynı nesne ise geçerli)
+    
+    @property
+    def column(self) -> int:
+        """Column of the scan position: characters since the line start (a tab is one column, as in Tk)"""
+        return self.position - self._line_start + 1
     
+    @recorder.timed("lexer.tokenize")
     def tokenize(self) -> List[Token]:
         """Tokenize the input code"""
         self.tokens = []  # Token listesini temizle
         self.position = 0
         self.line = 1
-        self.column = 1
+        self._line_start = 0
+        self.relexed_end = len(self.code)
+        self.statistics = TokenStatistics()
         
-        while self.position < len(self.code):  # Kodun sonuna kadar döngü
-            self._skip_whitespace()  # Boşlukları atla
-            
-            if self.position >= len(self.code):
-                break  # Kodun sonuna gelindiyse çık
-                
-            current_char = self.code[self.position]  # Şu anki karakter
-            
-            if current_char == '\n':  # Satır sonu karakteri
-                self._add_token(TokenType.NEWLINE, current_char)
-                self.line += 1
-                self.column = 1
-                self.position += 1
-            elif current_char == '#':  # Yorum satırı
-                self._tokenize_comment()
-            elif current_char in ['"', "'"]:  # String başlangıcı
-                self._tokenize_string(current_char)
-            elif current_char.isdigit():  # Sayı başlangıcı
-                self._tokenize_number()
-            elif current_char.isalpha() or current_char == '_':  # Tanımlayıcı veya anahtar kelime
-                self._tokenize_identifier()
-            elif current_char in self.OPERATORS:  # Operatör
-                self._tokenize_operator()
-            elif current_char in self.DELIMITERS:  # Ayraç
-                self._add_token(TokenType.DELIMITER, current_char)
-                self.position += 1
-                self.column += 1
-            else:  # Tanımlanamayan karakter
-                self._add_token(TokenType.UNKNOWN, current_char)
-                self.position += 1
-                self.column += 1
+        while self._next_token():  # Kodun sonuna kadar döngü
+            pass
         
         self._update_statistics()  # İstatistikleri güncelle
         return self.tokens  # Token listesini döndür
     
+    def tokenize_buffer(self) -> TokenBuffer:
+        """Tokenize the input code into a compact TokenBuffer instead of Token objects"""
+        self.buffer = TokenBuffer(self.code)
+        self.tokenize()
+        return self.buffer
+    
+    @recorder.timed("lexer.tokenize_parallel")
+    def tokenize_parallel(self, jobs: Optional[int] = None, chunk_size: int = PARALLEL_CHUNK_SIZE) -> List[Token]:
+        """Tokenize the input code in worker processes, split at newlines; same output as tokenize()"""
+        code = self.code
+        jobs = jobs or os.cpu_count() or 1
+        # İşçi başına birkaç parça: bir parçadaki uzun string diğerlerini bekletmez
+        size = max(chunk_size, len(code) // (jobs * 4) + 1)
+        bounds = [0]
+        while bounds[-1] + size < len(code):
+            boundary = code.find('\n', bounds[-1] + size) + 1  # Parçalar satır başında başlar
+            if boundary == 0:
+                break
+            bounds.append(boundary)
+        bounds.append(len(code))
+        if jobs == 1 or len(bounds) < 3:
+            return self.tokenize()  # Tek parça: süreç başlatmaya değmez
+        
+        from concurrent.futures import ProcessPoolExecutor
+        from functools import partial
+        chunks = [code[start:end] for start, end in zip(bounds, bounds[1:])]
+        with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as executor:
+            results = list(executor.map(partial(_tokenize_chunk, type(self)), bounds, chunks))
+        del chunks
+        
+        wanted = self.buffer  # tokenize_buffer_parallel() çağırdıysa sonuç doğrudan bu tampona yazılır
+        self.buffer = output = TokenBuffer(code) if wanted is None else wanted
+        self.tokens = []
+        self.relexed_end = len(code)
+        self.statistics = TokenStatistics()
+        self._merge_chunks(bounds, results)
+        self._update_statistics()
+        if wanted is None:
+            self.buffer = None
+            self.tokens = output.to_tokens()
+        return self.tokens
+    
+    def tokenize_buffer_parallel(self, jobs: Optional[int] = None,
+                                 chunk_size: int = PARALLEL_CHUNK_SIZE) -> TokenBuffer:
+        """Parallel tokenize_buffer(): the scalable path, no Token objects are created in this process"""
+        self.buffer = TokenBuffer(self.code)
+        self.tokenize_parallel(jobs, chunk_size)
+        return self.buffer
+    
+    def _merge_chunks(self, bounds: List[int], results: list):
+        """Append the chunk results to self.buffer, re-lexing strings that run across chunk boundaries"""
+        code = self.code
+        output = self.buffer
+        newline_code = TYPE_CODES[TokenType.NEWLINE]
+        index = 0        # Sıradaki parça
+        skip = 0         # Parçanın baştaki bu kadar token'ı yeniden taramayla zaten üretildi
+        line_offset = 0  # Parçanın satır numaralarına eklenecek fark
+        while index < len(results):
+            types, starts, ends, lines, columns, statistics, end_line, end_column = results[index]
+            # Pozisyonlar işçide kaydırıldı; satırlar önceki parçalara bağlı olduğundan burada kaydırılır
+            # (sütunlar satır başına göre olduğundan değişmez)
+            output.types.extend(types[skip:])
+            output.starts.extend(starts[skip:])
+            output.ends.extend(ends[skip:])
+            output.lines.extend(map(line_offset.__add__, lines[skip:]) if line_offset else lines[skip:])
+            output.columns.extend(columns[skip:])
+            self.statistics.merge(statistics)
+            for token in range(skip):  # Yeniden taranmış baştaki tokenlar iki kez sayılmaz
+                self.statistics.add(types[token], code[starts[token]:ends[token]], -1)
+            self.line = end_line + line_offset
+            self.position = bounds[index + 1]
+            self._line_start = self.position - end_column + 1
+            index, skip = index + 1, 0
+            line_offset = self.line - 1
+            if index == len(results) or (output.types[-1] == newline_code and output.ends[-1] == self.position):
+                continue  # Parça bir NEWLINE ile bitti: sonraki parça temiz bir durumdan başlıyor
+            
+            # Parça sonuna kadar uzanan bir string sonraki parçada devam ediyor: string'in başından sırayla tara
+            self._pop_output_token()
+            while self._next_token():
+                if output.types[-1] != newline_code:
+                    continue
+                # Bir NEWLINE'dan sonra tarama durumsuzdur: aynı NEWLINE'ı bulan parçanın kalanı aynen kullanılır
+                position = output.starts[-1]
+                index = bisect_right(bounds, position) - 1
+                starts = results[index][1]
+                token = bisect_left(starts, position)
+                if token < len(starts) and starts[token] == position and results[index][0][token] == newline_code:
+                    skip = token + 1
+                    line_offset = output.lines[-1] - results[index][3][token]
+                    break
+            else:
+                index = len(results)  # Kodun sonuna kadar tarandı
+    
+    def identifier_index(self) -> IdentifierIndex:
+        """Occurrence index of the identifiers of the last tokenize(), kept up to date by retokenize()"""
+        if self._identifiers is None or self._identifiers_code is not self.code:
+            self._identifiers = IdentifierIndex.from_tokens(self.buffer if self.buffer is not None else self.tokens)
+            self._identifiers_code = self.code
+        return self._identifiers
+    
+    def _pop_output_token(self):
+        """Remove the last token of self.buffer and restart scanning at its position"""
+        output = self.buffer
+        start, end = output.starts.pop(), output.ends.pop()
+        self.statistics.add(output.types.pop(), self.code[start:end], -1)
+        self.position, self.line = start, output.lines.pop()
+        self._line_start = start - output.columns.pop() + 1
+    
+    @recorder.timed("lexer.retokenize")
+    def retokenize(self, offset: int, deleted_length: int, inserted_text: str) -> List[Token]:
+        """Re-tokenize the code after a single edit, reusing unaffected tokens"""
+        old_tokens = self.tokens
+        old_statistics = self.statistics
+        old_end_line = self.line      # Düzenleme öncesi son satır
+        old_end_column = self.column  # Düzenleme öncesi son sütun
+        delta = len(inserted_text) - deleted_length  # Düzenlemeden sonraki kayma miktarı
+        edit_end = offset + len(inserted_text)  # Düzenlemenin yeni koddaki bitişi
+        # Kurulmuş tanımlayıcı indeksi sadece yeniden taranan tokenlar için güncellenir
+        identifiers = self._identifiers if self._identifiers_code is self.code else None
+        self.code = self.code[:offset] + inserted_text + self.code[offset + deleted_length:]
+        if self.buffer is not None:
+            # Sıkıştırılmış tamponda token kaydırma yapılmaz: yeni kodu baştan tara
+            return self.tokenize_buffer()
+        
+        # Düzenlemeden önceki son NEWLINE token'ı güvenli başlangıç noktasıdır
+        first = find_token_index(old_tokens, offset)
+        while first > 0 and old_tokens[first - 1].type != TokenType.NEWLINE:
+            first -= 1
+        if first > 0:
+            checkpoint = old_tokens[first - 1]
+            self.position = checkpoint.position + 1
+            self.line = checkpoint.line + 1
+        else:
+            self.position = 0
+            self.line = 1
+        self._line_start = self.position
+        self.tokens = old_tokens[:first]
+        self.relexed_end = len(self.code)
+        self.statistics = TokenStatistics()  # Sadece yeniden taranan satırlardaki tokenlar sayılır
+        
+        # Yeni token akışı eski akışla bir NEWLINE üzerinde yeniden eşleşene kadar tara
+        old_index = first
+        replaced = None  # Yeni tokenlarla değiştirilen eski tokenlar
+        relexed = None   # Onların yerine taranan yeni tokenlar
+        resync_end = len(self.code) - delta  # Eski kodda kaydırılarak yeniden kullanılan kısmın başı (yoksa sonu)
+        while self._next_token():
+            token = self.tokens[-1]
+            if token.type != TokenType.NEWLINE or token.position < edit_end:
+                continue
+            old_position = token.position - delta
+            while old_index < len(old_tokens) and old_tokens[old_index].position < old_position:
+                old_index += 1
+            if (old_index < len(old_tokens) and
+                    old_tokens[old_index].position == old_position and
+                    old_tokens[old_index].type == TokenType.NEWLINE):
+                # Satır başından itibaren durum aynı: kalan tokenlar kaydırılmış kopyalarıyla yeniden kullanılır
+                line_delta = token.line - old_tokens[old_index].line
+                replaced = old_tokens[first:old_index + 1]
+                relexed = self.tokens[first:]
+                resync_end = old_position + 1
+                tail = old_tokens[old_index + 1:]
+                if delta or line_delta:
+                    # Eski tokenlar yerinde değiştirilmez: önceki bir sonuçta hâlâ okunuyor olabilirler
+                    tail = [Token(old_token.type, old_token.value, old_token.position + delta,
+                                  old_token.line + line_delta, old_token.column) for old_token in tail]
+                self.tokens.extend(tail)
+                self.relexed_end = token.position + 1
+                self.position = len(self.code)
+                self.line = old_end_line + line_delta
+                self._line_start = self.position - old_end_column + 1
+                break
+        
+        # Satır farkı: değişen satırların eski tokenları çıkarılır, yeni tokenlar eklenir (baştan sayılmaz)
+        if replaced is None:
+            replaced, relexed = old_tokens[first:], self.tokens[first:]
+        old_statistics.merge(self.statistics).merge(TokenStatistics.from_tokens(replaced), -1)
+        self.statistics = old_statistics
+        if identifiers is not None:
+            identifiers.update(replaced, relexed, resync_end, delta)
+            self._identifiers_code = self.code
+        self._update_statistics()  # İstatistikleri güncelle
+        return self.tokens
+    
+    def _next_token(self) -> bool:
+        """Scan the next token, return False at the end of the code"""
+        self._skip_whitespace()  # Boşlukları atla
+        
+        if self.position >= len(self.code):
+            return False  # Kodun sonuna gelindiyse çık
+        
+        self._token_start = self.position  # Token'ın başladığı pozisyon
+        current_char = self.code[self.position]  # Şu anki karakter
+        
+        if current_char == '\n':  # Satır sonu karakteri
+            self._add_token(TokenType.NEWLINE, current_char)
+            self.line += 1
+            self.position += 1
+            self._line_start = self.position
+        elif current_char == '#':  # Yorum satırı
+            self._tokenize_comment()
+        elif current_char in ['"', "'"]:  # String başlangıcı
+            self._tokenize_string(current_char)
+        elif current_char.isdigit():  # Sayı başlangıcı
+            self._tokenize_number()
+        elif current_char.isalpha() or current_char == '_':  # Tanımlayıcı veya anahtar kelime
+            self._tokenize_identifier()
+        elif current_char in self.OPERATORS:  # Operatör
+            self._tokenize_operator()
+        elif current_char in self.DELIMITERS:  # Ayraç
+            self._add_token(TokenType.DELIMITER, current_char)
+            self.position += 1
+        else:  # Tanımlanamayan karakter
+            self._add_token(TokenType.UNKNOWN, current_char)
+            self.position += 1
+        return True
+    
     def _skip_whitespace(self):
         """Skip whitespace characters except newlines"""
-        while (self.position < len(self.code) and 
-               self.code[self.position] in ' \t\r' and 
-               self.code[self.position] != '\n'):
-            if self.code[self.position] == '\t':
-                self.column += 4  # Tab karakteri 4 boşluk sayılır
-            else:
-                self.column += 1
+        while self.position < len(self.code) and self.code[self.position] in ' \t\r':
             self.position += 1  # Boşluk karakterini atla
     
     def _tokenize_comment(self):
@@ -93,7 +291,6 @@ class SimpleLexicalAnalyzer:
         start_pos = self.position  # Yorumun başladığı pozisyon
         while self.position < len(self.code) and self.code[self.position] != '\n':
             self.position += 1
-            self.column += 1
         
         comment_text = self.code[start_pos:self.position]  # Yorum metni
         self._add_token(TokenType.COMMENT, comment_text)
@@ -102,23 +299,23 @@ class SimpleLexicalAnalyzer:
         """Tokenize a string literal"""
         start_pos = self.position  # Stringin başladığı pozisyon
         self.position += 1  # Açılış tırnağını atla
-        self.column += 1
         
         while self.position < len(self.code):
             current_char = self.code[self.position]
             if current_char == quote_char:
                 self.position += 1  # Kapanış tırnağını da dahil et
-                self.column += 1
                 break
             elif current_char == '\\' and self.position + 1 < len(self.code):
                 self.position += 2  # Kaçış karakterini atla
-                self.column += 2
             else:
                 self.position += 1
-                self.column += 1
         
         string_text = self.code[start_pos:self.position]  # String metni
         self._add_token(TokenType.STRING, string_text)
+        last_newline = string_text.rfind('\n')
+        if last_newline >= 0:  # Satırlara bölünmüş string: sonraki tokenlar string'in son satırında
+            self.line += string_text.count('\n')
+            self._line_start = start_pos + last_newline + 1
     
     def _tokenize_number(self):
         """Tokenize a number"""
@@ -127,7 +324,6 @@ class SimpleLexicalAnalyzer:
         while (self.position < len(self.code) and 
                (self.code[self.position].isdigit() or self.code[self.position] == '.')):
             self.position += 1
-            self.column += 1
         
         number_text = self.code[start_pos:self.position]  # Sayı metni
         self._add_token(TokenType.NUMBER, number_text)
@@ -139,7 +335,6 @@ class SimpleLexicalAnalyzer:
         while (self.position < len(self.code) and 
                (self.code[self.position].isalnum() or self.code[self.position] == '_')):
             self.position += 1
-            self.column += 1
         
         identifier_text = self.code[start_pos:self.position]  # Tanımlayıcı metni
         
@@ -157,34 +352,448 @@ class SimpleLexicalAnalyzer:
             two_char = self.code[self.position:self.position + 2]
             if two_char in self.OPERATORS:
                 self.position += 2
-                self.column += 2
                 self._add_token(TokenType.OPERATOR, two_char)
                 return
         
         # Single character operator
         self._add_token(TokenType.OPERATOR, self.code[self.position])
         self.position += 1
-        self.column += 1
     
     def _add_token(self, token_type: TokenType, value: str):
         """Add a token to the list"""
-        token = Token(token_type, value, self.position, self.line, self.column - len(value))  # Token oluştur
+        type_code = TYPE_CODES[token_type]
+        self.statistics.add(type_code, value)
+        column = self._token_start - self._line_start + 1  # Sütun satır başından uzaklıktır
+        if self.buffer is not None:
+            # Sıkıştırılmış tampon: Token nesnesi oluşturmadan sütunlara yaz
+            self.buffer.append(type_code, self._token_start, self._token_start + len(value), self.line, column)
+            return
+        token = Token(token_type, value, self._token_start, self.line, column)  # Token oluştur
         self.tokens.append(token)  # Token'ı listeye ekle
     
+    @recorder.timed("lexer.statistics")
     def _update_statistics(self):
-        """Update tokenization statistics"""
-        self.statistics['total_tokens'] = len(self.tokens)  # Toplam token sayısı
-        self.statistics['total_lines'] = self.line  # Toplam satır sayısı
-        
-        # Count token types
-        token_counts = {}
-        for token in self.tokens:
-            if token.type not in token_counts:
-                token_counts[token.type] = 0
-            token_counts[token.type] += 1
-        
-        self.statistics['token_counts'] = token_counts  # Her token türünden kaç tane var
+        """Finish tokenization statistics (token counts are kept while tokens are emitted)"""
+        self.statistics.total_lines = self.line  # Toplam satır sayısı
+        recorder.count('tokens', len(self.buffer) if self.buffer is not None else len(self.tokens))
     
     def get_statistics(self) -> dict:
         """Get tokenization statistics"""
-        return self.statistics.copy()  # İstatistiklerin kopyasını döndür
\ No newline at end of file
+        return self.statistics.as_dict()  # İstatistiklerin kopyasını döndür
+
+class RegexLexicalAnalyzer(SimpleLexicalAnalyzer):
+    """Lexical analyzer backend driven by one compiled master regex"""
+    
+    _pattern = None  # Derlenmiş ana düzenli ifade (ilk kullanımda oluşturulur)
+    
+    @classmethod
+    def _master_pattern(cls):
+        """Build the alternation regex from KEYWORDS, OPERATORS and DELIMITERS"""
+        if cls._pattern is None:
+            # FSM sadece ilk karakteri tek başına operatör olan iki karakterli operatörleri tanır
+            operators = [op for op in cls.OPERATORS if len(op) == 1 or op[0] in cls.OPERATORS]
+            operators.sort(key=len, reverse=True)
+            keywords = sorted(cls.KEYWORDS, key=len, reverse=True)
+            cls._pattern = re.compile('|'.join([
+                r'(?P<WHITESPACE>[ \t\r]+)',
+                r'(?P<NEWLINE>\n)',
+                r'(?P<COMMENT>#[^\n]*)',
+                r'(?P<STRING>"(?:[^"\\]|\\[\s\S])*(?:"|\\)?|' + r"'(?:[^'\\]|\\[\s\S])*(?:'|\\)?)",
+                r'(?P<NUMBER>[0-9][0-9.]*)',
+                r'(?P<KEYWORD>(?:' + '|'.join(map(re.escape, keywords)) + r')(?!\w))',
+                r'(?P<IDENTIFIER>[A-Za-z_]\w*)',
+                r'(?P<OPERATOR>' + '|'.join(map(re.escape, operators)) + ')',
+                r'(?P<DELIMITER>[' + ''.join(map(re.escape, sorted(cls.DELIMITERS))) + '])',
+                r'(?P<UNKNOWN>[\x00-\x7f])',
+                r'(?P<OTHER>[\s\S])',  # ASCII dışı karakterler FSM'e bırakılır
+            ]))
+        return cls._pattern
+    
+    @recorder.timed("lexer.tokenize")
+    def tokenize(self) -> List[Token]:
+        """Tokenize the input code with the master regex"""
+        self.tokens = []  # Token listesini temizle
+        self.position = 0
+        self.line = 1
+        self._line_start = 0
+        self.relexed_end = len(self.code)
+        self.statistics = TokenStatistics()
+        
+        code = self.code
+        length = len(code)
+        tokens = self.tokens
+        pattern = self._master_pattern()
+        token_types = TokenType.__members__
+        type_codes = {name: TYPE_CODES[token_type] for name, token_type in token_types.items()}
+        newline = TokenType.NEWLINE
+        buffer = self.buffer
+        count = self.statistics.add  # Tokenlar üretilirken sayılır
+        position, line, line_start = 0, 1, 0
+        
+        while position < length:
+            for match in pattern.finditer(code, position):
+                kind = match.lastgroup
+                if kind == 'WHITESPACE':
+                    continue  # Sütunlar satır başından hesaplandığı için boşluk sayılmaz
+                value = match.group()
+                start = match.start()
+                if kind == 'NEWLINE':
+                    count(type_codes[kind], value)
+                    if buffer is None:
+                        tokens.append(Token(newline, value, start, line, start - line_start + 1))
+                    else:
+                        buffer.append(type_codes[kind], start, match.end(), line, start - line_start + 1)
+                    line += 1
+                    line_start = match.end()
+                elif kind == 'OTHER' or (kind == 'NUMBER' and match.end() < length and code[match.end()] > '\x7f'):
+                    # ASCII dışı karakter: bu token'ı FSM ile tara ve kaldığı yerden devam et
+                    self.position, self.line, self._line_start = start, line, line_start
+                    self._next_token()
+                    position, line, line_start = self.position, self.line, self._line_start
+                    break
+                else:
+                    count(type_codes[kind], value)
+                    if buffer is None:
+                        tokens.append(Token(token_types[kind], value, start, line, start - line_start + 1))
+                    else:
+                        buffer.append(type_codes[kind], start, match.end(), line, start - line_start + 1)
+                    if kind == 'STRING' and '\n' in value:  # Satırlara bölünmüş string
+                        line += value.count('\n')
+                        line_start = start + value.rfind('\n') + 1
+            else:
+                position = length  # Kodun sonuna ulaşıldı
+        
+        self.position, self.line, self._line_start = position, line, line_start
+        self._update_statistics()  # İstatistikleri güncelle
+        return self.tokens
+
+class VectorizedLexicalAnalyzer(SimpleLexicalAnalyzer):
+    """Bulk lexical analyzer backend classifying all characters at once with NumPy (optional dependency)"""
+    
+    # Karakter sınıfları (tokenize() içinde kod noktası dizisine uygulanır)
+    OTHER, SPACE, NEWLINE, ALPHA, DIGIT, ALNUM, DOT, OPERATOR, DELIMITER, QUOTED = range(10)
+    _numpy = None  # numpy modülü (ilk kullanımda içe aktarılır: başlangıç süresine eklenmez)
+    _table = None  # ASCII kod noktası -> karakter sınıfı
+    _keywords = None  # Anahtar kelimelerin 7 bitlik paketlenmiş kodları
+    _strings = {
+        '"': re.compile(r'"(?:[^"\\]|\\[\s\S])*(?:"|\\)?'),
+        "'": re.compile(r"'(?:[^'\\]|\\[\s\S])*(?:'|\\)?"),
+    }
+    
+    @classmethod
+    def _classify(cls, char: str) -> int:
+        """Character class of one character, following the FSM's checks in _next_token()"""
+        if char in ' \t\r':
+            return cls.SPACE
+        if char == '\n':
+            return cls.NEWLINE
+        if char in '"\'#':
+            return cls.QUOTED
+        if char.isdigit():
+            return cls.DIGIT
+        if char.isalpha() or char == '_':
+            return cls.ALPHA
+        if char.isalnum():
+            return cls.ALNUM  # Tanımlayıcının devamı olabilir ama başlangıcı olamaz ('½')
+        if char == '.':
+            return cls.DOT
+        if char in cls.OPERATORS:
+            return cls.OPERATOR
+        if char in cls.DELIMITERS:
+            return cls.DELIMITER
+        return cls.OTHER
+    
+    @classmethod
+    def _setup(cls):
+        """Import NumPy and build the lookup tables on first use"""
+        if cls._numpy is None:
+            import numpy
+            cls._table = numpy.array([cls._classify(chr(code)) for code in range(128)], dtype=numpy.uint8)
+            cls._keywords = numpy.array(sorted(cls._pack(keyword) for keyword in cls.KEYWORDS), dtype=numpy.int64)
+            cls._numpy = numpy
+        return cls._numpy
+    
+    @staticmethod
+    def _pack(word: str) -> int:
+        # En fazla 8 ASCII karakter 56 bite sığar; karakterler sıfır olmadığından uzunluk da kodlanmış olur
+        return sum(ord(char) << (7 * index) for index, char in enumerate(word))
+    
+    @recorder.timed("lexer.tokenize")
+    def tokenize(self) -> List[Token]:
+        """Tokenize the input code with vectorized character classification"""
+        np = self._setup()
+        self.tokens = []  # Token listesini temizle
+        self.relexed_end = len(self.code)
+        self.statistics = TokenStatistics()
+        code = self.code
+        length = len(code)
+        points = np.frombuffer(code.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+        
+        # 1. Her karakterin sınıfı: ASCII tablodan, ASCII dışı karakterler benzersiz kod noktası başına bir kez
+        classes = self._table[np.minimum(points, 127)]
+        wide = points > 127
+        if wide.any():
+            unique, inverse = np.unique(points[wide], return_inverse=True)
+            classes[wide] = np.array([self._classify(chr(point)) for point in unique.tolist()], dtype=np.uint8)[inverse]
+        
+        # 2. Stringler ve yorumlar sıralı çözülmeli: sadece tırnak ve '#' karakterleri üzerinde Python döngüsü
+        index_type = np.int32 if length < 2 ** 31 else np.int64  # Daha küçük diziler daha az bellek bant genişliği
+        kinds = np.full(length + 1, 255, dtype=np.uint8)  # Token başlangıcı -> tip kodu (255: token yok)
+        ends = np.zeros(length + 1, dtype=index_type)     # Token başlangıcı -> bitiş pozisyonu
+        region_starts, region_ends, region_types = [], [], []
+        specials = np.flatnonzero(classes == self.QUOTED).tolist()
+        string_code, comment_code = TYPE_CODES[TokenType.STRING], TYPE_CODES[TokenType.COMMENT]
+        index = 0
+        while index < len(specials):
+            start = specials[index]
+            char = code[start]
+            if char == '#':
+                end = code.find('\n', start)
+                end = length if end < 0 else end
+                region_types.append(comment_code)
+            else:
+                end = self._strings[char].match(code, start).end()
+                region_types.append(string_code)
+            region_starts.append(start)
+            region_ends.append(end)
+            index = bisect_left(specials, end, index + 1)
+        if region_starts:
+            region_starts = np.array(region_starts, dtype=index_type)
+            region_ends = np.array(region_ends, dtype=index_type)
+            kinds[region_starts] = region_types
+            ends[region_starts] = region_ends
+            inside = np.zeros(length + 1, dtype=np.int8)  # Başlangıçlar ve bitişler kendi içlerinde benzersiz
+            inside[region_starts] += 1
+            inside[region_ends] -= 1
+            classes[np.cumsum(inside[:length], dtype=np.int8) > 0] = self.QUOTED  # İçerik diğer sınıfları kesmez
+        
+        # 3. Tanımlayıcı ve sayı dizileri: son harf/rakam ile son kesinti pozisyonlarının kümülatif maksimumu
+        positions = np.arange(length, dtype=index_type)
+        alpha = classes == self.ALPHA
+        digit = classes == self.DIGIT
+        word = alpha | digit | (classes == self.ALNUM)
+        accumulate = np.maximum.accumulate
+        identifier = word & (accumulate(np.where(alpha, positions, -1)) > accumulate(np.where(word, -1, positions)))
+        numeric = (digit | (classes == self.DOT)) & ~identifier
+        number = numeric & (accumulate(np.where(numeric & digit, positions, -1)) >
+                            accumulate(np.where(numeric, -1, positions)))
+        for mask, token_type in ((identifier, TokenType.IDENTIFIER), (number, TokenType.NUMBER)):
+            previous = np.concatenate(([False], mask[:-1]))
+            following = np.concatenate((mask[1:], [False]))
+            starts = np.flatnonzero(mask & ~previous)
+            kinds[starts] = TYPE_CODES[token_type]
+            ends[starts] = np.flatnonzero(mask & ~following) + 1
+        
+        # 4. Tek karakterlik tokenlar
+        singles = (
+            (classes == self.NEWLINE, TokenType.NEWLINE),
+            ((classes == self.DELIMITER) | ((classes == self.DOT) & ~number), TokenType.DELIMITER),
+            ((classes == self.OTHER) | ((classes == self.ALNUM) & ~identifier), TokenType.UNKNOWN),
+            (classes == self.OPERATOR, TokenType.OPERATOR),
+        )
+        for mask, token_type in singles:
+            starts = np.flatnonzero(mask)
+            kinds[starts] = TYPE_CODES[token_type]
+            ends[starts] = starts + 1
+        # Ardışık operatör karakterleri soldan sağa ikili operatörlere birleştirilir ('<<=' -> '<<', '=')
+        operator = classes == self.OPERATOR
+        consumed = -1  # Bir önceki ikili operatörün ikinci karakteri
+        for position in np.flatnonzero(operator[:-1] & operator[1:]).tolist():
+            if position != consumed and code[position:position + 2] in self.OPERATORS:
+                kinds[position + 1] = 255
+                ends[position] = position + 2
+                consumed = position + 1
+        
+        # 5. Anahtar kelimeler: 8 karaktere kadar ASCII tanımlayıcılar paketlenip tabloda aranır
+        starts = np.flatnonzero(kinds[:length] != 255)
+        types = kinds[starts]
+        token_ends = ends[starts]
+        sizes = token_ends - starts
+        # Bir aralıktaki karakter sayıları: sıralı pozisyon listelerinde ikili arama (tam uzunlukta cumsum yerine)
+        wide_positions = np.flatnonzero(wide)
+        ascii_tokens = np.searchsorted(wide_positions, token_ends) == np.searchsorted(wide_positions, starts)
+        candidates = np.flatnonzero((types == TYPE_CODES[TokenType.IDENTIFIER]) & (sizes <= 8) & ascii_tokens)
+        if len(candidates):
+            packed = np.zeros(len(candidates), dtype=np.int64)
+            candidate_starts, candidate_sizes = starts[candidates], sizes[candidates]
+            for offset in range(8):
+                present = offset < candidate_sizes
+                chars = points[np.minimum(candidate_starts + offset, length - 1)].astype(np.int64)
+                packed |= np.where(present, chars << (7 * offset), 0)
+            types[candidates[np.isin(packed, self._keywords)]] = TYPE_CODES[TokenType.KEYWORD]
+        
+        # 6. Satır ve sütunlar: satır başlangıçlarında ikili arama, sütun satır başından uzaklıktır
+        newlines = np.flatnonzero(points == 10)  # String içindekiler dahil tüm satır sonları
+        lines = np.searchsorted(newlines, starts)
+        line_starts = np.concatenate(([0], newlines + 1))
+        columns = starts - line_starts[lines] + 1
+        self.position = length
+        self.line = len(newlines) + 1
+        self._line_start = int(line_starts[-1])
+        
+        # 7. İstatistikler: kapanmamış olabilecek tek string dosya sonuna uzanan son tokendır
+        statistics = self.statistics
+        counted = types
+        if len(types) and types[-1] == string_code and token_ends[-1] == length:
+            counted = types[:-1]
+            statistics.add(string_code, code[starts[-1]:])
+        for type_code, count in enumerate(np.bincount(counted, minlength=len(TOKEN_TYPES)).tolist()):
+            statistics.counts[type_code] += count
+        numbers = types == TYPE_CODES[TokenType.NUMBER]
+        dots = np.flatnonzero(classes == self.DOT)
+        statistics.error_count += int(np.count_nonzero(
+            np.searchsorted(dots, token_ends[numbers]) - np.searchsorted(dots, starts[numbers]) > 1))
+        unknown = starts[types == TYPE_CODES[TokenType.UNKNOWN]]
+        statistics.error_count += int(np.count_nonzero((points[unknown] != ord('!')) & (points[unknown] != ord('\\'))))
+        statistics.warning_count += int(np.count_nonzero(
+            ~ascii_tokens & (types == TYPE_CODES[TokenType.IDENTIFIER])))
+        
+        lines += 1
+        if self.buffer is not None:
+            # Sıkıştırılmış tampon: sütunlar doğrudan NumPy dizilerinden doldurulur
+            buffer = self.buffer
+            for column, values in ((buffer.types, types), (buffer.starts, starts), (buffer.ends, token_ends),
+                                   (buffer.lines, lines), (buffer.columns, columns)):
+                column.frombytes(values.astype(column.typecode).tobytes())
+        else:
+            token_types = TOKEN_TYPES
+            self.tokens = [Token(token_types[type_code], code[start:end], start, line, column)
+                           for type_code, start, end, line, column in
+                           zip(types.tolist(), starts.tolist(), token_ends.tolist(), lines.tolist(), columns.tolist())]
+        self._update_statistics()  # İstatistikleri güncelle
+        return self.tokens
+
+LEXER_BACKENDS = {  # Kullanılabilir sözcük çözümleyici arka uçları
+    'fsm': SimpleLexicalAnalyzer,
+    'regex': RegexLexicalAnalyzer,
+}
+if find_spec('numpy') is not None:
+    LEXER_BACKENDS['numpy'] = VectorizedLexicalAnalyzer  # Sadece NumPy kuruluysa
+
+def _tokenize_chunk(lexer_class, base: int, chunk: str) -> tuple:
+    """Worker process side of tokenize_parallel(): token columns as arrays plus the end state"""
+    lexer = lexer_class(chunk)
+    buffer = lexer.tokenize_buffer()
+    # Pozisyonlar burada tüm koda göre kaydırılır: ana süreçteki birleştirme işi azalır
+    starts = array('q', map(base.__add__, buffer.starts)) if base else buffer.starts
+    ends = array('q', map(base.__add__, buffer.ends)) if base else buffer.ends
+    return buffer.types, starts, ends, buffer.lines, buffer.columns, lexer.statistics, lexer.line, lexer.column
+
+def create_lexer(code: str, backend: str = 'fsm') -> SimpleLexicalAnalyzer:
+    """Create a lexical analyzer for the given backend name"""
+    if backend not in LEXER_BACKENDS:
+        raise ValueError(f"Unknown lexer backend '{backend}', expected one of: {', '.join(LEXER_BACKENDS)}")
+    return LEXER_BACKENDS[backend](code)
+
+def compare_backends(code: str, backend: str = 'regex') -> Optional[str]:
+    """Compare a backend against the FSM lexer, return a description of the first difference"""
+    expected = SimpleLexicalAnalyzer(code)
+    actual = create_lexer(code, backend)
+    expected_tokens = expected.tokenize()
+    actual_tokens = actual.tokenize()
+    for index, (want, got) in enumerate(zip(expected_tokens, actual_tokens)):
+        if (want.type, want.value, want.position, want.line, want.column) != \
+                (got.type, got.value, got.position, got.line, got.column):
+            return f"token {index}: expected {want!r} at {want.position}, got {got!r} at {got.position}"
+    if len(expected_tokens) != len(actual_tokens):
+        return f"token count: expected {len(expected_tokens)}, got {len(actual_tokens)}"
+    # Satır ve sütunlar satır indeksinin verdiği konumla aynı olmalı
+    line_index = LineIndex(code)
+    for token in expected_tokens:
+        if line_index.location(token.position) != (token.line, token.column):
+            return f"{token!r} at {token.position}: line index gives {line_index.location(token.position)}"
+    if expected.get_statistics() != actual.get_statistics():
+        return "statistics differ"
+    # Aynı arka uç TokenBuffer'a yazdığında da aynı tokenlar üretilmeli
+    buffered = create_lexer(code, backend)
+    buffered_tokens = buffered.tokenize_buffer().to_tokens()
+    if [(t.type, t.value, t.position, t.line, t.column) for t in buffered_tokens] != \
+            [(t.type, t.value, t.position, t.line, t.column) for t in expected_tokens]:
+        return "TokenBuffer output differs"
+    if buffered.get_statistics() != expected.get_statistics():
+        return "TokenBuffer statistics differ"
+    return None
+
+def compare_parallel(code: str, backend: str = 'regex', jobs: int = 2, chunk_size: int = 4096) -> Optional[str]:
+    """Compare tokenize_parallel() against tokenize() of the same backend, return the first difference"""
+    expected = create_lexer(code, backend)
+    actual = create_lexer(code, backend)
+    expected_tokens = [(t.type, t.value, t.position, t.line, t.column) for t in expected.tokenize()]
+    actual_tokens = [(t.type, t.value, t.position, t.line, t.column)
+                     for t in actual.tokenize_parallel(jobs, chunk_size)]
+    if actual_tokens != expected_tokens:
+        index = next((i for i, (want, got) in enumerate(zip(expected_tokens, actual_tokens)) if want != got),
+                     min(len(expected_tokens), len(actual_tokens)))
+        return f"token {index} differs (expected {len(expected_tokens)} tokens, got {len(actual_tokens)})"
+    if actual.get_statistics() != expected.get_statistics():
+        return "statistics differ"
+    if (actual.line, actual.column) != (expected.line, expected.column):
+        return "end position differs"
+    return None
+
+def iter_tokens(stream: TextIO, chunk_size: int = 65536) -> Iterator[Token]:
+    """Yield tokens from a text stream (file object, sys.stdin) reading it in chunks"""
+    lexer = SimpleLexicalAnalyzer('')
+    base = 0         # Tamponun akıştaki başlangıç pozisyonu
+    pending = ''     # Önceki parçadan kalan, henüz tamamlanmamış metin
+    at_end = False
+    while not at_end:
+        # Tek bir token parçadan uzunsa okuma boyutu büyür (toplam maliyet doğrusal kalır)
+        chunk = stream.read(max(chunk_size, len(pending)))
+        at_end = not chunk
+        lexer.code = pending + chunk
+        lexer.position = 0
+        lexer.tokens = []
+        length = len(lexer.code)
+        while lexer._next_token():
+            token = lexer.tokens.pop()
+            if lexer.position == length and not at_end:
+                # Token parça sonuna dayanıyor (string, yorum, '*' + '*' ...): sonraki parçayla tekrar tara
+                lexer.position, lexer.line = token.position, token.line
+                lexer._line_start = token.position - token.column + 1
+                break
+            token.position += base
+            yield token
+        pending = lexer.code[lexer.position:]
+        base += lexer.position
+        lexer._line_start -= lexer.position  # Satır başı yeni tamponun başına göre
+
+def find_token_index(tokens: List[Token], offset: int) -> int:
+    """Return the index of the first token starting at or after offset"""
+    low, high = 0, len(tokens)
+    while low < high:  # İkili arama
+        middle = (low + high) // 2
+        if tokens[middle].position < offset:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+def find_edit(old_code: str, new_code: str) -> Optional[Tuple[int, int, str]]:
+    """Find a single edit (offset, deleted length, inserted text) turning old_code into new_code"""
+    if old_code == new_code:
+        return None  # Değişiklik yok
+    limit = min(len(old_code), len(new_code))
+    
+    # Ortak önek uzunluğu (ikili arama, her adımda sadece yeni aralık karşılaştırılır)
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old_code.startswith(new_code[low:middle], low):
+            low = middle
+        else:
+            high = middle - 1
+    prefix = low
+    
+    # Ortak sonek uzunluğu (önekle çakışmayacak şekilde)
+    low, high = 0, limit - prefix
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old_code.endswith(new_code[len(new_code) - middle:len(new_code) - low], 0, len(old_code) - low):
+            low = middle
+        else:
+            high = middle - 1
+    suffix = low
+    
+    deleted_length = len(old_code) - prefix - suffix
+    return prefix, deleted_length, new_code[prefix:len(new_code) - suffix]
\ No newline at end of file
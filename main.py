@@ -1,10 +1,197 @@
-import tkinter as tk
-from gui import SyntaxHighlighter
+import io
+import os
+import subprocess
+import sys
+import tempfile
+from batch import run_batch
+from cache import AnalysisCache
+from document import PieceTable, tk_delete_range
+from instrumentation import recorder
+from lexer import LEXER_BACKENDS, compare_backends, compare_parallel, create_lexer
+from parser import SimpleParser
+
+# Arka uç eşdeğerlik testi için sınır durumları içeren örnekler
+EQUIVALENCE_CORPUS = [
+    '',
+    'def f(x):\n    return x ** 2 // 3\n',
+    'a = "unterminated\nb = 1',
+    "s = 'esc\\'aped' + \"x\\\\\" # yorum\n",
+    'x <<= 1 != 2 >= 3\t\t# tab\r\n',
+    'n = 3.14.15 + 1e10 + 0x1F\n',
+    'isim = "ğüşıöç" + değişken²\n',
+    '@decorator\nclass A: pass  ;  $ ? `\n',
+    'end_with_backslash = "abc\\',
+]
+
+# Tk'nın 'delete' kuralı: (widget metni, index1 pozisyonu, index2 pozisyonu, silme sonrası metin)
+# Derinlik testinde tekrarlanan, her biri bir parantez seviyesi ekleyen ifade parçaları (açılış, kapanış)
+NESTING_UNITS = [
+    ('(', ')'), ('f(', ')'), ('a[', ']'), ('{1: ', '}'), ('[*', ']'), ('(y := ', ')'),
+    ('a if b else -(', ')'), ('lambda x=(', '): x'), ('not a < b + await f[', '] ** 2'), ('[i for i in ', ']'),
+    ('f(i for i in ', ')'), ('a[1:', ']'), ('{**', '}'), ('f(*', ')'), ('f(k=', ')'), ('(yield ', ')'),
+]
+
+TK_DELETE_CASES = [
+    ('a\nb\n', 2, 4, 'a\n'),          # delete 2.0 end: önceki satır sonu silinir
+    ('a\nb\n', 0, 4, '\n'),           # delete 1.0 end: ilk satırda geri gidilmez
+    ('a\nb\n', 3, 4, 'a\nb\n'),       # delete end-1c: son satır sonu kalır
+    ('a\nb\n', 4, 4, 'a\nb\n'),       # delete end: boş aralık
+    ('a\n\n', 2, 3, 'a\n'),           # boş son satırda tek karakter silme
+    ('ab\ncd\n', 4, 6, 'ab\nc\n'),    # satır ortasından sona: index1 yerinde kalır
+    ('ab\ncd\n', 1, 4, 'ad\n'),       # son satıra değmeyen aralık olduğu gibi silinir
+    ('\n', 0, 1, '\n'),
+]
+
+def run_system_tests() -> bool:
+    """Modülleri ve lexer arka uçlarını doğrular"""
+    failures = []
+    try:
+        import tkinter
+        tk_version = tkinter.TkVersion
+    except ImportError:
+        tk_version = "not available"
+    print(f"Python {sys.version.split()[0]}, Tk {tk_version}")
+    
+    # Çekirdek modüller (lexer, parser, arka plan analizi, toplu araç) tkinter olmadan yüklenebilmeli
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    probe = "import sys, batch, cache, daemon, document, lexer, parser, worker; sys.exit('tkinter' in sys.modules)"
+    if subprocess.run([sys.executable, "-c", probe], cwd=base_dir).returncode != 0:
+        failures.append("core modules import tkinter")
+    
+    # Önbellek: kesilmiş bir disk kaydı hata değil, ıskalama sayılır ve yeniden yazılır
+    code = EQUIVALENCE_CORPUS[1]
+    with tempfile.TemporaryDirectory() as directory:
+        expected = AnalysisCache(directory).analyze(code)
+        path = AnalysisCache(directory)._path(AnalysisCache.key(code))
+        with open(path, 'rb') as record:
+            data = record.read()
+        for length in range(len(data)):
+            with open(path, 'wb') as record:
+                record.write(data[:length])
+            cache = AnalysisCache(directory)
+            if cache.get(code) is not None:
+                failures.append(f"cache record truncated to {length} bytes was decoded")
+                break
+            if cache.analyze(code).errors != expected.errors or os.path.getsize(path) != len(data):
+                failures.append(f"cache record truncated to {length} bytes was not rewritten")
+                break
+    print(f"Cache: checked {len(data)} truncated records")
+    
+    # Toplu araç: çözülemeyen bir dosya veya yazılamayan bir çıktı yalnızca o dosyayı başarısız sayar
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, 'latin1.py'), 'wb') as source:
+            source.write('isim = "ğüş"\n'.encode('iso-8859-9') + b'\xff\xfe\x80\n')  # UTF-8 olarak çözülemez
+        with open(os.path.join(directory, 'valid.py'), 'w', encoding='utf-8') as source:
+            source.write(EQUIVALENCE_CORPUS[1])
+        stream, report = io.StringIO(), io.StringIO()
+        if run_batch([directory], 'jsonl', jobs=2, stream=stream, report=report) != 0 or \
+                len(stream.getvalue().splitlines()) != 2:
+            failures.append(f"batch run over an undecodable file: {report.getvalue().strip()}")
+        # Çıktı dizini yerine bir dosya: her dosyanın yazımı başarısız olur ama çalışma sonuna kadar sürer
+        blocked = os.path.join(directory, 'valid.py')
+        stream, report = io.StringIO(), io.StringIO()
+        if run_batch([directory], 'html', blocked, jobs=2, stream=stream, report=report) != 1 or \
+                "2 failed" not in report.getvalue():
+            failures.append(f"batch run with an unwritable output directory: {report.getvalue().strip()}")
+    print("Batch: checked undecodable input and unwritable output")
+    
+    # Derin parantezler: CPython gibi MAX_NESTING seviyeye kadar geçerli, bir fazlası hata (özyineleme sınırı değişmeden)
+    for opening, closing in NESTING_UNITS:
+        for depth in (SimpleParser.MAX_NESTING, SimpleParser.MAX_NESTING + 1):
+            code = 'x = ' + opening * depth + '1' + closing * depth + '\n'
+            parser = SimpleParser(create_lexer(code).tokenize())
+            parser.parse()
+            refused = [error for error in parser.errors if error.startswith("Too many nested brackets")]
+            if len(refused) != len(parser.errors) or bool(refused) != (depth > SimpleParser.MAX_NESTING):
+                failures.append(f"bracket nesting {opening!r} x {depth}: {parser.errors or 'no error'}")
+    print(f"Bracket nesting: checked {len(NESTING_UNITS)} patterns up to {SimpleParser.MAX_NESTING + 1} levels")
+    
+    # Artımlı analiz: kaydırılan tokenlar ve bloklar kopyalanır, önceki sonucun listesi ve ağacı değişmez
+    code = EQUIVALENCE_CORPUS[1] * 3
+    lexer = create_lexer(code)
+    tokens = lexer.tokenize()
+    parser = SimpleParser(tokens)
+    tree = parser.parse()
+    before = [(token.position, token.line) for token in tokens], [(block.start, block.line) for block in tree.blocks]
+    edit = (len(EQUIVALENCE_CORPUS[1]) + 4, 0, 'y = 1\n')
+    new_tokens = lexer.retokenize(*edit)
+    new_tree = parser.reparse(new_tokens, edit, lexer.relexed_end)
+    after = [(token.position, token.line) for token in tokens], [(block.start, block.line) for block in tree.blocks]
+    expected = SimpleParser(create_lexer(lexer.code).tokenize()).parse()
+    if after != before:
+        failures.append("retokenize/reparse changed the tokens or blocks of the previous result")
+    if [(block.start, block.line) for block in new_tree.blocks] != [(block.start, block.line) for block in expected.blocks]:
+        failures.append("reparse after an edit differs from a full parse")
+    print("Incremental analysis: checked that previous results are not modified")
+    
+    # Editör belgesi: silmeler Tk'nın son satır sonu kuralıyla parça tablosuna yansıtılır
+    for text, start, end, expected in TK_DELETE_CASES:
+        table = PieceTable(text)
+        start, end = tk_delete_range(table.lines, start, end)
+        table.delete(start, end - start)
+        if table.text() != expected:
+            failures.append(f"tk delete {text!r} [{start}, {end}): {table.text()!r} != {expected!r}")
+    print(f"Tk delete rule: checked {len(TK_DELETE_CASES)} cases")
+    
+    # Örnek kodlar ve projenin kendi kaynak dosyaları üzerinde arka uçları karşılaştır
+    corpus = list(EQUIVALENCE_CORPUS)
+    for name in sorted(os.listdir(base_dir)):
+        if name.endswith('.py'):
+            with open(os.path.join(base_dir, name), encoding='utf-8') as source:
+                corpus.append(source.read())
+    for backend in LEXER_BACKENDS:
+        for index, code in enumerate(corpus):
+            difference = compare_backends(code, backend)
+            if difference:
+                failures.append(f"{backend} backend, corpus item {index}: {difference}")
+        print(f"Lexer backend '{backend}': checked {len(corpus)} inputs")
+    
+    # Paralel tarama: birleştirilmiş korpus küçük parçalara bölünür; birkaç parça boyunca süren bir string eklenir
+    joined = 'spanning = "' + 'satır\n' * 20000 + '"\n' + ''.join(corpus)
+    for backend in LEXER_BACKENDS:
+        difference = compare_parallel(joined, backend)
+        if difference:
+            failures.append(f"{backend} backend, parallel tokenize: {difference}")
+    print(f"Parallel tokenize: checked {len(joined)} characters per backend")
+    
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    print("All system tests passed." if not failures else f"{len(failures)} test(s) failed.")
+    return not failures
 
 def main():
-    root = tk.Tk()
-    app = SyntaxHighlighter(root)
+    if "--help" in sys.argv:
+        print("Usage: python main.py [FILE] [--test | --help | --profile | --trace FILE]")
+        print("  FILE          Python file to open in the editor")
+        print("  --profile     profile the analysis thread (cProfile + tracemalloc), print a report on exit")
+        print("  --trace FILE  write phase timings as a Chrome trace (chrome://tracing) on exit")
+        return
+    if "--test" in sys.argv:
+        sys.exit(0 if run_system_tests() else 1)
+    trace_path = None
+    if "--trace" in sys.argv:
+        index = sys.argv.index("--trace")
+        if index + 1 >= len(sys.argv):
+            print("--trace requires a file name")
+            sys.exit(2)
+        trace_path = sys.argv[index + 1]
+    options = {"--test", "--help", "--profile", "--trace", trace_path}
+    paths = [argument for argument in sys.argv[1:] if argument not in options]
+    if "--profile" in sys.argv:
+        recorder.start_capture()
+    # tkinter ve arayüz sadece pencere açılırken yüklenir (--test ve --help için gerekmez)
+    with recorder.span("startup.import"):
+        import tkinter as tk
+        from gui import SyntaxHighlighter
+    with recorder.span("startup.window"):
+        root = tk.Tk()
+        app = SyntaxHighlighter(root, paths[0] if paths else None)
     root.mainloop()
+    if recorder.capturing:
+        print(recorder.stop_capture())
+    if trace_path:
+        recorder.export_trace(trace_path)
+        print(f"Trace written to {trace_path}")
 
 if __name__ == "__main__":
     main()
@@ -1,54 +1,1268 @@
+from bisect import bisect_left  # Eski blok başlangıçlarında ikili arama için
+from instrumentation import recorder  # Aşama zamanlamaları için
+from lexer import find_token_index  # Düzenlenen bloğun ilk token'ını bulmak için
+from syntax_tree import NodeKind, SyntaxBlock, SyntaxTree  # Dizi tabanlı sözdizimi ağacı
 from tokens import TokenType  # Token tiplerini içe aktarır
-from typing import Dict, List, Optional  # Tip ipuçları için
-from tokens import Token  # Token sınıfını içe aktarır
+from typing import Iterator, List, Optional, Tuple, Union  # Tip ipuçları için
+from tokens import TOKEN_TYPES, Token, TokenBuffer  # Token sınıfını ve sıkıştırılmış token tamponunu içe aktarır
 
-# Simple parser for demonstration
+# Ayrıştırıcının kullandığı token satırı: (tür, değer, pozisyon, satır, sütun)
+KIND, VALUE, POSITION, LINE, COLUMN = range(5)
+# İfade ayrıştırmasının öncelik seviyeleri (SimpleParser._test'in başlayabileceği yerler)
+LEVEL_TEST, LEVEL_OR, LEVEL_AND, LEVEL_NOT, LEVEL_BINARY, LEVEL_UNARY, LEVEL_PRIMARY = range(7)
+# _test yığınındaki bekleyen kuralların durumları
+(TEST, TEST_IF, TEST_ELSE, LAMBDA, NAMED, STARRED, OR, AND, NOT, COMPARISON, BINARY, BINARY_RIGHT, UNARY, POWER,
+ POWER_RIGHT, AWAIT, TRAILERS) = range(17)
+
+class ParseError(Exception):
+    """Syntax error inside one logical line, carrying the offending token row"""
+    def __init__(self, message: str, row: tuple):
+        super().__init__(message)
+        self.message = message  # Konumsuz hata mesajı
+        self.row = row          # Hatanın raporlandığı token satırı
+
+class LogicalLine:
+    """Significant tokens of one logical line (physical lines joined by brackets or backslashes)"""
+    __slots__ = ('tokens', 'indent', 'damaged')
+    
+    def __init__(self, tokens: List[tuple], damaged: bool):
+        self.tokens = tokens            # WHITESPACE, NEWLINE ve COMMENT dışındaki token satırları
+        self.indent = tokens[0][COLUMN]  # Girinti: ilk token'ın sütunu
+        self.damaged = damaged          # Parantez/string hatası içeriyor: sözdizimi hataları bastırılır
+
+# Recursive-descent parser with per-block incremental reparsing
 class SimpleParser:
-    """Simplified parser for demonstration"""
+    """Recursive-descent parser building an arena-backed syntax tree, reparsed block by block"""
+    
+    SKIPPED_TYPES = (TokenType.WHITESPACE, TokenType.NEWLINE)  # Ayrıştırmada yok sayılan token türleri
+    PAIRS = {'(': ')', '[': ']', '{': '}'}  # Açılış-kapanış eşleşmeleri
+    # Sütun 1'de açık bir parantezin içinde bile yeni bir üst düzey blok başlatan anahtar kelimeler
+    RECOVERY_KEYWORDS = {'def', 'class', 'import', 'from', 'if', 'for', 'while', 'try', 'with'}
+    # Sütun 1'de olsalar da önceki bileşik deyime ait olan anahtar kelimeler
+    CONTINUATION_KEYWORDS = {'elif', 'else', 'except', 'finally'}
+    COMPOUND_KINDS = {
+        'def': NodeKind.FUNCTION, 'class': NodeKind.CLASS, 'if': NodeKind.IF, 'elif': NodeKind.ELIF,
+        'else': NodeKind.ELSE, 'for': NodeKind.FOR, 'while': NodeKind.WHILE, 'try': NodeKind.TRY,
+        'except': NodeKind.EXCEPT, 'finally': NodeKind.FINALLY, 'with': NodeKind.WITH,
+    }
+    # Bileşik deyim devamlarının hangi deyimlerden sonra gelebileceği
+    ALLOWED_AFTER = {
+        NodeKind.ELIF: (NodeKind.IF, NodeKind.ELIF),
+        NodeKind.ELSE: (NodeKind.IF, NodeKind.ELIF, NodeKind.FOR, NodeKind.WHILE, NodeKind.EXCEPT),
+        NodeKind.EXCEPT: (NodeKind.TRY, NodeKind.EXCEPT),
+        NodeKind.FINALLY: (NodeKind.TRY, NodeKind.EXCEPT, NodeKind.ELSE),
+    }
+    SIMPLE_KINDS = {
+        'pass': NodeKind.PASS, 'break': NodeKind.BREAK, 'continue': NodeKind.CONTINUE,
+    }
+    BINARY_PRECEDENCE = {  # İkili operatör öncelikleri (büyük olan daha sıkı bağlar)
+        '|': 1, '^': 2, '&': 3, '<<': 4, '>>': 4, '+': 5, '-': 5,
+        '*': 6, '/': 6, '//': 6, '%': 6, '@': 6,
+    }
+    COMPARISON_OPERATORS = {'<', '>', '==', '>=', '<=', '!='}
+    AUGMENTED_OPERATORS = {'+=', '-=', '*=', '/='}  # Lexer'ın tek token olarak tanıdıkları
+    CONSTANT_KEYWORDS = {'True', 'False', 'None'}
+    EXPRESSION_KEYWORDS = {'not', 'lambda', 'True', 'False', 'None', 'yield'}
+    STRING_PREFIXES = {'r', 'u', 'f', 'b', 'rb', 'br', 'fr', 'rf'}
+    LEAF_KINDS = {TokenType.IDENTIFIER: NodeKind.NAME, TokenType.NUMBER: NodeKind.NUMBER, TokenType.STRING: NodeKind.STRING}
+    TERMINATORS = {',', ')', ']', '}', ':', ';', '='}  # Tek token'lık bir ifadeyi bitiren tokenlar
+    MAX_NESTING = 200  # İç içe parantez sınırı (CPython'unki gibi: geçerli kod bunu aşamaz)
+    # İşleneni ayrıştırılınca tamamlanan bekleyen kuralların düğüm türleri
+    PENDING_KINDS = {
+        LAMBDA: NodeKind.LAMBDA, NAMED: NodeKind.NAMED, NOT: NodeKind.UNARY, UNARY: NodeKind.UNARY,
+        POWER_RIGHT: NodeKind.BINARY, AWAIT: NodeKind.AWAIT, TEST_ELSE: NodeKind.CONDITIONAL, STARRED: NodeKind.STARRED,
+    }
     
-    def __init__(self, tokens: List[Token]):
-        # WHITESPACE ve NEWLINE tokenlarını filtreleyerek sadece anlamlı tokenları saklar
-        self.tokens = [t for t in tokens if t.type not in [TokenType.WHITESPACE, TokenType.NEWLINE]]
-        self.position = 0  # Şu anki token pozisyonu (şu an kullanılmıyor)
+    def __init__(self, tokens: Union[List[Token], TokenBuffer]):
+        # Token listesi (veya TokenBuffer) kopyalanmadan saklanır, filtreleme tarama sırasında yapılır
+        self.tokens = tokens
+        self.position = 0  # Ayrıştırılan mantıksal satırdaki token pozisyonu
         self.errors = []   # Bulunan sözdizimi hatalarını saklar
+        self.tree: Optional[SyntaxTree] = None  # Son ayrıştırmanın ağacı
+        self._line: List[tuple] = []    # Ayrıştırılan mantıksal satırın tokenları
+        self._lines: List[LogicalLine] = []  # Ayrıştırılan bloğun mantıksal satırları
+        self._line_index = 0            # Sıradaki mantıksal satır
+        self._damaged = False           # Ayrıştırılan satırın hataları bastırılıyor mu
+        self._nesting = 0               # Ayrıştırılan ifadedeki parantez derinliği
+        self._block: Optional[SyntaxBlock] = None  # Ayrıştırılan blok
     
-    def parse(self):
-        """Parse the tokens (simplified)"""
-        self.errors = []  # Önceki hataları temizle
-        # Basit sözdizimi kontrolleri
-        self._check_parentheses_balance()  # Parantez dengesi kontrolü
-        self._check_string_completeness()  # Stringlerin doğru kapanıp kapanmadığı kontrolü
-        return None  # Tam bir uygulamada burada AST dönerdi
-    
-    def _check_parentheses_balance(self):
-        """Check if parentheses are balanced"""
-        stack = []  # Açılan parantezleri saklamak için yığın
-        pairs = {'(': ')', '[': ']', '{': '}'}  # Açılış-kapanış eşleşmeleri
+    @recorder.timed("parser.parse")
+    def parse(self) -> SyntaxTree:
+        """Parse all tokens into a syntax tree and collect diagnostics"""
+        self.tree = SyntaxTree([self._parse_block(rows) for rows in self._scan_blocks(0)])
+        self.errors = self.tree.errors
+        return self.tree
+    
+    @recorder.timed("parser.reparse")
+    def reparse(self, tokens: Union[List[Token], TokenBuffer], edit: Tuple[int, int, str],
+                changed_end: Optional[int] = None) -> SyntaxTree:
+        """Reparse after a single edit, reusing every top-level block the edit cannot have changed
         
-        for token in self.tokens:
-            if token.value in pairs:
-                # Açılış parantezi ise yığına ekle
-                stack.append((token.value, token.line, token.column))
-            elif token.value in pairs.values():
-                # Kapanış parantezi ise
-                if not stack:
-                    # Yığında hiç açılış yoksa hata ekle
-                    self.errors.append(f"Unmatched closing '{token.value}' at line {token.line}, column {token.column}")
-                else:
-                    opening, line, col = stack.pop()  # Son açılanı çıkar
-                    expected = pairs[opening]  # Beklenen kapanış karakteri
-                    if token.value != expected:
-                        # Eşleşmiyorsa hata ekle
-                        self.errors.append(f"Mismatched parentheses: expected '{expected}' but found '{token.value}' at line {token.line}, column {token.column}")
+        edit is (offset, deleted_length, inserted_text) as returned by find_edit(); changed_end is the
+        position in the new code after which the tokens are the old ones shifted (the lexer's
+        relexed_end), by default the end of the inserted text.
+        """
+        if self.tree is None:
+            self.tokens = tokens
+            return self.parse()
+        offset, deleted_length, inserted_text = edit
+        delta = len(inserted_text) - deleted_length
+        if changed_end is None:
+            changed_end = offset + len(inserted_text)
+        self.tokens = tokens
+        old_blocks = self.tree.blocks
+        old_starts = [block.start for block in old_blocks]
+        # Düzenlemeden kesinlikle önce biten bloklar aynen kalır; bir önceki blok da taranır çünkü
+        # düzenleme bir sonraki satırın girintisini değiştirip onu bu bloğa katabilir
+        first = max(0, bisect_left(old_starts, offset) - 1)
+        start = find_token_index(tokens, old_starts[first]) if first > 0 else 0
+        if first > 0 and offset <= tokens[start].position + len(tokens[start].value):
+            # Düzenleme bloğun ilk token'ını değiştiriyor ('else', 'def', '@' ...): blok sınırı da değişebilir
+            first -= 1
+            start = find_token_index(tokens, old_starts[first]) if first > 0 else 0
+        new_blocks = old_blocks[:first]
+        reused = []
         
-        for opening, line, col in stack:
-            # Yığında kalan açılışlar varsa kapanmamış demektir
-            self.errors.append(f"Unclosed '{opening}' at line {line}, column {col}")
+        def resync(position: int) -> bool:
+            # Bu pozisyondan sonraki tokenlar eskilerin kaydırılmış kopyası ve orada eski bir blok başlıyorsa
+            # kalan eski bloklar olduğu gibi yeniden kullanılır
+            if position < changed_end:
+                return False
+            old_index = bisect_left(old_starts, position - delta)
+            if old_index < len(old_blocks) and old_starts[old_index] == position - delta:
+                reused.append(old_index)
+                return True
+            return False
+        
+        for rows in self._scan_blocks(start, resync):
+            new_blocks.append(self._parse_block(rows))
+        if reused:
+            tail = old_blocks[reused[0]:]
+            line_delta = tokens[find_token_index(tokens, tail[0].start + delta)].line - tail[0].line
+            new_blocks.extend(block.moved(delta, line_delta) for block in tail)
+        self.tree = SyntaxTree(new_blocks)
+        self.errors = self.tree.errors
+        return self.tree
+    
+    def _rows(self, start: int) -> Iterator[tuple]:
+        """Yield (type, value, position, line, column) rows of the tokens from index start"""
+        tokens = self.tokens
+        if isinstance(tokens, TokenBuffer):
+            source = tokens.source
+            for index in range(start, len(tokens)):
+                token_start = tokens.starts[index]
+                yield (TOKEN_TYPES[tokens.types[index]], source[token_start:tokens.ends[index]],
+                       token_start, tokens.lines[index], tokens.columns[index])
+        else:
+            for index in range(start, len(tokens)):
+                token = tokens[index]
+                yield token.type, token.value, token.position, token.line, token.column
     
-    def _check_string_completeness(self):
-        """Check if strings are properly closed"""
-        for token in self.tokens:
-            if token.type == TokenType.STRING:
+    def _scan_blocks(self, start: int, stop=None) -> Iterator[List[tuple]]:
+        """Split the tokens from index start into top-level blocks, stopping where stop(position) is true
+        
+        A block starts at the first token of a line at column 1 when no bracket is open (or the token is a
+        recovery keyword), unless it continues a compound statement (else, except, ...) or follows a
+        decorator line. Blank lines and comments stay with the preceding block.
+        """
+        newline, comment = TokenType.NEWLINE, TokenType.COMMENT
+        delimiter, unknown = TokenType.DELIMITER, TokenType.UNKNOWN
+        block = []
+        has_statement = False  # Blokta en az bir anlamlı token var mı
+        depth = 0              # Açık parantez derinliği
+        line_start = True      # Fiziksel satırın ilk anlamlı token'ı bekleniyor
+        continued = False      # Önceki satır ters eğik çizgiyle devam ediyor
+        decorated = False      # Son mantıksal satır bir dekoratör
+        last = None            # Son anlamlı token satırı
+        previous = None        # Bir önceki token satırı
+        triple = None          # Açık üç tırnaklı stringin tırnak karakteri
+        for row in self._rows(start):
+            kind, value = row[KIND], row[VALUE]
+            if triple is not None:
+                # Üç tırnaklı string içindeki tokenlar blok sınırlarını ve parantez derinliğini etkilemez
+                if self._closes_triple(previous, row, triple):
+                    triple = None
+                    last = row
+            elif kind is TokenType.STRING and self._opens_triple(previous, row):
+                triple = previous[VALUE][0]
+                last = row
+            elif kind is newline:
+                line_start = True
+                continued = last is not None and last[KIND] is unknown and last[VALUE] == '\\'
+            elif kind is not comment:
+                if line_start:
+                    line_start = False
+                    if row[COLUMN] == 1 and has_statement and not decorated and (
+                            (depth == 0 and not continued) or
+                            (kind is TokenType.KEYWORD and value in self.RECOVERY_KEYWORDS)) and \
+                            value not in self.CONTINUATION_KEYWORDS:
+                        yield block
+                        if stop is not None and stop(row[POSITION]):
+                            return
+                        block = []
+                        depth = 0
+                        continued = False
+                    if depth == 0 and not continued:
+                        decorated = value == '@' and kind is delimiter
+                has_statement = True
+                last = row
+                if kind is delimiter:
+                    if value in '([{':
+                        depth += 1
+                    elif value in ')]}' and depth:
+                        depth -= 1
+            block.append(row)
+            previous = row
+        if block or start == 0:
+            yield block
+    
+    def _logical_lines(self, rows: List[tuple], block: SyntaxBlock) -> List[LogicalLine]:
+        """Join a block's physical lines into logical lines, fill the block's bracket table and record errors"""
+        lines = []
+        current = []
+        damaged = False
+        brackets = block.brackets
+        base = block.start
+        stack = []  # Açık parantezlerin (token satırı, tablo indeksi) çiftleri
+        previous = None  # Bir önceki token satırı
+        triple = None    # Açık üç tırnaklı stringin (tırnak, ilk token satırı)
+        for row in rows:
+            kind = row[KIND]
+            if triple is not None:
+                if self._closes_triple(previous, row, triple[0]):
+                    current.append(self._string_row(triple[1], row))
+                    triple = None
+                previous = row
+                continue
+            if kind is TokenType.STRING and self._opens_triple(previous, row):
+                # Lexer '"""' tırnaklarını tanımaz: string tek bir token satırında birleştirilir
+                triple = (previous[VALUE][0], current.pop())
+                previous = row
+                continue
+            previous = row
+            if kind is TokenType.NEWLINE:
+                if current and current[-1][KIND] is TokenType.UNKNOWN and current[-1][VALUE] == '\\':
+                    current.pop()  # Ters eğik çizgiyle satır devamı
+                    continue
+                if stack or not current:
+                    continue  # Parantez içinde satır devamı veya boş satır
+                lines.append(LogicalLine(current, damaged))
+                current = []
+                damaged = False
+                continue
+            if kind is TokenType.COMMENT or kind is TokenType.WHITESPACE:
+                continue
+            value = row[VALUE]
+            if kind is TokenType.STRING:
                 # Stringin başı ve sonu aynı karakter mi ve en az iki karakter mi?
-                if len(token.value) < 2 or token.value[0] != token.value[-1]:
-                    self.errors.append(f"Unclosed string at line {token.line}, column {token.column}")
\ No newline at end of file
+                if len(value) < 2 or value[0] != value[-1]:
+                    self._diagnose(block.string_errors, row, "Unclosed string")
+                    damaged = True
+            elif kind is TokenType.DELIMITER:
+                if value in self.PAIRS:
+                    # Açılış parantezi: tabloya ekle ve yığına koy
+                    stack.append((row, brackets.add(row[POSITION] - base, value, stack[-1][1] if stack else -1)))
+                elif value in ')]}':
+                    if not stack:
+                        # Yığında hiç açılış yoksa hata ekle
+                        brackets.add(row[POSITION] - base, value, -1)
+                        self._diagnose(block.bracket_errors, row, f"Unmatched closing '{value}'")
+                        damaged = True
+                    else:
+                        opening, opening_index = stack.pop()
+                        brackets.pair(opening_index, brackets.add(row[POSITION] - base, value,
+                                                                  stack[-1][1] if stack else -1))
+                        expected = self.PAIRS[opening[VALUE]]  # Beklenen kapanış karakteri
+                        if value != expected:
+                            self._diagnose(block.bracket_errors, row,
+                                           f"Mismatched parentheses: expected '{expected}' but found '{value}'")
+                            damaged = True
+            current.append(row)
+        if triple is not None:
+            self._diagnose(block.string_errors, triple[1], "Unclosed string")
+            current.append(self._string_row(triple[1], previous))
+            damaged = True
+        for opening, _ in stack:
+            # Yığında kalan açılışlar varsa kapanmamış demektir
+            self._diagnose(block.bracket_errors, opening, f"Unclosed '{opening[VALUE]}'")
+            damaged = True
+        if current:
+            lines.append(LogicalLine(current, damaged))
+        return lines
+    
+    @staticmethod
+    def _opens_triple(previous: Optional[tuple], row: tuple) -> bool:
+        """True if row continues '""' into a triple-quoted string (the lexer splits '"""' into '""' + '"')"""
+        return previous is not None and previous[KIND] is TokenType.STRING and previous[VALUE] in ('""', "''") and \
+            row[KIND] is TokenType.STRING and row[POSITION] == previous[POSITION] + 2 and \
+            row[VALUE][0] == previous[VALUE][0]
+    
+    @staticmethod
+    def _closes_triple(previous: tuple, row: tuple, quote: str) -> bool:
+        """True if row is the '""' that, right after a string ending in the quote, closes a triple-quoted string"""
+        return row[KIND] is TokenType.STRING and row[VALUE] == quote * 2 and previous[KIND] is TokenType.STRING and \
+            previous[VALUE].endswith(quote) and previous[POSITION] + len(previous[VALUE]) == row[POSITION]
+    
+    @staticmethod
+    def _string_row(first: tuple, last: tuple) -> tuple:
+        """One STRING row covering the tokens first..last of a triple-quoted string"""
+        length = last[POSITION] + len(last[VALUE]) - first[POSITION]
+        return TokenType.STRING, first[VALUE][0] * length, first[POSITION], first[LINE], first[COLUMN]
+    
+    def _diagnose(self, diagnostics: list, row: tuple, message: str):
+        """Store a diagnostic with its line relative to the block being parsed"""
+        diagnostics.append((row[LINE] - self._block.line, row[COLUMN], message))
+    
+    def _parse_block(self, rows: List[tuple]) -> SyntaxBlock:
+        """Parse one top-level block into its own arena"""
+        first = rows[0] if rows else (None, '', 0, 1, 1)
+        block = SyntaxBlock(first[POSITION], first[LINE])
+        self._block = block
+        self._arena = block.arena
+        self._lines = self._logical_lines(rows, block)
+        self._line_index = 0
+        self._parse_suite(1)  # Daha fazla girintili satırlar "Unexpected indent" olarak raporlanır
+        return block
+    
+    # --- Deyimler ---
+    
+    def _parse_suite(self, indent: int):
+        """Parse consecutive statements at the given indentation"""
+        previous = None  # Aynı seviyedeki bir önceki deyimin türü
+        pending = None   # except/finally bekleyen try veya def/class bekleyen dekoratör satırı
+        while self._line_index < len(self._lines):
+            line = self._lines[self._line_index]
+            if line.indent < indent:
+                break
+            if line.indent > indent:
+                self._report_line(line, "Unexpected indent", line.tokens[0])
+                self._parse_suite(line.indent)
+                continue
+            kind = self._parse_statement(line)
+            if pending is not None:
+                pending_kind, pending_line = pending
+                if pending_kind is NodeKind.TRY and kind not in (NodeKind.EXCEPT, NodeKind.FINALLY):
+                    self._report_line(pending_line, "Expected 'except' or 'finally' block", pending_line.tokens[0])
+                elif pending_kind is NodeKind.DECORATOR and kind not in (
+                        NodeKind.FUNCTION, NodeKind.CLASS, NodeKind.DECORATOR):
+                    self._report_line(pending_line, "Expected function or class definition after decorator",
+                                      pending_line.tokens[0])
+                pending = None
+            if kind in self.ALLOWED_AFTER and previous not in self.ALLOWED_AFTER[kind]:
+                self._report_line(line, f"Unexpected '{line.tokens[0][VALUE]}'", line.tokens[0])
+            if kind is NodeKind.TRY or kind is NodeKind.DECORATOR:
+                pending = (kind, line)
+            previous = kind
+        if pending is not None:
+            pending_kind, pending_line = pending
+            message = ("Expected 'except' or 'finally' block" if pending_kind is NodeKind.TRY
+                       else "Expected function or class definition after decorator")
+            self._report_line(pending_line, message, pending_line.tokens[0])
+    
+    def _parse_statement(self, line: LogicalLine) -> NodeKind:
+        """Parse one logical line (and the suite of a compound statement), return the statement kind"""
+        self._line_index += 1
+        self._line = line.tokens
+        self._damaged = line.damaged
+        self.position = 0
+        self._nesting = 0
+        mark = len(self._arena.kinds)
+        first = line.tokens[0]
+        compound = self._compound_kind(line.tokens)
+        if compound is not None:
+            return self._parse_compound(line, compound, mark)
+        try:
+            kind = None
+            while True:
+                kind = self._simple_statement()
+                if not self._accept(';'):
+                    break
+                if self.position >= len(self._line):
+                    break
+            if self.position < len(self._line):
+                raise self._unexpected()
+            return kind
+        except (ParseError, RecursionError) as e:
+            self._report(self._parse_error(e, first))
+            self._arena.truncate(mark)
+            self._add(NodeKind.ERROR, first, self._line[-1], mark)
+            return NodeKind.ERROR
+    
+    def _compound_kind(self, tokens: List[tuple]) -> Optional[NodeKind]:
+        """Kind of the compound statement (or decorator) a logical line starts, None for simple statements"""
+        first = tokens[0]
+        kind, value = first[KIND], first[VALUE]
+        if kind is TokenType.KEYWORD:
+            return self.COMPOUND_KINDS.get(value)
+        if kind is TokenType.DELIMITER and value == '@':
+            return NodeKind.DECORATOR
+        if kind is TokenType.IDENTIFIER and len(tokens) > 1:
+            second = tokens[1]
+            if value == 'async' and second[KIND] is TokenType.KEYWORD and second[VALUE] in ('def', 'for', 'with'):
+                return self.COMPOUND_KINDS[second[VALUE]]
+            if value in ('match', 'case') and tokens[-1][VALUE] == ':' and tokens[-1][KIND] is TokenType.DELIMITER \
+                    and second[VALUE] not in ('=', '.', ':', ',', ')', ']'):
+                return NodeKind.MATCH if value == 'match' else NodeKind.CASE  # Bağlama duyarlı anahtar kelimeler
+        return None
+    
+    def _parse_compound(self, line: LogicalLine, kind: NodeKind, mark: int) -> NodeKind:
+        """Parse a compound statement header, its inline or indented body, and build its node"""
+        tokens = line.tokens
+        label = ''
+        inline = False
+        header_ok = False
+        try:
+            if tokens[0][VALUE] == 'async':
+                self.position += 1
+            self.position += 1
+            if kind is NodeKind.DECORATOR:
+                self._test()
+                if self.position < len(self._line):
+                    raise self._unexpected()
+            else:
+                label = self._compound_header(kind)
+                self._expect(':')
+                inline = self.position < len(self._line)
+                while inline and self.position < len(self._line):
+                    self._simple_statement()
+                    if not self._accept(';'):
+                        break
+                if self.position < len(self._line):
+                    raise self._unexpected()
+            header_ok = True
+        except (ParseError, RecursionError) as e:
+            # Başlık ayrıştırılamadı: hata raporlanır, gövde yine de ayrıştırılır (deyim sınırında senkronizasyon)
+            self._report(self._parse_error(e, tokens[0]))
+            self._arena.truncate(mark)
+            inline = False
+        end_row = tokens[-1]
+        if kind is not NodeKind.DECORATOR and not inline:
+            has_body = (self._line_index < len(self._lines) and
+                        self._lines[self._line_index].indent > line.indent)
+            if has_body:
+                self._parse_suite(self._lines[self._line_index].indent)
+                end_row = self._lines[self._line_index - 1].tokens[-1]
+            elif header_ok:
+                self._report_line(line, f"Expected an indented block after '{tokens[0][VALUE]}'", tokens[-1])
+        self._add(kind, tokens[0], end_row, mark, label)
+        return kind
+    
+    def _compound_header(self, kind: NodeKind) -> str:
+        """Parse the part of a compound statement header between the keyword and ':', return its label"""
+        if kind is NodeKind.FUNCTION:
+            name = self._expect_name()
+            self._expect('(')
+            self._parameters(')', annotations=True)
+            self._expect(')')
+            row = self._peek()
+            following = self._peek(1)
+            if row is not None and row[VALUE] == '-' and following is not None and following[VALUE] == '>' \
+                    and following[POSITION] == row[POSITION] + 1:
+                self.position += 2  # Dönüş tipi notu '->' (lexer '-' ve '>' olarak ayırır)
+                self._test()
+            return name
+        if kind is NodeKind.CLASS:
+            name = self._expect_name()
+            if self._accept('('):
+                self._arguments(self._line[self.position - 1], ')')
+            return name
+        if kind in (NodeKind.IF, NodeKind.ELIF, NodeKind.WHILE):
+            self._test()
+        elif kind is NodeKind.FOR:
+            self._target_list()
+            self._expect_keyword('in')
+            self._expression_list()
+        elif kind is NodeKind.EXCEPT:
+            self._accept('*')
+            if not self._at(':'):
+                self._test()
+                if self._accept_keyword('as'):
+                    self._name()
+        elif kind is NodeKind.WITH:
+            while True:
+                mark = len(self._arena.kinds)
+                start = self._peek()
+                self._test()
+                if self._accept_keyword('as'):
+                    self._test(level=LEVEL_BINARY, star=True)
+                self._add(NodeKind.WITH_ITEM, start, self._previous(), mark)
+                if not self._accept(','):
+                    break
+        elif kind in (NodeKind.MATCH, NodeKind.CASE):
+            # Desenler ifade değildir: ':' öncesi ayrıştırılmadan atlanır
+            self.position = len(self._line) - 1
+        return ''
+    
+    def _simple_statement(self) -> NodeKind:
+        """Parse one simple statement (up to ';' or the end of the line)"""
+        mark = len(self._arena.kinds)
+        first = self._peek()
+        if first is None:
+            raise self._unexpected()
+        if first[KIND] is TokenType.KEYWORD:
+            value = first[VALUE]
+            kind = self.SIMPLE_KINDS.get(value)
+            if kind is not None:
+                self.position += 1
+            elif value == 'return':
+                kind = NodeKind.RETURN
+                self.position += 1
+                if self._starts_expression():
+                    self._expression_list()
+            elif value == 'raise':
+                kind = NodeKind.RAISE
+                self.position += 1
+                if self._starts_expression():
+                    self._test()
+                    if self._accept_keyword('from'):
+                        self._test()
+            elif value in ('global', 'nonlocal'):
+                kind = NodeKind.GLOBAL if value == 'global' else NodeKind.NONLOCAL
+                self.position += 1
+                self._name()
+                while self._accept(','):
+                    self._name()
+            elif value == 'del':
+                kind = NodeKind.DEL
+                self.position += 1
+                self._target_list()
+            elif value == 'assert':
+                kind = NodeKind.ASSERT
+                self.position += 1
+                self._test()
+                if self._accept(','):
+                    self._test()
+            elif value == 'import':
+                kind = NodeKind.IMPORT
+                self.position += 1
+                self._import_names()
+            elif value == 'from':
+                kind = NodeKind.IMPORT_FROM
+                self.position += 1
+                return self._import_from(first, mark)
+            elif value in self.EXPRESSION_KEYWORDS:
+                return self._expression_statement(first, mark)
+            else:
+                raise self._unexpected()
+            self._add(kind, first, self._previous(), mark)
+            return kind
+        return self._expression_statement(first, mark)
+    
+    def _expression_statement(self, first: tuple, mark: int) -> NodeKind:
+        """Parse an expression statement or an (augmented, annotated) assignment"""
+        if self._at_keyword('yield'):
+            self._yield()
+        else:
+            self._expression_list(star=True)
+        row = self._peek()
+        kind, label = NodeKind.EXPRESSION, ''
+        if row is not None:
+            value = row[VALUE]
+            following = self._peek(1)
+            if value == '=' and row[KIND] is TokenType.OPERATOR:
+                kind = NodeKind.ASSIGN
+                while self._accept('='):
+                    if self._at_keyword('yield'):
+                        self._yield()
+                    else:
+                        self._expression_list(star=True)
+            elif value in self.AUGMENTED_OPERATORS or (
+                    following is not None and following[VALUE] == '=' and
+                    following[POSITION] == row[POSITION] + len(value) and
+                    (value in self.BINARY_PRECEDENCE or value == '**')):
+                # '//=' gibi operatörleri lexer iki token olarak verir ('//' ve '=')
+                kind = NodeKind.AUGMENTED_ASSIGN
+                label = value if value in self.AUGMENTED_OPERATORS else value + '='
+                self.position += 1 if value in self.AUGMENTED_OPERATORS else 2
+                if self._at_keyword('yield'):
+                    self._yield()
+                else:
+                    self._expression_list()
+            elif value == ':' and row[KIND] is TokenType.DELIMITER:
+                kind = NodeKind.ANNOTATED_ASSIGN
+                self.position += 1
+                self._test()
+                if self._accept('='):
+                    if self._at_keyword('yield'):
+                        self._yield()
+                    else:
+                        self._expression_list(star=True)
+        self._add(kind, first, self._previous(), mark, label)
+        return kind
+    
+    def _import_names(self):
+        """Parse 'dotted.name [as name]' items of an import statement"""
+        while True:
+            mark = len(self._arena.kinds)
+            start = self._peek()
+            name = self._dotted_name()
+            if self._accept_keyword('as'):
+                self._name()
+            self._add(NodeKind.ALIAS, start, self._previous(), mark, name)
+            if not self._accept(','):
+                break
+    
+    def _import_from(self, first: tuple, mark: int) -> NodeKind:
+        """Parse the rest of 'from module import names'"""
+        module = ''
+        while self._at('.'):
+            module += '.'
+            self.position += 1
+        if not self._at_keyword('import'):
+            module += self._dotted_name()
+        self._expect_keyword('import')
+        if self._accept('*'):
+            pass
+        elif self._accept('('):
+            self._from_names()
+            self._accept(',')
+            self._expect(')')
+        else:
+            self._from_names()
+        self._add(NodeKind.IMPORT_FROM, first, self._previous(), mark, module)
+        return NodeKind.IMPORT_FROM
+    
+    def _from_names(self):
+        """Parse 'name [as name], ...' after 'from module import'"""
+        while True:
+            mark = len(self._arena.kinds)
+            start = self._peek()
+            name = self._expect_name()
+            if self._accept_keyword('as'):
+                self._name()
+            self._add(NodeKind.ALIAS, start, self._previous(), mark, name)
+            if not (self._at(',') and self._peek(1) is not None and self._peek(1)[KIND] is TokenType.IDENTIFIER):
+                break
+            self.position += 1
+    
+    def _dotted_name(self) -> str:
+        """Parse 'name(.name)*' and return it as text"""
+        parts = [self._expect_name()]
+        while self._accept('.'):
+            parts.append(self._expect_name())
+        return '.'.join(parts)
+    
+    # --- İfadeler ---
+    
+    def _expression_list(self, star: bool = False) -> int:
+        """Parse 'expr, expr, ...' (a TUPLE node when there is a comma)"""
+        mark = len(self._arena.kinds)
+        start = self._peek()
+        self._test(star=star)
+        if not self._at(','):
+            return mark
+        while self._accept(','):
+            if not self._starts_expression():
+                break
+            self._test(star=star)
+        return self._add(NodeKind.TUPLE, start, self._previous(), mark)
+    
+    def _target_list(self):
+        """Parse assignment targets of for/del (no comparisons: 'in' ends the list)"""
+        mark = len(self._arena.kinds)
+        start = self._peek()
+        self._test(level=LEVEL_BINARY, star=True)
+        if self._at(','):
+            while self._accept(','):
+                if not self._starts_expression() or self._at_keyword('in'):
+                    break
+                self._test(level=LEVEL_BINARY, star=True)
+            self._add(NodeKind.TUPLE, start, self._previous(), mark)
+    
+    def _test(self, conditional: bool = True, level: int = LEVEL_TEST, minimum: int = 1, star: bool = False):
+        """Parse an expression from a precedence level down, by default a full one (lambda, conditional, named)
+        
+        The precedence levels (or, and, not, comparison, binary operators, unary, power, await, trailers) are
+        pending rules on one explicit stack instead of one call each, so only brackets cost Python frames and
+        MAX_NESTING of them fit in the default recursion limit. minimum is the lowest binary operator precedence
+        accepted when starting at LEVEL_BINARY; star allows a '*expression' (without comparisons).
+        """
+        kinds = self._arena.kinds
+        stack = []  # Bekleyen kurallar: [durum, işaret, başlangıç token'ı, ek bilgi]
+        if star and self._at('*'):
+            stack.append([STARRED, len(kinds), self._peek(), '*'])
+            self.position += 1
+            level, minimum = LEVEL_BINARY, 1
+        while True:
+            # İniş: önekler ve seviyeler yığına alınır, sonra bir birincil ifade ayrıştırılır
+            row = self._peek()
+            if row is None:
+                raise self._unexpected()
+            mark = len(kinds)
+            kind, value = row[KIND], row[VALUE]
+            if level == LEVEL_TEST:
+                if kind is TokenType.KEYWORD and value == 'lambda':
+                    self.position += 1
+                    self._parameters(':', annotations=False)
+                    self._expect(':')
+                    stack.append([LAMBDA, mark, row, ''])
+                    continue  # Gövde aynı 'conditional' ile ayrıştırılır
+                if kind is TokenType.IDENTIFIER:
+                    colon, equals = self._peek(1), self._peek(2)
+                    if colon is not None and equals is not None and colon[VALUE] == ':' and equals[VALUE] == '=' \
+                            and equals[POSITION] == colon[POSITION] + 1:
+                        # ':=' lexer'da ':' ve '=' olarak ayrılır
+                        self._name()
+                        self.position += 2
+                        stack.append([NAMED, mark, row, value])
+                        conditional = True
+                        continue
+            following = self._peek(1)
+            if kind in self.LEAF_KINDS and (following is None or (
+                    following[VALUE] in self.TERMINATORS and following[KIND] is not TokenType.STRING)):
+                # Sık görülen durum: tek token'lık ifade (ad, sayı, string); bekleyen seviyelerin hiçbiri devam etmez
+                self.position += 1
+                leaf = self.LEAF_KINDS[kind]
+                self._add(leaf, row, row, mark, value if leaf is NodeKind.NAME else '')
+            else:
+                if level == LEVEL_TEST:
+                    stack.append([TEST, mark, row, conditional])
+                    level = LEVEL_OR
+                if level == LEVEL_OR:
+                    stack.append([OR, mark, row, False])
+                    level = LEVEL_AND
+                if level == LEVEL_AND:
+                    stack.append([AND, mark, row, False])
+                    level = LEVEL_NOT
+                if level == LEVEL_NOT:
+                    if kind is TokenType.KEYWORD and value == 'not':
+                        stack.append([NOT, mark, row, 'not'])
+                        self.position += 1
+                        continue
+                    stack.append([COMPARISON, mark, row, None])
+                    level, minimum = LEVEL_BINARY, 1
+                if level == LEVEL_BINARY:
+                    stack.append([BINARY, mark, row, minimum])
+                    level = LEVEL_UNARY
+                if level == LEVEL_UNARY:
+                    if kind is TokenType.OPERATOR and value in ('+', '-', '~'):
+                        stack.append([UNARY, mark, row, value])
+                        self.position += 1
+                        continue
+                    stack.append([POWER, mark, row, None])
+                    if kind is TokenType.IDENTIFIER and value == 'await' and following is not None and \
+                            self._starts_expression(following) and following[KIND] is not TokenType.OPERATOR:
+                        stack.append([AWAIT, mark, row, ''])
+                        self.position += 1
+                        level = LEVEL_PRIMARY
+                        continue
+                if kind is TokenType.DELIMITER and value in self.PAIRS:
+                    self.position += 1
+                    self._nest()
+                    if value == '(':
+                        self._parenthesized(row)
+                    elif value == '[':
+                        self._display(row, ']', NodeKind.LIST)
+                    else:
+                        self._braces(row)
+                    self._nesting -= 1
+                else:
+                    self._atom()
+                following = self._peek()
+                if following is not None and following[VALUE] in ('(', '[', '.') and \
+                        following[KIND] is TokenType.DELIMITER:
+                    stack.append([TRAILERS, mark, row, None])
+            
+            # Çıkış: birincil ifadeden sonra her bekleyen kural sırayla devam eder veya düğümünü kurar
+            while stack:
+                frame = stack[-1]
+                state, mark, start = frame[0], frame[1], frame[2]
+                if state == TRAILERS:
+                    # Çağrılar, indisler ve öznitelik erişimleri
+                    row = self._peek()
+                    value = row[VALUE] if row is not None and row[KIND] is TokenType.DELIMITER else None
+                    if value == '(':
+                        self.position += 1
+                        self._nest()
+                        self._arguments(row, ')')
+                        self._nesting -= 1
+                        self._add(NodeKind.CALL, start, self._previous(), mark)
+                    elif value == '[':
+                        self.position += 1
+                        self._nest()
+                        self._subscripts()
+                        self._nesting -= 1
+                        self._add(NodeKind.SUBSCRIPT, start, self._previous(), mark)
+                    elif value == '.':
+                        self.position += 1
+                        name = self._expect_name()
+                        self._add(NodeKind.ATTRIBUTE, start, self._previous(), mark, name)
+                    else:
+                        stack.pop()
+                elif state == POWER:
+                    row = self._peek()
+                    if row is not None and row[VALUE] == '**' and row[KIND] is TokenType.OPERATOR:
+                        following = self._peek(1)
+                        if following is None or following[VALUE] != '=' or following[POSITION] != row[POSITION] + 2:
+                            self.position += 1  # '**=' artırılmış ataması değil
+                            frame[0], frame[3] = POWER_RIGHT, '**'
+                            level = LEVEL_UNARY
+                            break
+                    stack.pop()
+                elif state == BINARY:
+                    row = self._peek()
+                    if row is None:
+                        stack.pop()
+                        continue
+                    precedence = self.BINARY_PRECEDENCE.get(row[VALUE])
+                    if precedence is None or precedence < frame[3] or \
+                            row[KIND] not in (TokenType.OPERATOR, TokenType.DELIMITER):
+                        stack.pop()
+                        continue
+                    following = self._peek(1)
+                    if following is not None and following[VALUE] == '=' and \
+                            following[POSITION] == row[POSITION] + len(row[VALUE]):
+                        stack.pop()  # Artırılmış atama ('//=', '|=', ...)
+                        continue
+                    self.position += 1
+                    stack.append([BINARY_RIGHT, mark, start, row[VALUE]])
+                    level, minimum = LEVEL_BINARY, precedence + 1
+                    break
+                elif state == BINARY_RIGHT:
+                    stack.pop()
+                    self._add(NodeKind.BINARY, start, self._previous(), mark, frame[3])
+                elif state == COMPARISON:
+                    operator = self._comparison_operator()
+                    if operator is None:
+                        stack.pop()
+                        if frame[3] is not None:
+                            self._add(NodeKind.COMPARE, start, self._previous(), mark, frame[3])
+                        continue
+                    if frame[3] is None:
+                        frame[3] = operator
+                    level, minimum = LEVEL_BINARY, 1
+                    break
+                elif state == AND or state == OR:
+                    operator = 'and' if state == AND else 'or'
+                    if self._accept_keyword(operator):
+                        frame[3] = True
+                        level = LEVEL_NOT if state == AND else LEVEL_AND
+                        break
+                    stack.pop()
+                    if frame[3]:
+                        self._add(NodeKind.BOOLEAN, start, self._previous(), mark, operator)
+                elif state == TEST:
+                    if frame[3] and self._at_keyword('if'):
+                        self.position += 1
+                        frame[0], frame[3] = TEST_IF, ''
+                        level = LEVEL_OR
+                        break
+                    stack.pop()
+                elif state == TEST_IF:
+                    self._expect_keyword('else')
+                    frame[0] = TEST_ELSE
+                    level, conditional = LEVEL_TEST, True
+                    break
+                else:
+                    stack.pop()
+                    # Tek işlenenli kurallar (lambda, ':=', '**', tekli, await, koşullu): düğüm etiketi çerçevede
+                    self._add(self.PENDING_KINDS[state], start, self._previous(), mark, frame[3])
+            else:
+                return
+    
+    def _comparison_operator(self) -> Optional[str]:
+        """Consume a comparison operator and return its text, None if there is none"""
+        row = self._peek()
+        if row is None:
+            return None
+        kind, value = row[KIND], row[VALUE]
+        if kind is TokenType.OPERATOR and value in self.COMPARISON_OPERATORS:
+            self.position += 1
+            return value
+        if kind is TokenType.UNKNOWN and value == '!':
+            following = self._peek(1)
+            if following is not None and following[VALUE] == '=' and following[POSITION] == row[POSITION] + 1:
+                self.position += 2  # Lexer '!=' işlecini '!' ve '=' olarak ayırır
+                return '!='
+            return None
+        if kind is TokenType.KEYWORD:
+            if value == 'in' or value == 'is':
+                self.position += 1
+                if value == 'is' and self._accept_keyword('not'):
+                    return 'is not'
+                return value
+            if value == 'not':
+                following = self._peek(1)
+                if following is not None and following[VALUE] == 'in':
+                    self.position += 2
+                    return 'not in'
+        return None
+    
+    def _atom(self):
+        """Parse a name, literal or constant (brackets are parsed by _test)"""
+        row = self._peek()
+        if row is None:
+            raise self._unexpected()
+        kind, value = row[KIND], row[VALUE]
+        mark = len(self._arena.kinds)
+        if kind is TokenType.IDENTIFIER:
+            following = self._peek(1)
+            if value.lower() in self.STRING_PREFIXES and following is not None and \
+                    following[KIND] is TokenType.STRING and following[POSITION] == row[POSITION] + len(value):
+                self._strings()  # f"...", r'...' gibi önekli stringler
+            else:
+                self.position += 1
+                self._add(NodeKind.NAME, row, row, mark, value)
+        elif kind is TokenType.NUMBER or (kind is TokenType.DELIMITER and value == '.' and self._at_fraction()):
+            self._number()
+        elif kind is TokenType.STRING:
+            self._strings()
+        elif kind is TokenType.KEYWORD and value in self.CONSTANT_KEYWORDS:
+            self.position += 1
+            self._add(NodeKind.CONSTANT, row, row, mark, value)
+        elif kind is TokenType.DELIMITER and value == '.' and self._at_ellipsis():
+            self.position += 3
+            self._add(NodeKind.CONSTANT, row, self._previous(), mark, '...')
+        else:
+            raise self._unexpected()
+    
+    def _nest(self):
+        """Enter a bracket one nesting level deeper, refusing to exceed MAX_NESTING (the caller leaves it)"""
+        # Çağrı zinciri kısa tutulur: *arguments ile yapılan bir çağrı 3.11'de de C yığınını kullanırdı
+        if self._nesting >= self.MAX_NESTING:
+            raise ParseError("Too many nested brackets", self._previous())
+        self._nesting += 1
+    
+    def _number(self):
+        """Parse a number the lexer split into pieces ('1e6', '1e-5', '0x1F', '2j', '.5') as one NUMBER node"""
+        mark = len(self._arena.kinds)
+        start = self._peek()
+        if start[KIND] is TokenType.DELIMITER:
+            self.position += 1  # '.5' kesrinin noktası
+        row = self._peek()
+        end = row[POSITION] + len(row[VALUE])
+        self.position += 1
+        while True:
+            row = self._peek()
+            if row is None or row[POSITION] != end or row[KIND] is not TokenType.IDENTIFIER:
+                break
+            self.position += 1
+            end += len(row[VALUE])
+            sign, exponent = self._peek(), self._peek(1)
+            if row[VALUE][-1] in 'eE' and sign is not None and exponent is not None and sign[VALUE] in ('+', '-') \
+                    and sign[POSITION] == end and exponent[KIND] is TokenType.NUMBER and exponent[POSITION] == end + 1:
+                self.position += 2
+                end = exponent[POSITION] + len(exponent[VALUE])
+        self._add(NodeKind.NUMBER, start, self._previous(), mark)
+    
+    def _strings(self):
+        """Parse adjacent (optionally prefixed) string literals as one STRING node"""
+        mark = len(self._arena.kinds)
+        start = self._peek()
+        while True:
+            row = self._peek()
+            if row is None:
+                break
+            if row[KIND] is TokenType.STRING:
+                self.position += 1
+                continue
+            following = self._peek(1)
+            if row[KIND] is TokenType.IDENTIFIER and row[VALUE].lower() in self.STRING_PREFIXES and \
+                    following is not None and following[KIND] is TokenType.STRING and \
+                    following[POSITION] == row[POSITION] + len(row[VALUE]):
+                self.position += 2
+                continue
+            break
+        self._add(NodeKind.STRING, start, self._previous(), mark)
+    
+    def _parenthesized(self, opening: tuple):
+        """Parse the inside of '(...)': tuple, generator, yield or a parenthesized expression"""
+        mark = len(self._arena.kinds)
+        if self._accept(')'):
+            self._add(NodeKind.TUPLE, opening, self._previous(), mark)
+            return
+        if self._at_keyword('yield'):
+            self._yield()
+            self._expect(')')
+            return
+        self._test(star=True)
+        if self._at_keyword('for'):
+            self._comprehension()
+            self._expect(')')
+            self._add(NodeKind.GENERATOR, opening, self._previous(), mark)
+            return
+        if self._at(','):
+            while self._accept(','):
+                if self._at(')'):
+                    break
+                self._test(star=True)
+            self._expect(')')
+            self._add(NodeKind.TUPLE, opening, self._previous(), mark)
+            return
+        self._expect(')')
+    
+    def _display(self, opening: tuple, closing: str, kind: NodeKind):
+        """Parse a list or set display or comprehension after its opening bracket"""
+        mark = len(self._arena.kinds)
+        if not self._accept(closing):
+            self._test(star=True)
+            if self._at_keyword('for'):
+                self._comprehension()
+            else:
+                while self._accept(','):
+                    if self._at(closing):
+                        break
+                    self._test(star=True)
+            self._expect(closing)
+        self._add(kind, opening, self._previous(), mark)
+    
+    def _braces(self, opening: tuple):
+        """Parse a dict or set display or comprehension after '{'"""
+        mark = len(self._arena.kinds)
+        if self._accept('}'):
+            self._add(NodeKind.DICT, opening, self._previous(), mark)
+            return
+        if self._at('**'):
+            kind = NodeKind.DICT
+        else:
+            item_mark = len(self._arena.kinds)
+            start = self._peek()
+            self._test(star=True)
+            kind = NodeKind.SET
+            if self._accept(':'):
+                kind = NodeKind.DICT
+                self._test()
+                self._add(NodeKind.PAIR, start, self._previous(), item_mark)
+            if self._at_keyword('for'):
+                self._comprehension()
+                self._expect('}')
+                self._add(kind, opening, self._previous(), mark)
+                return
+            if not self._accept(','):
+                self._expect('}')
+                self._add(kind, opening, self._previous(), mark)
+                return
+        while not self._at('}'):
+            if kind is NodeKind.DICT:
+                self._dict_item()
+            else:
+                self._test(star=True)
+            if not self._accept(','):
+                break
+        self._expect('}')
+        self._add(kind, opening, self._previous(), mark)
+    
+    def _dict_item(self):
+        """Parse 'key: value' or '**mapping' inside a dict display"""
+        mark = len(self._arena.kinds)
+        start = self._peek()
+        if self._accept('**'):
+            self._test(level=LEVEL_BINARY)
+            self._add(NodeKind.STARRED, start, self._previous(), mark, '**')
+            return
+        self._test()
+        self._expect(':')
+        self._test()
+        self._add(NodeKind.PAIR, start, self._previous(), mark)
+    
+    def _comprehension(self):
+        """Parse 'for targets in iterable [if condition]...' clauses"""
+        while self._at_keyword('for') or (self._at_name('async') and self._peek(1) is not None
+                                          and self._peek(1)[VALUE] == 'for'):
+            mark = len(self._arena.kinds)
+            start = self._peek()
+            if start[VALUE] == 'async':
+                self.position += 1
+            self.position += 1
+            self._target_list()
+            self._expect_keyword('in')
+            self._test(level=LEVEL_OR)
+            while self._accept_keyword('if'):
+                self._test(conditional=False)
+            self._add(NodeKind.COMPREHENSION, start, self._previous(), mark)
+    
+    def _arguments(self, opening: tuple, closing: str):
+        """Parse call (or class base) arguments up to and including the closing bracket"""
+        while not self._at(closing):
+            mark = len(self._arena.kinds)
+            start = self._peek()
+            if start is None:
+                break
+            if start[VALUE] in ('*', '**') and start[KIND] is TokenType.OPERATOR:
+                self.position += 1
+                self._test()
+                self._add(NodeKind.STARRED, start, self._previous(), mark, start[VALUE])
+            else:
+                following = self._peek(1)
+                if start[KIND] is TokenType.IDENTIFIER and following is not None and \
+                        following[VALUE] == '=' and following[KIND] is TokenType.OPERATOR:
+                    self.position += 2
+                    self._test()
+                    self._add(NodeKind.KEYWORD_ARGUMENT, start, self._previous(), mark, start[VALUE])
+                else:
+                    self._test()
+                    if self._at_keyword('for'):
+                        self._comprehension()
+                        self._add(NodeKind.GENERATOR, start, self._previous(), mark)
+            if not self._accept(','):
+                break
+        self._expect(closing)
+    
+    def _subscripts(self):
+        """Parse subscripts and slices up to and including ']'"""
+        while True:
+            mark = len(self._arena.kinds)
+            start = self._peek()
+            if not self._at(':'):
+                self._test(star=True)
+            if self._at(':'):
+                # Dilim: [başlangıç]:[bitiş][:[adım]]
+                for _ in range(2):
+                    if not self._accept(':'):
+                        break
+                    if not self._at(':') and not self._at(',') and not self._at(']'):
+                        self._test()
+                self._add(NodeKind.SLICE, start, self._previous(), mark)
+            if not self._accept(',') or self._at(']'):
+                break
+        self._expect(']')
+    
+    def _parameters(self, closing: str, annotations: bool):
+        """Parse a def or lambda parameter list up to (not including) the closing token"""
+        mark = len(self._arena.kinds)
+        start = self._peek()
+        while not self._at(closing):
+            parameter_mark = len(self._arena.kinds)
+            row = self._peek()
+            if row is None:
+                raise self._unexpected()
+            prefix = ''
+            if row[VALUE] in ('*', '**', '/') and row[KIND] is TokenType.OPERATOR:
+                prefix = row[VALUE]
+                self.position += 1
+            name = ''
+            if prefix != '/' and (prefix == '' or self._at_name()):
+                name = self._expect_name()
+                if annotations and self._accept(':'):
+                    self._test()
+                if self._accept('='):
+                    self._test()
+            self._add(NodeKind.PARAMETER, row, self._previous(), parameter_mark, prefix + name)
+            if not self._accept(','):
+                break
+        if start is not None and len(self._arena.kinds) > mark:
+            self._add(NodeKind.PARAMETERS, start, self._previous(), mark)
+    
+    def _yield(self):
+        """Parse 'yield [from] expressions'"""
+        mark = len(self._arena.kinds)
+        start = self._peek()
+        self.position += 1
+        if self._accept_keyword('from'):
+            self._test()
+        elif self._starts_expression():
+            self._expression_list(star=True)
+        self._add(NodeKind.YIELD, start, self._previous(), mark)
+    
+    def _name(self):
+        """Parse an identifier as a NAME node"""
+        mark = len(self._arena.kinds)
+        row = self._peek()
+        name = self._expect_name()
+        self._add(NodeKind.NAME, row, row, mark, name)
+    
+    # --- Token yardımcıları ---
+    
+    def _peek(self, ahead: int = 0) -> Optional[tuple]:
+        index = self.position + ahead
+        return self._line[index] if index < len(self._line) else None
+    
+    def _previous(self) -> tuple:
+        return self._line[self.position - 1]
+    
+    def _at(self, value: str) -> bool:
+        """True if the current token is the given operator or delimiter"""
+        return self.position < len(self._line) and self._line[self.position][VALUE] == value and \
+            self._line[self.position][KIND] in (TokenType.OPERATOR, TokenType.DELIMITER)
+    
+    def _at_keyword(self, value: str) -> bool:
+        return self.position < len(self._line) and self._line[self.position][VALUE] == value and \
+            self._line[self.position][KIND] is TokenType.KEYWORD
+    
+    def _at_name(self, value: Optional[str] = None) -> bool:
+        if self.position >= len(self._line):
+            return False
+        row = self._line[self.position]
+        return row[KIND] is TokenType.IDENTIFIER and (value is None or row[VALUE] == value)
+    
+    def _at_fraction(self) -> bool:
+        """True if the current '.' is directly followed by digits ('.5', which the lexer splits)"""
+        following = self._peek(1)
+        return following is not None and following[KIND] is TokenType.NUMBER and \
+            following[POSITION] == self._line[self.position][POSITION] + 1
+    
+    def _at_ellipsis(self) -> bool:
+        """True if the next three tokens are adjacent '.' delimiters"""
+        rows = self._line[self.position:self.position + 3]
+        return len(rows) == 3 and all(row[VALUE] == '.' for row in rows) and \
+            rows[2][POSITION] == rows[0][POSITION] + 2
+    
+    def _accept(self, value: str) -> bool:
+        if self._at(value):
+            self.position += 1
+            return True
+        return False
+    
+    def _accept_keyword(self, value: str) -> bool:
+        if self._at_keyword(value):
+            self.position += 1
+            return True
+        return False
+    
+    def _expect(self, value: str):
+        if not self._accept(value):
+            raise self._unexpected(f"Expected '{value}'")
+    
+    def _expect_keyword(self, value: str):
+        if not self._accept_keyword(value):
+            raise self._unexpected(f"Expected '{value}'")
+    
+    def _expect_name(self) -> str:
+        if not self._at_name():
+            raise self._unexpected("Expected a name")
+        self.position += 1
+        return self._line[self.position - 1][VALUE]
+    
+    def _starts_expression(self, row: Optional[tuple] = None) -> bool:
+        """True if the token (default: the current one) can begin an expression"""
+        if row is None:
+            row = self._peek()
+            if row is None:
+                return False
+        kind, value = row[KIND], row[VALUE]
+        if kind in (TokenType.IDENTIFIER, TokenType.NUMBER, TokenType.STRING):
+            return True
+        if kind is TokenType.KEYWORD:
+            return value in self.EXPRESSION_KEYWORDS
+        if kind is TokenType.DELIMITER:
+            return value in ('(', '[', '{', '.')
+        return kind is TokenType.OPERATOR and value in ('+', '-', '~', '*', '**')
+    
+    def _unexpected(self, message: Optional[str] = None) -> ParseError:
+        """Build a ParseError at the current token (or the end of the line)"""
+        row = self._peek()
+        if row is None:
+            return ParseError(message or "Unexpected end of line", self._line[-1])
+        return ParseError(message or f"Unexpected '{row[VALUE]}'", row)
+    
+    @staticmethod
+    def _parse_error(error: Exception, row: tuple) -> ParseError:
+        """ParseError for a failed statement; running out of stack (e.g. 'not not ... x') is reported at its start"""
+        if isinstance(error, ParseError):
+            return error
+        return ParseError("Expression too deeply nested", row)
+    
+    def _add(self, kind: NodeKind, first: tuple, last: tuple, mark: int, label: str = '') -> int:
+        """Append a node spanning the tokens first..last whose children start at mark"""
+        base = self._block.start
+        return self._arena.add(kind, first[POSITION] - base, last[POSITION] + len(last[VALUE]) - base, mark, label)
+    
+    def _report(self, error: ParseError):
+        """Record a syntax error unless its line already has a bracket or string diagnostic"""
+        if not self._damaged:
+            self._diagnose(self._block.syntax_errors, error.row, error.message)
+    
+    def _report_line(self, line: LogicalLine, message: str, row: tuple):
+        """Record a structural error about a logical line"""
+        if not line.damaged:
+            self._diagnose(self._block.syntax_errors, row, message)
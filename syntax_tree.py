@@ -0,0 +1,323 @@
+# Sözdizimi ağacı: düğümler her üst düzey blok için dizi tabanlı bir arenada saklanır
+from array import array  # Sıkıştırılmış sayısal sütunlar için
+from bisect import bisect_left, bisect_right  # Pozisyondan bloğa ve paranteze ikili arama için
+from enum import Enum  # Düğüm türleri için
+from typing import Iterator, List, Optional, Tuple
+
+class NodeKind(Enum):
+    """Syntax tree node kinds"""
+    # Deyimler
+    FUNCTION = "FUNCTION"                   # def (etiket: fonksiyon adı)
+    CLASS = "CLASS"                         # class (etiket: sınıf adı)
+    DECORATOR = "DECORATOR"                 # @ifade
+    IF = "IF"
+    ELIF = "ELIF"
+    ELSE = "ELSE"
+    FOR = "FOR"
+    WHILE = "WHILE"
+    TRY = "TRY"
+    EXCEPT = "EXCEPT"
+    FINALLY = "FINALLY"
+    WITH = "WITH"
+    MATCH = "MATCH"
+    CASE = "CASE"
+    RETURN = "RETURN"
+    PASS = "PASS"
+    BREAK = "BREAK"
+    CONTINUE = "CONTINUE"
+    RAISE = "RAISE"
+    GLOBAL = "GLOBAL"
+    NONLOCAL = "NONLOCAL"
+    DEL = "DEL"
+    ASSERT = "ASSERT"
+    IMPORT = "IMPORT"
+    IMPORT_FROM = "IMPORT_FROM"             # from modül import ... (etiket: modül adı)
+    ASSIGN = "ASSIGN"                       # hedef(ler) = değer
+    AUGMENTED_ASSIGN = "AUGMENTED_ASSIGN"   # hedef += değer (etiket: operatör)
+    ANNOTATED_ASSIGN = "ANNOTATED_ASSIGN"   # hedef: tip [= değer]
+    EXPRESSION = "EXPRESSION"               # İfade deyimi
+    ERROR = "ERROR"                         # Ayrıştırılamayan mantıksal satır
+    # İfadeler
+    NAME = "NAME"                           # Tanımlayıcı (etiket: ad)
+    CONSTANT = "CONSTANT"                   # True, False, None, ...
+    NUMBER = "NUMBER"
+    STRING = "STRING"                       # Bir veya daha fazla bitişik string
+    TUPLE = "TUPLE"
+    LIST = "LIST"
+    DICT = "DICT"
+    SET = "SET"
+    PAIR = "PAIR"                           # Sözlükte anahtar: değer
+    GENERATOR = "GENERATOR"                 # Parantez içinde üreteç ifadesi
+    COMPREHENSION = "COMPREHENSION"         # for ... in ... [if ...] bölümü
+    BINARY = "BINARY"                       # İkili işlem (etiket: operatör)
+    UNARY = "UNARY"                         # Tekli işlem (etiket: operatör)
+    BOOLEAN = "BOOLEAN"                     # and / or zinciri (etiket: operatör)
+    COMPARE = "COMPARE"                     # Karşılaştırma zinciri (etiket: ilk operatör)
+    CONDITIONAL = "CONDITIONAL"             # a if koşul else b
+    NAMED = "NAMED"                         # ad := değer
+    LAMBDA = "LAMBDA"
+    CALL = "CALL"
+    ATTRIBUTE = "ATTRIBUTE"                 # nesne.ad (etiket: ad)
+    SUBSCRIPT = "SUBSCRIPT"
+    SLICE = "SLICE"
+    STARRED = "STARRED"                     # *ifade veya **ifade (etiket: yıldızlar)
+    KEYWORD_ARGUMENT = "KEYWORD_ARGUMENT"   # ad=değer (etiket: ad)
+    YIELD = "YIELD"
+    AWAIT = "AWAIT"
+    PARAMETERS = "PARAMETERS"
+    PARAMETER = "PARAMETER"                 # (etiket: *, ** veya / önekli parametre adı)
+    ALIAS = "ALIAS"                         # import edilen ad (etiket: noktalı ad)
+    WITH_ITEM = "WITH_ITEM"
+
+NODE_KINDS = list(NodeKind)  # Tür kodu -> NodeKind
+KIND_CODES = {kind: code for code, kind in enumerate(NODE_KINDS)}  # NodeKind -> tür kodu
+
+class NodeArena:
+    """Postorder struct-of-arrays node storage: a node's descendants directly precede it"""
+    
+    def __init__(self):
+        self.kinds = array('B')    # Tür kodları (KIND_CODES)
+        self.starts = array('q')   # Bloğun başına göre başlangıç pozisyonları
+        self.ends = array('q')     # Bloğun başına göre bitiş pozisyonları (hariç)
+        self.firsts = array('i')   # Alt ağacın ilk düğümü (yapraklarda düğümün kendisi)
+        self.parents = array('i')  # Üst düğüm (-1: bloğun üst düzey deyimi)
+        self.labels = []           # Ad veya operatör metni ('' yoksa)
+    
+    def add(self, kind: NodeKind, start: int, end: int, first: int, label: str = '') -> int:
+        """Append a node whose subtree begins at index first (its children are already stored)"""
+        index = len(self.kinds)
+        self.kinds.append(KIND_CODES[kind])
+        self.starts.append(start)
+        self.ends.append(end)
+        self.firsts.append(first)
+        self.parents.append(-1)
+        self.labels.append(label)
+        child = index - 1
+        while child >= first:
+            self.parents[child] = index
+            child = self.firsts[child] - 1
+        return index
+    
+    def truncate(self, size: int):
+        """Drop every node from index size on (used when a statement fails to parse)"""
+        for column in (self.kinds, self.starts, self.ends, self.firsts, self.parents):
+            del column[size:]
+        del self.labels[size:]
+    
+    def children(self, index: int) -> List[int]:
+        """Indices of the direct children of a node, in source order"""
+        children = []
+        child = index - 1
+        while child >= self.firsts[index]:
+            children.append(child)
+            child = self.firsts[child] - 1
+        children.reverse()
+        return children
+    
+    def roots(self) -> List[int]:
+        """Indices of the block's top-level statements, in source order"""
+        roots = []
+        index = len(self.kinds) - 1
+        while index >= 0:
+            roots.append(index)
+            index = self.firsts[index] - 1
+        roots.reverse()
+        return roots
+    
+    def __len__(self):
+        return len(self.kinds)
+
+BRACKETS = '([{)]}'  # Parantez kodları: 0-2 açılış, 3-5 karşılık gelen kapanış
+
+class BracketTable:
+    """Bracket pairs of one block in source order, with each bracket's partner and enclosing opener"""
+    
+    def __init__(self):
+        self.starts = array('q')    # Bloğun başına göre pozisyonlar (artan)
+        self.codes = array('B')     # Parantez kodları (BRACKETS içindeki sıra)
+        self.partners = array('i')  # Eşleşen parantez (-1: eşi yok)
+        self.parents = array('i')   # Parantezi çevreleyen açık parantez (-1: en dışta)
+    
+    def add(self, start: int, bracket: str, parent: int) -> int:
+        """Append a bracket opened inside parent (-1 at the top level), return its index"""
+        self.starts.append(start)
+        self.codes.append(BRACKETS.index(bracket))
+        self.partners.append(-1)
+        self.parents.append(parent)
+        return len(self.starts) - 1
+    
+    def pair(self, opening: int, closing: int):
+        """Record that closing closes opening (even if the bracket kinds differ)"""
+        self.partners[opening] = closing
+        self.partners[closing] = opening
+    
+    def matched(self, index: int) -> bool:
+        """True if the bracket has a partner of the matching kind"""
+        partner = self.partners[index]
+        return partner >= 0 and abs(self.codes[index] - self.codes[partner]) == 3
+    
+    def find(self, start: int) -> int:
+        """Index of the bracket at the relative position, -1 if there is none"""
+        index = bisect_left(self.starts, start)
+        return index if index < len(self.starts) and self.starts[index] == start else -1
+    
+    def enclosing(self, start: int) -> int:
+        """Index of the innermost opener before the relative position whose pair is not closed before it, or -1"""
+        index = bisect_left(self.starts, start) - 1  # Pozisyondan önceki son parantez
+        if index < 0 or self.codes[index] < 3:
+            return index  # Son parantez bir açılışsa pozisyonu o çevreler
+        return self.parents[index]  # Kapanışsa kapattığı çiftin dışındaki açılış
+    
+    def __len__(self):
+        return len(self.starts)
+
+class SyntaxBlock:
+    """One top-level statement with its decorators, suites and trailing comments"""
+    __slots__ = ('start', 'line', 'arena', 'brackets', 'bracket_errors', 'string_errors', 'syntax_errors')
+    
+    def __init__(self, start: int, line: int):
+        self.start = start        # Bloğun ilk token'ının pozisyonu
+        self.line = line          # Bloğun ilk token'ının satırı
+        self.arena = NodeArena()  # Düğümler (pozisyonlar start'a göre)
+        self.brackets = BracketTable()  # Parantez çiftleri (pozisyonlar start'a göre); çiftler bloklar arası uzanmaz
+        # Tanılar: (start'a göre satır, sütun, mesaj); bloğu kaydırmak onları güncellemeyi gerektirmez
+        self.bracket_errors = []
+        self.string_errors = []
+        self.syntax_errors = []
+    
+    def moved(self, delta: int, line_delta: int) -> 'SyntaxBlock':
+        """Copy of the block shifted by an edit before it, sharing the (relative) nodes and diagnostics"""
+        if not delta and not line_delta:
+            return self  # Bloklar yerinde değiştirilmediği için kaymayan blok paylaşılabilir
+        block = SyntaxBlock(self.start + delta, self.line + line_delta)
+        block.arena, block.brackets = self.arena, self.brackets
+        block.bracket_errors, block.string_errors, block.syntax_errors = \
+            self.bracket_errors, self.string_errors, self.syntax_errors
+        return block
+
+class SyntaxNode:
+    """Lightweight read-only view of one node stored in a block's arena"""
+    __slots__ = ('block', 'index')
+    
+    def __init__(self, block: SyntaxBlock, index: int):
+        self.block = block  # Düğümün saklandığı blok
+        self.index = index  # Bloğun arenasındaki sıra numarası
+    
+    @property
+    def kind(self) -> NodeKind:
+        return NODE_KINDS[self.block.arena.kinds[self.index]]
+    
+    @property
+    def start(self) -> int:
+        return self.block.start + self.block.arena.starts[self.index]
+    
+    @property
+    def end(self) -> int:
+        return self.block.start + self.block.arena.ends[self.index]
+    
+    @property
+    def label(self) -> str:
+        return self.block.arena.labels[self.index]
+    
+    @property
+    def parent(self) -> Optional['SyntaxNode']:
+        parent = self.block.arena.parents[self.index]
+        return SyntaxNode(self.block, parent) if parent >= 0 else None
+    
+    @property
+    def children(self) -> List['SyntaxNode']:
+        return [SyntaxNode(self.block, child) for child in self.block.arena.children(self.index)]
+    
+    def __repr__(self):
+        label = f" {self.label!r}" if self.label else ""
+        return f"Node({self.kind.value}{label}, {self.start}-{self.end})"
+
+class SyntaxTree:
+    """Module syntax tree made of independently reparseable top-level blocks"""
+    
+    def __init__(self, blocks: List[SyntaxBlock]):
+        self.blocks = blocks  # Kaynak sırasıyla üst düzey bloklar
+        self._starts = [block.start for block in blocks]  # İkili arama için blok başlangıçları
+    
+    @property
+    def errors(self) -> List[str]:
+        """Diagnostics as messages: bracket errors, then unclosed strings, then syntax errors"""
+        messages = []
+        for kind in ('bracket_errors', 'string_errors', 'syntax_errors'):
+            for block in self.blocks:
+                for line, column, message in getattr(block, kind):
+                    messages.append(f"{message} at line {block.line + line}, column {column}")
+        return messages
+    
+    def statements(self) -> Iterator[SyntaxNode]:
+        """Iterate over the module's top-level statements"""
+        for block in self.blocks:
+            for index in block.arena.roots():
+                yield SyntaxNode(block, index)
+    
+    def _block_at(self, offset: int) -> Optional[SyntaxBlock]:
+        """The block whose range contains offset (blocks end where the next one starts)"""
+        index = bisect_right(self._starts, offset) - 1
+        return self.blocks[index] if index >= 0 else None
+    
+    def node_at(self, offset: int) -> Optional[SyntaxNode]:
+        """Return the innermost node containing offset, or None"""
+        block = self._block_at(offset)
+        if block is None:
+            return None
+        arena = block.arena
+        relative = offset - block.start
+        found = None
+        # Postorder düzende içeren en küçük düğüm, içeren düğümlerin ilkidir
+        for index in range(len(arena)):
+            if arena.starts[index] <= relative < arena.ends[index]:
+                found = index
+                break
+        return SyntaxNode(block, found) if found is not None else None
+    
+    def bracket_pair(self, offset: int) -> Optional[Tuple[Optional[int], Optional[int], bool]]:
+        """For a bracket at offset: (opening position, closing position, matched); None if there is no bracket
+        
+        The missing side of an unclosed or unmatched bracket is None; matched is False for those and for
+        pairs of different kinds ('(' closed by ']').
+        """
+        block = self._block_at(offset)
+        if block is None:
+            return None
+        table = block.brackets
+        index = table.find(offset - block.start)
+        if index < 0:
+            return None
+        return self._pair(block, index)
+    
+    def enclosing_brackets(self, offset: int) -> Optional[Tuple[Optional[int], Optional[int], bool]]:
+        """Innermost bracket pair opened before offset and not closed before it, as in bracket_pair()"""
+        block = self._block_at(offset)
+        if block is None:
+            return None
+        index = block.brackets.enclosing(offset - block.start)
+        return self._pair(block, index) if index >= 0 else None
+    
+    @staticmethod
+    def _pair(block: SyntaxBlock, index: int) -> Tuple[Optional[int], Optional[int], bool]:
+        """Absolute (opening, closing, matched) positions of a bracket and its partner"""
+        table = block.brackets
+        partner = table.partners[index]
+        position = block.start + table.starts[index]
+        other = block.start + table.starts[partner] if partner >= 0 else None
+        if table.codes[index] < 3:
+            return position, other, table.matched(index)
+        return other, position, table.matched(index)
+    
+    def dump(self) -> str:
+        """Indented text form of the tree (for debugging and comparisons)"""
+        lines = []
+        
+        def visit(node: SyntaxNode, depth: int):
+            lines.append("  " * depth + repr(node))
+            for child in node.children:
+                visit(child, depth + 1)
+        
+        for statement in self.statements():
+            visit(statement, 0)
+        return "\n".join(lines)
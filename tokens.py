@@ -1,5 +1,9 @@
 # Token types and classes (simplified for standalone operation)
+from array import array  # Sıkıştırılmış sayısal sütunlar için
+from bisect import bisect_left, bisect_right  # Satır başlangıçlarında ve tanımlayıcı pozisyonlarında ikili arama için
 from enum import Enum  # Enum sınıfı, sabit değer kümeleri tanımlamak için kullanılır
+from itertools import accumulate, chain  # Satır uzunluklarından satır başlangıçlarına
+from sys import intern  # Aynı tanımlayıcı isimleri tek bir string nesnesini paylaşır
 
 class TokenType(Enum):
     """Token types for Python syntax highlighting"""
@@ -16,6 +20,8 @@ class TokenType(Enum):
 
 class Token:
     """Represents a token in the source code"""
+    __slots__ = ('type', 'value', 'position', 'line', 'column')
+    
     def __init__(self, type_: TokenType, value: str, position: int = 0, line: int = 1, column: int = 1):
         self.type = type_           # Token türü (TokenType enumundan)
         self.value = value          # Token'ın kaynak koddaki değeri
@@ -25,4 +31,318 @@ class Token:
     
     def __repr__(self):
         # Token nesnesinin okunabilir bir temsilini döndürür
-        return f"Token({self.type.value}, {repr(self.value)}, {self.line}:{self.column})"
\ No newline at end of file
+        return f"Token({self.type.value}, {repr(self.value)}, {self.line}:{self.column})"
+
+TOKEN_TYPES = list(TokenType)  # Tip kodu -> TokenType
+TYPE_CODES = {token_type: code for code, token_type in enumerate(TOKEN_TYPES)}  # TokenType -> tip kodu
+
+class TokenView:
+    """Lightweight read-only view of one token stored in a TokenBuffer"""
+    __slots__ = ('buffer', 'index')
+    
+    def __init__(self, buffer: 'TokenBuffer', index: int):
+        self.buffer = buffer  # Token'ın saklandığı tampon
+        self.index = index    # Tampondaki sıra numarası
+    
+    @property
+    def type(self) -> TokenType:
+        return TOKEN_TYPES[self.buffer.types[self.index]]
+    
+    @property
+    def value(self) -> str:
+        # Değer saklanmaz, kaynak koddan dilimlenir
+        return self.buffer.source[self.buffer.starts[self.index]:self.buffer.ends[self.index]]
+    
+    @property
+    def position(self) -> int:
+        return self.buffer.starts[self.index]
+    
+    @property
+    def line(self) -> int:
+        return self.buffer.lines[self.index]
+    
+    @property
+    def column(self) -> int:
+        return self.buffer.columns[self.index]
+    
+    def __repr__(self):
+        return f"Token({self.type.value}, {repr(self.value)}, {self.line}:{self.column})"
+
+class TokenBuffer:
+    """Struct-of-arrays token storage: one compact array per token field"""
+    
+    def __init__(self, source: str):
+        self.source = source         # Token değerlerinin dilimlendiği kaynak kod
+        self.types = array('B')      # Tip kodları (TYPE_CODES)
+        self.starts = array('q')     # Başlangıç pozisyonları
+        self.ends = array('q')       # Bitiş pozisyonları (hariç)
+        self.lines = array('I')      # Satır numaraları
+        self.columns = array('I')    # Sütun numaraları
+    
+    @classmethod
+    def from_tokens(cls, tokens, source: str) -> 'TokenBuffer':
+        """Build a buffer from Token objects produced for the same source"""
+        buffer = cls(source)
+        for token in tokens:
+            buffer.append(TYPE_CODES[token.type], token.position, token.position + len(token.value),
+                          token.line, token.column)
+        return buffer
+    
+    def append(self, type_code: int, start: int, end: int, line: int, column: int):
+        """Append one token without creating a Token object"""
+        self.types.append(type_code)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+        self.columns.append(column)
+    
+    def count(self, token_type: TokenType) -> int:
+        """Number of tokens of the given type"""
+        return self.types.count(TYPE_CODES[token_type])
+    
+    def to_tokens(self) -> list:
+        """Materialize regular Token objects (for code that needs them)"""
+        return [Token(TOKEN_TYPES[code], self.source[start:end], start, line, column)
+                for code, start, end, line, column in zip(self.types, self.starts, self.ends, self.lines, self.columns)]
+    
+    def __len__(self):
+        return len(self.types)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TokenView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("token index out of range")
+        return TokenView(self, index)
+    
+    def __iter__(self):
+        for index in range(len(self)):
+            yield TokenView(self, index)
+
+class LineIndex:
+    """Line start offsets of a text: offset <-> (line, column) by binary search, updated per edit"""
+    
+    def __init__(self, text: str = ''):
+        self.starts = self._line_starts(text, 0)  # Her satırın başlangıç pozisyonu (ilk eleman 0)
+        self.length = len(text)                   # Metnin uzunluğu
+    
+    @staticmethod
+    def _line_starts(text: str, base: int) -> list:
+        """base followed by the position after each newline of text, shifted by base"""
+        # accumulate(initial=...) 3.8'de geldi: başlangıç değeri zincirin ilk elemanı olarak verilir
+        return list(accumulate(chain((base,), (len(line) + 1 for line in text.split('\n')[:-1]))))
+    
+    def __len__(self):
+        return len(self.starts)  # Satır sayısı
+    
+    def location(self, offset: int) -> tuple:
+        """(line, column) of an offset, both 1-based; a column counts characters as in Token.column"""
+        line = bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+    
+    def offset(self, line: int, column: int = 1) -> int:
+        """Offset of a 1-based (line, column), clamped to the text and to the end of the line"""
+        if line < 1:
+            return 0
+        if line > len(self.starts):
+            return self.length
+        line_end = self.starts[line] - 1 if line < len(self.starts) else self.length
+        return min(self.starts[line - 1] + max(column, 1) - 1, line_end)
+    
+    def update(self, offset: int, deleted_length: int, inserted_text: str):
+        """Apply one edit: drop the deleted newlines, add the inserted ones and shift the following lines"""
+        first = bisect_right(self.starts, offset)                    # Düzenlemeden sonra başlayan ilk satır
+        last = bisect_right(self.starts, offset + deleted_length)    # Silinen metinden sonra başlayan ilk satır
+        delta = len(inserted_text) - deleted_length
+        inserted = self._line_starts(inserted_text, offset)[1:]
+        self.starts[first:] = inserted + [start + delta for start in self.starts[last:]]
+        self.length += delta
+
+class IdentifierIndex:
+    """Identifier name -> sorted start offsets of its occurrences, updated per re-lexed range"""
+    
+    COMPACT_AFTER = 256  # Bu kadar kaydırma birikince hepsi tüm isimlere uygulanıp kayıt temizlenir
+    
+    def __init__(self):
+        self.occurrences = {}  # İsim (intern edilmiş) -> artan sıralı başlangıç pozisyonları
+        self._shifts = []      # Düzenlemelerin (eski bitiş, fark) kaydırmaları; isimlere aranınca uygulanır
+        self._applied = {}     # İsim -> listesine uygulanmış kaydırma sayısı (yoksa 0)
+    
+    @classmethod
+    def from_tokens(cls, tokens) -> 'IdentifierIndex':
+        """Build the index from Token objects or a TokenBuffer"""
+        index = cls()
+        occurrences = index.occurrences
+        if isinstance(tokens, TokenBuffer):
+            identifier_code, source = TYPE_CODES[TokenType.IDENTIFIER], tokens.source
+            for type_code, start, end in zip(tokens.types, tokens.starts, tokens.ends):
+                if type_code == identifier_code:
+                    occurrences.setdefault(intern(source[start:end]), []).append(start)
+        else:
+            identifier = TokenType.IDENTIFIER
+            for token in tokens:
+                if token.type is identifier:
+                    occurrences.setdefault(intern(token.value), []).append(token.position)
+        return index
+    
+    def find(self, name: str) -> list:
+        """Sorted start offsets of all occurrences of name (empty if it does not occur)"""
+        offsets = self.occurrences.get(name)
+        if offsets is None:
+            return []
+        self._catch_up(name, offsets, len(self._shifts))
+        return offsets
+    
+    def update(self, removed, added, old_end: int, delta: int):
+        """Apply one re-lex: drop the occurrences of the removed tokens (old positions), move the ones at or
+        after old_end by delta and add the occurrences of the added tokens (new positions)"""
+        identifier = TokenType.IDENTIFIER
+        touched = {}  # İsim -> (silinen pozisyonlar, eklenen pozisyonlar)
+        for token in removed:
+            if token.type is identifier:
+                touched.setdefault(token.value, ([], []))[0].append(token.position)
+        for token in added:
+            if token.type is identifier:
+                touched.setdefault(token.value, ([], []))[1].append(token.position)
+        previous = len(self._shifts)
+        if delta:
+            self._shifts.append((old_end, delta))  # Dokunulmayan isimler bu kaydırmayı aranınca uygular
+        for name, (old_positions, new_positions) in touched.items():
+            name = intern(name)
+            offsets = self.occurrences.get(name, [])
+            self._catch_up(name, offsets, previous)
+            for position in old_positions:
+                del offsets[bisect_left(offsets, position)]
+            if delta:
+                self._shift(offsets, old_end, delta)
+            offsets.extend(new_positions)
+            offsets.sort()  # İki sıralı dizinin birleşimi: doğrusal
+            if offsets:
+                self.occurrences[name] = offsets
+                self._applied[name] = len(self._shifts)
+            else:
+                self.occurrences.pop(name, None)
+                self._applied.pop(name, None)
+        if len(self._shifts) > self.COMPACT_AFTER:
+            for name, offsets in self.occurrences.items():
+                self._catch_up(name, offsets, len(self._shifts))
+            self._shifts = []
+            self._applied = {}
+    
+    def _catch_up(self, name: str, offsets: list, count: int):
+        """Apply the first count recorded shifts that name's offsets have not seen yet"""
+        applied = self._applied.get(name, 0)
+        if applied < count:
+            for old_end, delta in self._shifts[applied:count]:
+                self._shift(offsets, old_end, delta)
+            self._applied[name] = count
+    
+    @staticmethod
+    def _shift(offsets: list, old_end: int, delta: int):
+        first = bisect_left(offsets, old_end)
+        offsets[first:] = [offset + delta for offset in offsets[first:]]
+
+class TokenStatistics:
+    """Token counts maintained while tokens are emitted; mergeable and subtractable"""
+    
+    def __init__(self):
+        self.counts = [0] * len(TOKEN_TYPES)  # Tip kodu -> token sayısı
+        self.total_lines = 0    # Satır sayısı
+        self.error_count = 0    # Sözcüksel hatalar (kapanmamış string, tanımsız karakter, hatalı sayı)
+        self.warning_count = 0  # Uyarılar (ASCII dışı tanımlayıcılar)
+    
+    @classmethod
+    def from_tokens(cls, tokens) -> 'TokenStatistics':
+        """Count a sequence of Token objects"""
+        statistics = cls()
+        for token in tokens:
+            statistics.add(TYPE_CODES[token.type], token.value)
+        return statistics
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'TokenStatistics':
+        """Rebuild statistics from the get_statistics() dictionary form"""
+        statistics = cls()
+        for token_type, count in data.get('token_counts', {}).items():
+            statistics.counts[TYPE_CODES[token_type]] = count
+        statistics.total_lines = data.get('total_lines', 0)
+        statistics.error_count = data.get('error_count', 0)
+        statistics.warning_count = data.get('warning_count', 0)
+        return statistics
+    
+    @property
+    def total_tokens(self) -> int:
+        return sum(self.counts)
+    
+    def add(self, type_code: int, value: str, sign: int = 1):
+        """Count one token (sign=-1 removes a previously counted token)"""
+        self.counts[type_code] += sign
+        if type_code in _CHECKED_CODES:
+            issue = _lexical_issue(type_code, value)
+            if issue == 'error':
+                self.error_count += sign
+            elif issue == 'warning':
+                self.warning_count += sign
+    
+    def merge(self, other: 'TokenStatistics', sign: int = 1) -> 'TokenStatistics':
+        """Add (or with sign=-1 subtract) other's counts in place, return self"""
+        for code, count in enumerate(other.counts):
+            self.counts[code] += sign * count
+        self.total_lines += sign * other.total_lines
+        self.error_count += sign * other.error_count
+        self.warning_count += sign * other.warning_count
+        return self
+    
+    def copy(self) -> 'TokenStatistics':
+        return TokenStatistics().merge(self)
+    
+    def __add__(self, other: 'TokenStatistics') -> 'TokenStatistics':
+        return self.copy().merge(other)
+    
+    def __sub__(self, other: 'TokenStatistics') -> 'TokenStatistics':
+        """Delta that turns other into self"""
+        return self.copy().merge(other, -1)
+    
+    def __eq__(self, other):
+        if not isinstance(other, TokenStatistics):
+            return NotImplemented
+        return (self.counts, self.total_lines, self.error_count, self.warning_count) == \
+            (other.counts, other.total_lines, other.error_count, other.warning_count)
+    
+    def __bool__(self):
+        # Fark olarak kullanıldığında: hiçbir sayı değişmediyse False
+        return any(self.counts) or bool(self.total_lines or self.error_count or self.warning_count)
+    
+    def as_dict(self) -> dict:
+        """Dictionary form used by get_statistics(), the cache and the views"""
+        return {
+            'total_tokens': self.total_tokens,
+            'total_lines': self.total_lines,
+            'token_counts': {TOKEN_TYPES[code]: count for code, count in enumerate(self.counts) if count},
+            'error_count': self.error_count,
+            'warning_count': self.warning_count,
+        }
+
+_CHECKED_CODES = frozenset(TYPE_CODES[token_type] for token_type in
+                           (TokenType.STRING, TokenType.NUMBER, TokenType.IDENTIFIER, TokenType.UNKNOWN))
+_ALLOWED_UNKNOWN = {'!', '\\'}  # '!=' ayrı tokenlara bölünür, '\' satır devamıdır
+
+def _lexical_issue(type_code: int, value: str):
+    """Classify one token as 'error', 'warning' or None"""
+    token_type = TOKEN_TYPES[type_code]
+    if token_type == TokenType.STRING:
+        body = value[1:-1]
+        escapes = len(body) - len(body.rstrip('\\'))  # Kapanış tırnağından önceki ters bölüler
+        if len(value) < 2 or value[-1] != value[0] or escapes % 2:
+            return 'error'  # Kapanmamış string
+    elif token_type == TokenType.NUMBER:
+        if value.count('.') > 1:
+            return 'error'  # 1.2.3 gibi hatalı sayı
+    elif token_type == TokenType.IDENTIFIER:
+        if not value.isascii():
+            return 'warning'  # Benzer görünen Unicode harfler karışıklığa yol açabilir
+    elif value not in _ALLOWED_UNKNOWN:
+        return 'error'  # Tanımsız karakter
+    return None
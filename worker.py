@@ -0,0 +1,140 @@
+import queue  # Sonuçları arayüz thread'ine taşımak için
+import threading  # Arka plan analiz thread'i için
+import time  # Analiz süresini ölçmek için
+from typing import List, Optional, Union
+from cache import AnalysisCache
+from document import DocumentSnapshot
+from instrumentation import recorder
+from lexer import SimpleLexicalAnalyzer, create_lexer, find_edit
+from parser import SimpleParser
+from syntax_tree import SyntaxTree
+from tokens import IdentifierIndex, Token, TokenBuffer
+
+class AnalysisResult:
+    """Result of analyzing one snapshot of the code"""
+    def __init__(self, generation: int, code: str, tokens: List[Token] = None,
+                 statistics: dict = None, errors: List[str] = None, failure: Optional[str] = None,
+                 tree: Optional[SyntaxTree] = None, identifiers: Optional[IdentifierIndex] = None):
+        self.generation = generation    # Analiz edilen anlık görüntünün nesil numarası
+        self.code = code                # Analiz edilen kod
+        self.tokens = tokens or []      # Bulunan tokenlar
+        self.statistics = statistics or {}  # Lexer istatistikleri (kopya)
+        self.errors = errors or []      # Parser hataları
+        self.failure = failure          # Analiz sırasında oluşan hata mesajı (varsa)
+        self.tree = tree                # Sözdizimi ağacı (önbellekten gelen sonuçlarda yok)
+        self.identifiers = identifiers  # Tanımlayıcı adı -> geçtiği pozisyonlar
+        self.duration = 0.0             # Analizin arka plan thread'inde sürdüğü süre (saniye)
+
+class AnalysisWorker:
+    """Runs lexing and parsing on a background thread, one snapshot at a time"""
+    
+    def __init__(self, backend: str = 'regex', cache: Optional[AnalysisCache] = None):
+        self.backend = backend      # Tam analizde kullanılan lexer arka ucu
+        self.cache = cache          # Tam analiz sonuçları için içerik adresli önbellek (isteğe bağlı)
+        self.last_result: Optional[AnalysisResult] = None  # Son tamamlanan analiz
+        self.generation = 0         # En son gönderilen anlık görüntünün nesil numarası
+        self.lexer: Optional[SimpleLexicalAnalyzer] = None  # Artımlı analiz için thread'e ait lexer
+        self.parser: Optional[SimpleParser] = None  # Artımlı ayrıştırma için thread'e ait parser
+        self._parsed_code = None    # Parser ağacının karşılık geldiği kod (lexer.code ile aynı nesne)
+        self.results = queue.Queue()  # Tamamlanan AnalysisResult nesneleri
+        self._pending = None          # Bekleyen en yeni (nesil, kod) çifti
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="analysis-worker", daemon=True)
+    
+    def start(self):
+        """Start the background thread"""
+        self._thread.start()
+    
+    def stop(self):
+        """Ask the background thread to finish"""
+        self._stopped = True
+        self._wakeup.set()
+    
+    def submit(self, code: Union[str, DocumentSnapshot]) -> int:
+        """Queue a snapshot for analysis, replacing any snapshot not yet started"""
+        with self._lock:
+            self.generation += 1
+            self._pending = (self.generation, code)
+        self._wakeup.set()
+        return self.generation
+    
+    def is_stale(self, generation: int) -> bool:
+        """True if a newer snapshot has been submitted since the given one"""
+        return generation != self.generation
+    
+    def _run(self):
+        """Thread main loop: analyze the newest pending snapshot"""
+        while not self._stopped:
+            self._wakeup.wait()
+            with self._lock:
+                self._wakeup.clear()
+                pending, self._pending = self._pending, None
+            if pending is None:
+                continue
+            generation, code = pending
+            started = time.perf_counter()
+            if isinstance(code, DocumentSnapshot):
+                code = code.text()  # Parçalar bu thread'de birleştirilir, arayüz thread'i metni kopyalamaz
+            try:
+                with recorder.profiled(), recorder.span("analysis"):
+                    result = self._analyze(generation, code)
+            except Exception as e:
+                self.lexer = None  # Lexer durumu belirsiz: sonraki analiz baştan yapılır
+                self.parser = None
+                self.last_result = None
+                result = AnalysisResult(generation, code, failure=str(e))
+            if result is not None:
+                result.duration = time.perf_counter() - started
+                self.results.put(result)
+    
+    def _analyze(self, generation: int, code: str) -> Optional[AnalysisResult]:
+        """Lex and parse one snapshot, return None if it became stale in between"""
+        if self.last_result is not None and self.last_result.code == code:
+            # Kod değişmemiş: önceki sonucu yeniden kullan
+            last = self.last_result
+            return AnalysisResult(generation, code, last.tokens, last.statistics, last.errors, tree=last.tree,
+                                  identifiers=last.identifiers)
+        if self.lexer is None and self.cache is not None:
+            cached = self.cache.get(code)
+            if cached is not None:
+                self.last_result = AnalysisResult(generation, code, cached.buffer, cached.statistics, cached.errors,
+                                                  identifiers=IdentifierIndex.from_tokens(cached.buffer))
+                return self.last_result
+        
+        full_scan = self.lexer is None
+        edit = find_edit(self.lexer.code, code) if self.lexer else None
+        # Parser sadece lexer'ın bir önceki kodunu ayrıştırmışsa artımlı çalışabilir
+        parser_current = self.parser is not None and self._parsed_code is (self.lexer.code if self.lexer else None)
+        if edit is not None:
+            # Tek bir düzenleme: sadece etkilenen satırları yeniden tara
+            tokens = self.lexer.retokenize(*edit)
+        elif full_scan:
+            self.lexer = create_lexer(code, self.backend)
+            tokens = self.lexer.tokenize()
+        else:
+            tokens = self.lexer.tokens  # Lexer bu kodu zaten taramış (önceki analiz yarıda kesilmiş)
+        if self.is_stale(generation):
+            return None  # Daha yeni bir düzenleme geldi, parser'ı çalıştırma
+        
+        if edit is not None and parser_current:
+            # Sadece düzenlenen üst düzey bloklar yeniden ayrıştırılır
+            tree = self.parser.reparse(tokens, edit, self.lexer.relexed_end)
+        elif parser_current and not full_scan:
+            tree = self.parser.tree  # Parser bu kodu da zaten ayrıştırmış
+        else:
+            self.parser = SimpleParser(tokens)
+            tree = self.parser.parse()
+        self._parsed_code = self.lexer.code
+        parser = self.parser
+        if self.is_stale(generation):
+            return None
+        if full_scan and self.cache is not None:
+            # Sadece tam analizler önbelleğe yazılır (artımlı düzenlemeler zaten ucuz)
+            self.cache.put(code, TokenBuffer.from_tokens(tokens, code), self.lexer.get_statistics(), parser.errors)
+        # retokenize() ve reparse() kaydırılan Token ve SyntaxBlock nesnelerini kopyalar: önceki sonuçların
+        # tokenları ve ağaçları değişmez. Tanımlayıcı indeksi ise yerinde güncellenir ve güncel kodu anlatır
+        self.last_result = AnalysisResult(generation, code, tokens, self.lexer.get_statistics(), parser.errors,
+                                          tree=tree, identifiers=self.lexer.identifier_index())
+        return self.last_result